@@ -0,0 +1,305 @@
+'''Benchmark runner for pyxenv.
+
+Builds a synthetic pyxenv home with fake interpreters and environments,
+measures the hot paths of pyxenv and optionally compares the results
+against a previously saved baseline.
+
+Usage:
+    python benchmarks/bench_pyxenv.py --interpreters 50 --envs 200 --output bench.json
+    python benchmarks/bench_pyxenv.py --baseline bench.json --threshold 0.20
+'''
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+from unittest.mock import patch
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from pyxenv import __version__, config  # noqa: E402
+from pyxenv.exceptions import pyxenvError  # noqa: E402
+from pyxenv.python_manager import PythonManager  # noqa: E402
+from pyxenv.venv_manager import VenvManager  # noqa: E402
+
+FAKE_PYTHON = '#!/bin/sh\necho "Python {version}"\n'
+
+
+def fake_versions(count: int) -> list[str]:
+    '''
+    Generate a deterministic list of distinct version strings.
+
+    Args:
+        count: Number of versions to generate
+
+    Returns:
+        List of versions like "3.8.0", "3.8.1", ...
+    '''
+    minors = range(8, 14)
+    return [f'3.{minors[i % len(minors)]}.{i // len(minors)}' for i in range(count)]
+
+
+def build_home(root: Path, interpreters: int, envs: int, path_length: int) -> dict:
+    '''
+    Create a synthetic pyxenv home under root.
+
+    Args:
+        root: Directory used as $HOME for the synthetic home
+        interpreters: Number of fake interpreters under PYTHON_DIR
+        envs: Number of fake environments under ENV_DIR
+        path_length: Number of extra (empty) directories prepended to PATH
+
+    Returns:
+        Dict with the created paths and the PATH value to use
+    '''
+    home = root / '.pyxenv'
+    python_dir = home / 'pythons'
+    env_dir = home / 'envs'
+    python_dir.mkdir(parents=True)
+    env_dir.mkdir(parents=True)
+
+    versions = fake_versions(interpreters)
+    for version in versions:
+        bin_dir = python_dir / version / 'bin'
+        bin_dir.mkdir(parents=True)
+        exe = bin_dir / 'python'
+        exe.write_text(FAKE_PYTHON.format(version=version))
+        exe.chmod(0o755)
+
+    for i in range(envs):
+        env = env_dir / f'env-{i:05d}'
+        (env / 'bin').mkdir(parents=True)
+        (env / 'pyvenv.cfg').write_text(f'home = {python_dir}\n')
+
+    path_dirs = []
+    for i in range(path_length):
+        path_dir = root / 'path' / f'{i:04d}'
+        path_dir.mkdir(parents=True)
+        path_dirs.append(str(path_dir))
+    search_path = os.pathsep.join(path_dirs + [os.environ.get('PATH', '')])
+
+    return {
+        'root': root,
+        'home': home,
+        'python_dir': python_dir,
+        'env_dir': env_dir,
+        'versions': versions,
+        'path': search_path,
+    }
+
+
+@contextlib.contextmanager
+def synthetic_home(home: dict) -> Iterator[None]:
+    '''Point pyxenv (in-process and child processes) at a synthetic home.'''
+    env = {
+        'HOME': str(home['root']),
+        'PYXENV_HOME': str(home['home']),
+        'USERPROFILE': str(home['root']),
+        'PATH': home['path'],
+    }
+    with patch.dict(os.environ, env), \
+         patch.object(config, 'pyxenv_HOME', home['home']), \
+         patch.object(config, 'PYTHON_DIR', home['python_dir']), \
+         patch.object(config, 'ENV_DIR', home['env_dir']):
+        yield
+
+
+def measure(func: Callable[[], object], repeat: int, warmup: int = 1) -> dict:
+    '''
+    Time a callable.
+
+    Args:
+        func: Callable to measure
+        repeat: Number of timed runs
+        warmup: Number of untimed runs before measuring
+
+    Returns:
+        Dict with min, median, mean and max in seconds plus the run count
+    '''
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return {
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'mean': statistics.mean(samples),
+        'max': max(samples),
+        'runs': repeat,
+    }
+
+
+def _expect_error(func: Callable[[], object]) -> Callable[[], None]:
+    '''Wrap a call that is expected to raise a pyxenvError.'''
+    def wrapper() -> None:
+        try:
+            func()
+        except pyxenvError:
+            pass
+    return wrapper
+
+
+def _cli(*args: str) -> Callable[[], None]:
+    '''Build a callable running the pyxenv CLI from this checkout.'''
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(REPO_ROOT), env.get('PYTHONPATH')]))
+    cmd = [sys.executable, '-m', 'pyxenv.cli', *args]
+
+    def run() -> None:
+        subprocess.run(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+    return run
+
+
+def _create_env(home: dict, counter: list[int]) -> Callable[[], None]:
+    '''Build a callable creating a fresh environment with the host interpreter.'''
+    host_dir = home['python_dir'] / 'host'
+    if not host_dir.exists():
+        (host_dir / 'bin').mkdir(parents=True)
+        (host_dir / 'bin' / 'python').symlink_to(sys.executable)
+
+    def run() -> None:
+        counter[0] += 1
+        name = f'bench-create-{counter[0]}'
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            VenvManager.create('host', name)
+        shutil.rmtree(home['env_dir'] / name)
+    return run
+
+
+def run_benchmarks(home: dict, repeat: int, create_repeat: int) -> dict:
+    '''
+    Run every benchmark against a synthetic home.
+
+    Args:
+        home: Synthetic home description from build_home
+        repeat: Timed runs for in-process and CLI benchmarks
+        create_repeat: Timed runs for environment creation (0 to skip)
+
+    Returns:
+        Mapping of benchmark name to timing statistics
+    '''
+    versions = home['versions']
+    target = versions[len(versions) // 2] if versions else '3.99.0'
+    results = {}
+
+    with synthetic_home(home):
+        results['find_versions'] = measure(lambda: PythonManager.find_versions(), repeat)
+        results['find_versions[list_all]'] = measure(
+            lambda: PythonManager.find_versions(list_all=True), repeat)
+        results['get_executable[default]'] = measure(lambda: PythonManager.get_executable(), repeat)
+        results['get_executable[pyxenv]'] = measure(
+            lambda: PythonManager.get_executable(target), repeat)
+        results['get_executable[missing]'] = measure(
+            _expect_error(lambda: PythonManager.get_executable('3.99.99')), repeat)
+        results['list_envs'] = measure(VenvManager.list_all, repeat)
+
+        results['cli[--version]'] = measure(_cli('--version'), repeat)
+        results['cli[--list]'] = measure(_cli('--list'), repeat)
+        results['cli[--list-envs]'] = measure(_cli('--list-envs'), repeat)
+        results['cli[run]'] = measure(_cli(target, 'noop.py'), repeat)
+
+        if create_repeat:
+            results['create_env'] = measure(_create_env(home, [0]), create_repeat, warmup=0)
+
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    '''
+    Compare results against a baseline.
+
+    Args:
+        results: Benchmark results (name -> stats)
+        baseline: Baseline results (name -> stats)
+        threshold: Allowed relative slowdown of the median (0.2 = 20%)
+
+    Returns:
+        List of human-readable regression descriptions (empty if none)
+    '''
+    regressions = []
+    for name, stats in sorted(results.items()):
+        base = baseline.get(name)
+        if not base or not base.get('median'):
+            continue
+        ratio = stats['median'] / base['median']
+        if ratio > 1 + threshold:
+            regressions.append(
+                f'{name}: {base["median"] * 1000:.2f} ms -> {stats["median"] * 1000:.2f} ms '
+                f'({(ratio - 1) * 100:+.1f}%)'
+            )
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    '''Benchmark runner entry point.'''
+    parser = argparse.ArgumentParser(description='pyxenv benchmarks')
+    parser.add_argument('--interpreters', type=int, default=20, help='Fake interpreters under PYTHON_DIR')
+    parser.add_argument('--envs', type=int, default=100, help='Fake environments under ENV_DIR')
+    parser.add_argument('--path-length', type=int, default=50, help='Extra directories on PATH')
+    parser.add_argument('--repeat', type=int, default=10, help='Timed runs per benchmark')
+    parser.add_argument('--create-repeat', type=int, default=3, help='Timed runs for env creation (0 skips)')
+    parser.add_argument('--output', metavar='FILE', help='Write results as JSON')
+    parser.add_argument('--baseline', metavar='FILE', help='Baseline JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.20, help='Allowed median slowdown (default: 0.20)')
+    args = parser.parse_args(argv)
+
+    if os.name == 'nt':
+        print('- Benchmarks use POSIX shell stubs as fake interpreters; run them on Linux/macOS.')
+        return 2
+
+    with tempfile.TemporaryDirectory(prefix='pyxenv-bench-') as tmp:
+        home = build_home(Path(tmp), args.interpreters, args.envs, args.path_length)
+        results = run_benchmarks(home, args.repeat, args.create_repeat)
+
+    report = {
+        'meta': {
+            'pyxenv': __version__,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'params': {
+                'interpreters': args.interpreters,
+                'envs': args.envs,
+                'path_length': args.path_length,
+                'repeat': args.repeat,
+            },
+        },
+        'results': results,
+    }
+
+    for name, stats in results.items():
+        print(f'  {name:<28} median {stats["median"] * 1000:9.2f} ms  (min {stats["min"] * 1000:.2f} ms)')
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f'- Resultados salvos em {args.output}')
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        regressions = compare(results, baseline.get('results', {}), args.threshold)
+        if regressions:
+            print('- Regressões detectadas:')
+            for line in regressions:
+                print(f'  {line}')
+            return 1
+        print('- Nenhuma regressão em relação ao baseline.')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""Build pyxenv as a single-file zipapp (pyxenv.pyz).
+
+The archive contains the pyxenv sources plus precompiled unchecked-hash
+bytecode, so no compilation or source stat happens at startup. It starts
+with a small POSIX shell prelude that runs the interpreter with ``-S``
+(no ``site`` scanning); it can also be run as ``python pyxenv.pyz``.
+
+Usage:
+    python build_pyz.py                     # writes dist/pyxenv.pyz
+    python build_pyz.py -o /usr/local/bin/pyxenv --python python3.12
+"""
+import argparse
+import importlib.util
+import io
+import marshal
+import os
+import stat
+import sys
+import zipfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+PACKAGE = ROOT / "pyxenv"
+
+MAIN = "from pyxenv.cli import main\nmain()\n"
+
+PRELUDE = '#!/bin/sh\nexec "${{PYXENV_PYTHON:-{python}}}" {flags}"$0" "$@"\n'
+
+
+def _bytecode(source: bytes, filename: str) -> bytes:
+    """Compile source to an unchecked-hash .pyc payload."""
+    code = compile(source, filename, "exec", dont_inherit=True)
+    source_hash = importlib.util.source_hash(source)
+    # Same layout as importlib._bootstrap_external._code_to_hash_pyc
+    # with flags 0b01 (hash-based, do not check the source)
+    data = bytearray(importlib.util.MAGIC_NUMBER)
+    data.extend((0b01).to_bytes(4, "little"))
+    data.extend(source_hash)
+    data.extend(marshal.dumps(code))
+    return bytes(data)
+
+
+def build(output: Path, python: str = "python3", no_site: bool = True) -> Path:
+    """
+    Build the zipapp.
+
+    Args:
+        output: Destination file
+        python: Interpreter used by the shell prelude (overridable at
+            runtime with $PYXENV_PYTHON)
+        no_site: Run the interpreter with -S
+
+    Returns:
+        Path to the created archive
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for source_path in sorted(PACKAGE.glob("*.py")):
+            source = source_path.read_bytes()
+            arcname = f"pyxenv/{source_path.name}"
+            archive.writestr(arcname, source)
+            archive.writestr(arcname + "c", _bytecode(source, arcname))
+        archive.writestr("__main__.py", MAIN)
+
+    flags = "-S " if no_site else ""
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "wb") as fh:
+        fh.write(PRELUDE.format(python=python, flags=flags).encode("utf-8"))
+        fh.write(buffer.getvalue())
+
+    if os.name != "nt":
+        mode = output.stat().st_mode
+        output.chmod(mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return output
+
+
+def main() -> None:
+    """Build entry point."""
+    parser = argparse.ArgumentParser(description="Build pyxenv.pyz")
+    parser.add_argument("-o", "--output", default=str(ROOT / "dist" / "pyxenv.pyz"), help="Output file")
+    parser.add_argument("--python", default="python3", help="Interpreter used by the launcher (default: python3)")
+    parser.add_argument("--site", action="store_true", help="Do not pass -S to the interpreter")
+    args = parser.parse_args()
+
+    output = build(Path(args.output), python=args.python, no_site=not args.site)
+    print(f"- Zipapp criado em {output} (Python {sys.version_info.major}.{sys.version_info.minor} bytecode)")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,24 @@ __version__ = '0.2.0'
 __author__ = 'Luigi C. Filho'
 __email__ = 'lcdev@lcdesenvolvimentos.com.br'
 
-from pyxenv.python_manager import PythonManager
-from pyxenv.venv_manager import VenvManager
+__all__ = ['PythonManager', 'VenvManager', '__version__']
 
-__all__ = ['PythonManager', 'VenvManager', '__version__']
\ No newline at end of file
+# The managers are imported on first access, so "import pyxenv" (and every
+# CLI start) does not load them until a command needs them
+_LAZY = {
+    'PythonManager': 'pyxenv.python_manager',
+    'VenvManager': 'pyxenv.venv_manager',
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    import importlib
+    value = getattr(importlib.import_module(_LAZY[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + list(_LAZY))
@@ -0,0 +1,222 @@
+'''
+Typed programmatic API for embedding pyxenv in other programs.
+
+Functions return dataclasses instead of printing, and report progress
+through an optional callback. The async variants run the blocking work in
+the loop's default executor with the caller's context, so callbacks and
+configuration overrides carry over:
+
+    from pyxenv import api
+
+    env = await api.acreate_environment('build', '3.12', progress=log.info)
+    print(env.python)
+
+Errors are raised as pyxenvError subclasses. Output of the child processes
+pyxenv runs (venv, pip, installers) is not captured.
+'''
+
+import asyncio
+import functools
+import os
+from contextvars import copy_context
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Literal, Optional, TypeVar
+
+from pyxenv import config
+from pyxenv.python_manager import PythonManager
+from pyxenv.registry import build_variant
+from pyxenv.utils import reporting_to
+from pyxenv.venv_manager import VenvManager
+
+Progress = Optional[Callable[[str], None]]
+# Installed by pyxenv (PYTHON_DIR), found on PATH, or from the shared store
+Source = Literal['pyxenv', 'global', 'shared']
+T = TypeVar('T')
+
+
+@dataclass
+class Interpreter:
+    '''A Python interpreter known to pyxenv.'''
+
+    __slots__ = ('version', 'path', 'source')
+
+    version: str
+    path: str
+    source: Source
+
+
+@dataclass
+class Environment:
+    '''A virtual environment under ENV_DIR.'''
+
+    __slots__ = ('name', 'path', 'python', 'python_version')
+
+    name: str
+    path: Path
+    # Interpreter inside the environment
+    python: Path
+    # Version recorded in pyvenv.cfg (None if unreadable)
+    python_version: Optional[str]
+
+
+@dataclass
+class InstallResult:
+    '''Outcome of an interpreter install.'''
+
+    __slots__ = ('version', 'path', 'installed')
+
+    version: str
+    path: Path
+    # False if the version was already installed
+    installed: bool
+
+
+def _source(path: str) -> Source:
+    '''Tell pyxenv installations from shared store and global ones.'''
+    path = Path(os.path.abspath(path))
+    for directory, source in ((config.PYTHON_DIR, 'pyxenv'), (config.STORE_DIR, 'shared')):
+        try:
+            path.relative_to(directory)
+        except ValueError:
+            continue
+        return source
+    return 'global'
+
+
+def _environment(env_path: Path) -> Environment:
+    return Environment(
+        name=env_path.name,
+        path=env_path,
+        python=VenvManager.python_path(env_path),
+        python_version=VenvManager.read_config(env_path).get('version'),
+    )
+
+
+def list_interpreters(list_all: bool = False, progress: Progress = None) -> list[Interpreter]:
+    '''
+    List interpreters, newest first.
+
+    Args:
+        list_all: Include global installations (default: only pyxenv's)
+        progress: Receives progress messages
+
+    Returns:
+        Interpreter list
+    '''
+    with reporting_to(progress):
+        return [Interpreter(version, path, source)
+                for version, path, source in PythonManager.find_versions(list_all=list_all)]
+
+
+def resolve(version: Optional[str] = None) -> Interpreter:
+    '''
+    Find the interpreter for a version or specifier (e.g. "3.12", ">=3.10", "3.13t").
+
+    Args:
+        version: Version, specifier, or None for the default interpreter
+
+    Returns:
+        Interpreter with its exact version
+
+    Raises:
+        PythonNotFoundError: If no interpreter matches
+    '''
+    path = PythonManager.get_executable(version)
+    info = PythonManager.fingerprint(path)
+    exact = info['version'] + build_variant(info) if info else (version or 'default')
+    return Interpreter(exact, path, _source(path))
+
+
+def list_environments() -> list[Environment]:
+    '''
+    List environments, sorted by name.
+
+    Returns:
+        Environment list
+    '''
+    return [_environment(config.ENV_DIR / name) for name in sorted(VenvManager.list_all())]
+
+
+def install(version: str, precompile: bool = False, invalidation_mode: Optional[str] = None,
+            progress: Progress = None) -> InstallResult:
+    '''
+    Install an interpreter into PYTHON_DIR (Windows installers).
+
+    Args:
+        version: Version to install (e.g. "3.12", "3.12.4", "3.13t")
+        precompile: Compile the standard library bytecode after installing
+        invalidation_mode: compileall invalidation mode (e.g. "unchecked-hash")
+        progress: Receives progress messages
+
+    Returns:
+        InstallResult
+
+    Raises:
+        DownloadError, InstallationError: If the install fails
+    '''
+    # Imported lazily: urllib is costly and only needed to install
+    from pyxenv.installer import PythonInstaller
+
+    existed = (config.PYTHON_DIR / version).exists()
+    with reporting_to(progress):
+        path = PythonInstaller.install(version, precompile_bytecode=precompile,
+                                       invalidation_mode=invalidation_mode)
+    return InstallResult(version, path, not existed)
+
+
+def create_environment(name: str, version: str, requirements: Optional[Path] = None,
+                       precompile: bool = False, invalidation_mode: Optional[str] = None,
+                       progress: Progress = None) -> Environment:
+    '''
+    Create an environment, or reuse an existing one.
+
+    Args:
+        name: Environment name
+        version: Python version or specifier
+        requirements: Requirements file to install (synced if the environment exists)
+        precompile: Compile the environment's bytecode after creation
+        invalidation_mode: compileall invalidation mode (e.g. "unchecked-hash")
+        progress: Receives progress messages
+
+    Returns:
+        Environment
+
+    Raises:
+        VenvError: If creation fails
+    '''
+    with reporting_to(progress):
+        env_path = VenvManager.create(version, name, precompile_bytecode=precompile,
+                                      invalidation_mode=invalidation_mode, requirements=requirements)
+    return _environment(env_path)
+
+
+async def _in_executor(func: Callable[..., T], *args, **kwargs) -> T:
+    '''Run a blocking call in the default executor, in a copy of the current context.'''
+    loop = asyncio.get_running_loop()
+    call = functools.partial(copy_context().run, func, *args, **kwargs)
+    return await loop.run_in_executor(None, call)
+
+
+async def alist_interpreters(list_all: bool = False, progress: Progress = None) -> list[Interpreter]:
+    '''Async variant of list_interpreters.'''
+    return await _in_executor(list_interpreters, list_all, progress)
+
+
+async def aresolve(version: Optional[str] = None) -> Interpreter:
+    '''Async variant of resolve.'''
+    return await _in_executor(resolve, version)
+
+
+async def ainstall(version: str, precompile: bool = False, invalidation_mode: Optional[str] = None,
+                   progress: Progress = None) -> InstallResult:
+    '''Async variant of install.'''
+    return await _in_executor(install, version, precompile, invalidation_mode, progress)
+
+
+async def acreate_environment(name: str, version: str, requirements: Optional[Path] = None,
+                              precompile: bool = False, invalidation_mode: Optional[str] = None,
+                              progress: Progress = None) -> Environment:
+    '''Async variant of create_environment.'''
+    return await _in_executor(create_environment, name, version, requirements,
+                              precompile, invalidation_mode, progress)
@@ -0,0 +1,183 @@
+'''Relocatable export and import of environments as compressed archives.'''
+
+import gzip
+import io
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from pyxenv import config
+from pyxenv.exceptions import VenvError
+from pyxenv.integrity import IntegrityManager
+from pyxenv.locks import FileLock
+from pyxenv.utils import report
+from pyxenv.venv_manager import VenvManager
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+METADATA_NAME = 'pyxenv-export.json'
+ENV_PREFIX = 'env'
+
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+_GZIP_MAGIC = b'\x1f\x8b'
+
+
+def _compression_for(path: Path) -> str:
+    '''Pick the compression for an output file from its name.'''
+    name = path.name.lower()
+    if name.endswith(('.tar.zst', '.tzst')):
+        return 'zstd'
+    if name.endswith(('.tar.gz', '.tgz')):
+        return 'gzip'
+    return 'none'
+
+
+class EnvArchiver:
+    '''Exports environments to streamed tar archives and imports them back.'''
+
+    @staticmethod
+    def export(env_name: str, output: Path) -> Path:
+        '''
+        Export an environment to a (compressed) tar archive.
+
+        Compression follows the file name: ".tar.zst" uses multithreaded
+        zstd (requires the "zstandard" package, otherwise gzip is used and
+        the name is changed to ".tar.gz"), ".tar.gz" uses gzip and ".tar"
+        is uncompressed. Hardlinks and symlinks are preserved.
+
+        Args:
+            env_name: Environment name under ENV_DIR
+            output: Archive path
+
+        Returns:
+            Path to the written archive
+
+        Raises:
+            VenvError: If the environment does not exist
+        '''
+        env_path = config.ENV_DIR / env_name
+        if not env_path.exists():
+            raise VenvError(f'Ambiente "{env_name}" não encontrado.')
+
+        output = Path(output)
+        compression = _compression_for(output)
+        if compression == 'zstd' and zstandard is None:
+            report('- Aviso: pacote "zstandard" não instalado, usando gzip.')
+            compression = 'gzip'
+            stem = output.name[:-len('.tar.zst')] if output.name.lower().endswith('.tar.zst') else output.stem
+            output = output.with_name(f'{stem}.tar.gz')
+
+        metadata = {
+            'name': env_name,
+            'prefix': str(env_path),
+            'python_dir': str(config.PYTHON_DIR),
+        }
+        payload = json.dumps(metadata, indent=2).encode('utf-8')
+
+        report(f'- Exportando "{env_name}" para {output}')
+        with FileLock.for_target(env_path, shared=True), open(output, 'wb') as raw:
+            stream, closer = EnvArchiver._compressor(raw, compression)
+            try:
+                with tarfile.open(fileobj=stream, mode='w|') as tar:
+                    info = tarfile.TarInfo(METADATA_NAME)
+                    info.size = len(payload)
+                    tar.addfile(info, fileobj=io.BytesIO(payload))
+                    tar.add(str(env_path), arcname=ENV_PREFIX)
+            finally:
+                closer()
+        return output
+
+    @staticmethod
+    def _compressor(raw: BinaryIO, compression: str):
+        '''Wrap a file in a streaming compressor; returns (stream, close).'''
+        if compression == 'zstd':
+            writer = zstandard.ZstdCompressor(level=3, threads=-1).stream_writer(raw, closefd=False)
+            return writer, writer.close
+        if compression == 'gzip':
+            writer = gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6)
+            return writer, writer.close
+        return raw, lambda: None
+
+    @staticmethod
+    def _decompressor(raw: BinaryIO) -> BinaryIO:
+        '''Detect the compression of an archive from its magic bytes.'''
+        magic = raw.read(4)
+        raw.seek(0)
+        if magic.startswith(_ZSTD_MAGIC):
+            if zstandard is None:
+                raise VenvError('Arquivo compactado com zstd: instale o pacote "zstandard".')
+            return zstandard.ZstdDecompressor().stream_reader(raw)
+        if magic.startswith(_GZIP_MAGIC):
+            return gzip.GzipFile(fileobj=raw, mode='rb')
+        return raw
+
+    @staticmethod
+    def import_archive(archive: Path, env_name: Optional[str] = None) -> Path:
+        '''
+        Import an environment archive into ENV_DIR and fix its paths.
+
+        Args:
+            archive: Archive created by export
+            env_name: Target environment name (default: the exported name)
+
+        Returns:
+            Path to the imported environment
+
+        Raises:
+            VenvError: If the archive is invalid or the environment exists
+        '''
+        archive = Path(archive)
+        config.ENV_DIR.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix='.import-', dir=config.ENV_DIR))
+        try:
+            with open(archive, 'rb') as raw:
+                metadata = EnvArchiver._extract(EnvArchiver._decompressor(raw), staging)
+
+            env_name = env_name or metadata['name']
+            env_path = config.ENV_DIR / env_name
+            with FileLock.for_target(env_path):
+                if env_path.exists():
+                    raise VenvError(f'Ambiente "{env_name}" já existe.')
+                os.replace(staging / ENV_PREFIX, env_path)
+
+            rewritten = VenvManager.relocate(env_path, {
+                metadata['prefix']: str(env_path),
+                metadata['python_dir']: str(config.PYTHON_DIR),
+            })
+            IntegrityManager.update(env_path, rewritten)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        report(f'- Ambiente "{env_name}" importado em {env_path}')
+        return env_path
+
+    @staticmethod
+    def _extract(stream: BinaryIO, destination: Path) -> dict:
+        '''Extract a streamed archive, returning its metadata.'''
+        metadata = None
+        try:
+            with tarfile.open(fileobj=stream, mode='r|') as tar:
+                for member in tar:
+                    if member.name == METADATA_NAME:
+                        metadata = json.loads(tar.extractfile(member).read().decode('utf-8'))
+                        continue
+                    parts = Path(member.name).parts
+                    if not parts or parts[0] != ENV_PREFIX or '..' in parts or member.name.startswith('/'):
+                        raise VenvError(f'Entrada inválida no arquivo: {member.name}')
+                    if hasattr(tarfile, 'tar_filter'):
+                        tar.extract(member, destination, filter='tar')
+                    else:
+                        tar.extract(member, destination)
+        except (tarfile.TarError, OSError, ValueError) as e:
+            raise VenvError(f'Arquivo de ambiente inválido: {e}')
+        if metadata is None or not (destination / ENV_PREFIX).is_dir():
+            raise VenvError('Arquivo de ambiente inválido: metadados ausentes.')
+        return metadata
+
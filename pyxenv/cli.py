@@ -1,14 +1,95 @@
 '''Command-line interface for pyxenv.'''
 
 import argparse
+import json
 import sys
+from pathlib import Path
+from typing import Iterable
 
-from pyxenv import __version__
+from pyxenv import __version__, config, metrics
 from pyxenv.exceptions import pyxenvError
-from pyxenv.installer import PythonInstaller
-from pyxenv.python_manager import PythonManager
-from pyxenv.venv_manager import VenvManager
-from pyxenv.utils import run_command
+from pyxenv.locks import FileLock
+from pyxenv.project import find_project_env, find_project_version
+from pyxenv.shell import SHELLS, render_exports, render_hook
+from pyxenv.shims import SHIM_MODES
+from pyxenv.utils import INVALIDATION_MODES, format_size, run_command
+
+# Modules used by a single command are imported in its branch of main(),
+# and the managers once main() is past --version and --metrics, so
+# "pyxenv 3.11 script.py" does not pay for the others at startup
+
+
+def _print_records(records: Iterable[dict], output_format: str) -> None:
+    '''Print records as a JSON array or as JSON lines flushed one by one.'''
+    if output_format == 'json':
+        print(json.dumps(list(records), ensure_ascii=False, indent=2))
+        return
+    for record in records:
+        print(json.dumps(record, ensure_ascii=False), flush=True)
+
+
+def _env_record(env_name: str) -> dict:
+    '''Describe an environment for JSON output.'''
+    from pyxenv.venv_manager import VenvManager
+
+    env_path = config.ENV_DIR / env_name
+    python = VenvManager.read_config(env_path).get('version')
+    return {'name': env_name, 'path': str(env_path), 'python': python}
+
+
+def _run_script(python_exe: str, command: list[str]) -> None:
+    '''Run a script through a fork server when one is up, else in a new interpreter.'''
+    code = None
+    # The client is only imported when some server has left its socket
+    if any(config.RUN_DIR.glob('forkserver-*.sock')):
+        from pyxenv.forkserver import ForkServer
+        code = ForkServer.run(python_exe, command)
+    if code is None:
+        run_command([python_exe] + command)
+    elif code:
+        sys.exit(code)
+
+
+def _split_script_args(parser: argparse.ArgumentParser, argv: list[str]) -> tuple[list[str], list[str]]:
+    '''
+    Split the command line after the script positional.
+
+    Everything after the script belongs to it, even arguments that look
+    like pyxenv options ("pyxenv 3.11 s.py -r x --json").
+
+    Returns:
+        Tuple (pyxenv arguments, script arguments)
+    '''
+    positionals = 0
+    only_positionals = False
+    index = 0
+    while index < len(argv):
+        token = argv[index]
+        index += 1
+        if not only_positionals and token == '--':
+            only_positionals = True
+            continue
+        if not only_positionals and token.startswith('-') and token != '-':
+            action = parser._option_string_actions.get(token)
+            if action is None or '=' in token:
+                continue
+            # Skip the option's values the way argparse consumes them
+            if isinstance(action.nargs, int):
+                index += action.nargs
+            elif action.nargs is None:
+                index += 1
+            elif action.nargs == '?':
+                if index < len(argv) and not argv[index].startswith('-'):
+                    index += 1
+            elif action.nargs == '+':
+                while index < len(argv) and not argv[index].startswith('-'):
+                    index += 1
+            continue
+        positionals += 1
+        # Positionals are the version (or "run"/"exec"/"shell-hook") and the script
+        if positionals == 2:
+            return argv[:index], argv[index:]
+    return argv, []
 
 
 def main() -> None:
@@ -16,44 +97,308 @@ def main() -> None:
     parser = argparse.ArgumentParser(
         description='pyxenv: npx para Python — gerencie versões e ambientes facilmente',
         formatter_class=argparse.RawDescriptionHelpFormatter,
+        # Abbreviations would let "--py" or "--js" in a script's arguments hit pyxenv options
+        allow_abbrev=False,
         epilog='''
             Exemplos:
                 pyxenv 3.11 script.py          # Executa script com Python 3.11
+                pyxenv run script.py           # Usa a versão do .python-version/pyproject.toml
+                pyxenv 3.13t script.py         # Usa o build free-threaded (3.12d: build de debug)
                 pyxenv --create-env myenv      # Cria ambiente virtual
+                pyxenv --create-env myenv -r requirements.txt   # Cria e sincroniza dependências
+                pyxenv --wheelhouse fetch -r requirements.txt --python 3.11,3.12   # Pré-baixa wheels
                 pyxenv --activate myenv        # Ativa ambiente virtual
+                pyxenv --env myenv exec -- pytest -q   # Executa comando no ambiente, sem shell
+                eval "$(pyxenv --env myenv --print-env)"   # Ativa o ambiente no shell atual
+                eval "$(pyxenv shell-hook bash)"       # Troca de ambiente ao mudar de diretório (.pyxenv-env)
                 pyxenv --list                  # Lista versões pyxenv
                 pyxenv --list-all              # Lista todas as versões
+                pyxenv --list-all --jsonl      # Uma linha JSON por versão, assim que detectada
+                pyxenv --shims                 # Gera launchers python3.X em ~/.pyxenv/shims
+                pyxenv --clone myenv shard-1   # Clona ambiente (reflink quando suportado)
+                pyxenv --snapshot myenv        # Cria cópia myenv@AAAAMMDD-HHMMSS
+                pyxenv --export myenv env.tar.zst   # Exporta ambiente para arquivo
+                pyxenv --import env.tar.zst myenv   # Importa ambiente de arquivo
+                pyxenv --mirror sync 3.11 3.12 # Espelha instaladores em ~/.pyxenv/mirror
+                pyxenv --mirror sync 3.11 3.12 --limit-rate 2M   # Limita a banda a 2 MB/s
+                PYXENV_SHARED_STORE=/mnt/pyxenv pyxenv --publish 3.12.4   # Publica no store compartilhado
+                pyxenv --verify myenv --deep   # Verifica a integridade (hash de cada arquivo)
+                pyxenv --serve 3.11 --preload numpy,pandas   # Mantém um 3.11 pré-aquecido (Unix)
+                pyxenv --serve 3.11 --stop     # Encerra o servidor do 3.11
+                pyxenv --metrics > /var/lib/node_exporter/pyxenv.prom   # Exporta métricas
+                pyxenv --optimize-env myenv --invalidation-mode unchecked-hash   # Acelera a inicialização
+                pyxenv --du                    # Mostra o uso de disco
+                pyxenv --gc --older-than 30d   # Remove ambientes/versões sem uso
         '''
     )
     
-    parser.add_argument('version', nargs='?', help='Versão do Python (ex: 3.11)')
+    parser.add_argument('version', nargs='?',
+                        help='Versão do Python (ex: 3.11, 3.13t), "run" para usar a versão do projeto, "exec" ou "shell-hook"')
     parser.add_argument('script', nargs='?', help='Script para executar')
     parser.add_argument('--create-env', metavar='NAME', help='Cria um ambiente virtual')
+    parser.add_argument('-r', '--requirements', metavar='FILE',
+                        help='Instala dependências ao criar o ambiente (só o que mudou)')
     parser.add_argument('--activate', metavar='NAME', help='Ativa um ambiente existente')
+    parser.add_argument('--env', metavar='NAME', help='Ambiente usado por "exec" e --print-env')
+    parser.add_argument('--print-env', action='store_true',
+                        help='Imprime os comandos de shell que ativam o ambiente (para eval)')
     parser.add_argument('--list-envs', action='store_true', help='Lista ambientes criados')
     parser.add_argument('--list', action='store_true', help='Lista versões pyxenv')
     parser.add_argument('--list-all', action='store_true', help='Lista todas as versões')
+    parser.add_argument('--json', dest='output_format', action='store_const', const='json',
+                        help='Saída em JSON para --list, --list-all e --list-envs')
+    parser.add_argument('--jsonl', dest='output_format', action='store_const', const='jsonl',
+                        help='Saída em JSON lines, emitindo cada item assim que detectado')
+    parser.add_argument('--shims', nargs='?', const='script', choices=SHIM_MODES, metavar='MODE',
+                        help='Gera launchers por versão (script ou link)')
+    parser.add_argument('--wheelhouse', choices=('fetch',), metavar='fetch',
+                        help='Com -r e --python, baixa as wheels de cada versão para o wheelhouse local')
+    parser.add_argument('--python', metavar='VERSIONS',
+                        help='Versões separadas por vírgula para --wheelhouse fetch (ex: 3.11,3.12)')
+    parser.add_argument('--clone', nargs=2, metavar=('SRC', 'DST'),
+                        help='Clona um ambiente (reflink, cópia paralela ou --hardlink)')
+    parser.add_argument('--snapshot', metavar='NAME', help='Cria uma cópia datada de um ambiente')
+    parser.add_argument('--hardlink', action='store_true',
+                        help='Com --clone/--snapshot, usa hardlinks quando reflink não é suportado')
+    parser.add_argument('--export', nargs=2, metavar=('NAME', 'FILE'),
+                        help='Exporta um ambiente para .tar.zst/.tar.gz/.tar')
+    parser.add_argument('--import', dest='import_archive', nargs='+', metavar='FILE [NAME]',
+                        help='Importa um ambiente exportado com --export')
+    parser.add_argument('--precompile', action='store_true',
+                        help='Pré-compila o bytecode ao instalar versões ou criar ambientes')
+    parser.add_argument('--invalidation-mode', choices=INVALIDATION_MODES,
+                        help='Modo de invalidação dos .pyc (ex: unchecked-hash para imagens imutáveis)')
+    parser.add_argument('--mirror', nargs='+', metavar='sync SERIES',
+                        help='Baixa instaladores e checksums das séries para o espelho local')
+    parser.add_argument('--limit-rate', metavar='RATE',
+                        help='Limita a banda dos downloads (ex: 500K, 2M), somada entre downloads paralelos')
+    parser.add_argument('--publish', metavar='VERSION',
+                        help='Publica uma versão instalada no store compartilhado (PYXENV_SHARED_STORE)')
+    parser.add_argument('--verify', nargs='?', const='', metavar='TARGET',
+                        help='Verifica a integridade de uma versão ou ambiente (padrão: todos)')
+    parser.add_argument('--deep', action='store_true', help='Com --verify, compara o hash de cada arquivo')
+    parser.add_argument('--serve', metavar='VERSION',
+                        help='Inicia um fork server da versão; scripts dessa versão passam a usá-lo (Unix)')
+    parser.add_argument('--preload', metavar='MODULES', default='',
+                        help='Com --serve, módulos importados uma vez no servidor (ex: numpy,pandas)')
+    parser.add_argument('--stop', action='store_true', help='Com --serve, encerra o servidor')
+    parser.add_argument('--optimize-env', metavar='NAME',
+                        help='Consolida os .pth do ambiente e mede a inicialização antes e depois')
+    parser.add_argument('--undo', action='store_true', help='Com --optimize-env, restaura os .pth originais')
+    parser.add_argument('--du', action='store_true', help='Mostra o uso de disco de versões e ambientes')
+    parser.add_argument('--gc', action='store_true', help='Remove ambientes e versões sem uso')
+    parser.add_argument('--older-than', metavar='DURATION', default='30d',
+                        help='Idade mínima sem uso para --gc (ex: 30d, 12h; padrão: 30d)')
+    parser.add_argument('--keep-latest', metavar='N', type=int, default=0,
+                        help='Mantém os N ambientes e versões usados mais recentemente')
+    parser.add_argument('--metrics', nargs='?', const='prom', choices=('prom', 'json'), metavar='FORMAT',
+                        help='Mostra as métricas acumuladas (prom: formato Prometheus; json)')
+    parser.add_argument('--dry-run', action='store_true', help='Mostra o que seria feito sem alterar nada')
     parser.add_argument('--version', action='store_true', dest='show_version', help='Mostra versão do pyxenv')
 
-    args, extras = parser.parse_known_args()
+    own, script_args = _split_script_args(parser, sys.argv[1:])
+    args, extras = parser.parse_known_args(own)
+    extras += script_args
 
+    compile_options = {}
+    if args.precompile or args.invalidation_mode:
+        compile_options = {'precompile_bytecode': True, 'invalidation_mode': args.invalidation_mode}
+
+    metrics.inc('invocations_total')
     try:
+        if args.limit_rate:
+            # Imported lazily: only downloads need it
+            from pyxenv import transfer
+            transfer.set_limit(args.limit_rate)
+
         # Show version
         if args.show_version and not any([args.script, args.create_env, args.activate, args.list, args.list_all, args.list_envs]):
             print(f'pyxenv {__version__}')
             return
 
+        # Operational metrics
+        if args.metrics:
+            metrics.flush()
+            sys.stdout.write(metrics.render_json() + '\n' if args.metrics == 'json' else metrics.render_prometheus())
+            return
+
+        # Every other command works with interpreters or environments
+        from pyxenv.python_manager import PythonManager
+        from pyxenv.shims import ShimManager
+        from pyxenv.venv_manager import VenvManager
+
         # List Python versions
         if args.list or args.list_all:
+            if args.output_format:
+                if args.output_format == 'jsonl':
+                    versions = PythonManager.iter_versions(list_all=args.list_all)
+                else:
+                    versions = PythonManager.find_versions(list_all=args.list_all)
+                _print_records(({'version': ver, 'path': path, 'source': source}
+                                for ver, path, source in versions), args.output_format)
+                return
+            from pyxenv.registry import InterpreterRegistry, build_features
             print('- Versões detectadas:')
             versions = PythonManager.find_versions(list_all=args.list_all)
             for ver, path, source in versions:
-                tag = '(pyxenv)' if source == 'pyxenv' else '(global)'
+                tag = f'({source})'
+                features = build_features(InterpreterRegistry.cached(path))
+                if features:
+                    tag += f' [{", ".join(features)}]'
                 print(f'  {ver} → {path} {tag}')
             return
 
+        # Generate shims
+        if args.shims:
+            shims = ShimManager.generate(args.shims)
+            print(f'- Shims gerados em {config.SHIM_DIR}:')
+            for name, path in sorted(shims.items()):
+                print(f'  {name} → {path}')
+            print(f'- Adicione ao PATH: export PATH="{config.SHIM_DIR}:$PATH"')
+            return
+
+        # Clone / snapshot environments
+        if args.clone:
+            from pyxenv.clone import EnvCloner
+            EnvCloner.clone(*args.clone, hardlink=args.hardlink)
+            return
+
+        if args.snapshot:
+            from pyxenv.clone import EnvCloner
+            path = EnvCloner.snapshot(args.snapshot, hardlink=args.hardlink)
+            print(f'- Snapshot criado: {path.name}')
+            return
+
+        # Export / import environments
+        if args.export:
+            from pyxenv.archive import EnvArchiver
+            output = EnvArchiver.export(*args.export)
+            print(f'- Ambiente exportado para {output}')
+            return
+
+        if args.import_archive:
+            if len(args.import_archive) > 2:
+                parser.error('--import aceita FILE e, opcionalmente, NAME')
+            from pyxenv.archive import EnvArchiver
+            EnvArchiver.import_archive(*args.import_archive)
+            return
+
+        # Offline mirror
+        if args.mirror:
+            if args.mirror[0] != 'sync' or len(args.mirror) < 2:
+                parser.error('uso: pyxenv --mirror sync SERIE [SERIE...]')
+            from pyxenv.mirror import MirrorManager
+            MirrorManager.sync(args.mirror[1:])
+            print(f'- Use o espelho com: export PYXENV_PYTHON_FTP_BASE="{config.MIRROR_DIR}"')
+            return
+
+        # Shared wheelhouse
+        if args.wheelhouse:
+            versions = [v.strip() for v in (args.python or '').split(',') if v.strip()]
+            if not args.requirements or not versions:
+                parser.error('uso: pyxenv --wheelhouse fetch -r REQUISITOS --python 3.11,3.12')
+            from pyxenv.wheelhouse import WheelhouseManager
+            counts = WheelhouseManager.fetch(Path(args.requirements), versions)
+            for version, count in counts.items():
+                print(f'- Python {version}: {count} arquivos')
+            print(f'- Wheelhouse: {config.WHEELHOUSE_DIR}')
+            return
+
+        # Shared interpreter store
+        if args.publish:
+            from pyxenv.store import SharedStore
+            SharedStore.publish(args.publish)
+            return
+
+        # Integrity verification
+        if args.verify is not None:
+            from pyxenv.integrity import IntegrityManager
+            targets = IntegrityManager.targets(args.verify or None)
+            if not targets:
+                raise pyxenvError(f'Nada para verificar: {args.verify}')
+            damaged = False
+            for target in targets:
+                result = IntegrityManager.verify(target, deep=args.deep)
+                if result is None:
+                    print(f'- Sem manifesto: {target}')
+                    continue
+                problems = [('faltando', p) for p in result['missing']] + [('alterado', p) for p in result['modified']]
+                if not problems:
+                    print(f'- OK: {target}')
+                    continue
+                damaged = True
+                print(f'- Danificado: {target}')
+                for kind, path in problems[:20]:
+                    print(f'  {kind}: {path}')
+                if len(problems) > 20:
+                    print(f'  ... e mais {len(problems) - 20}')
+            if damaged:
+                sys.exit(1)
+            return
+
+        # Fork server
+        if args.serve:
+            from pyxenv.forkserver import ForkServer
+            python_exe = PythonManager.get_executable(args.serve)
+            if args.stop:
+                if ForkServer.stop(python_exe):
+                    print(f'- Servidor do Python {args.serve} encerrado.')
+                else:
+                    print(f'- Nenhum servidor em execução para o Python {args.serve}.')
+                return
+            preload = tuple(name.strip() for name in args.preload.split(',') if name.strip())
+            pid = ForkServer.start(python_exe, preload)
+            print(f'- Servidor do Python {args.serve} iniciado (pid {pid}): {ForkServer.socket_path(python_exe)}')
+            return
+
+        # Startup tuning
+        if args.optimize_env:
+            from pyxenv.optimize import CONSOLIDATED_PTH, EnvOptimizer
+            if args.undo:
+                restored = EnvOptimizer.restore(args.optimize_env)
+                print(f'- {restored} arquivos .pth restaurados em "{args.optimize_env}".')
+                return
+            report = EnvOptimizer.optimize(args.optimize_env, args.invalidation_mode)
+            before, after = report['before'], report['after']
+            print(f'- {len(report["consolidated"])} arquivos .pth consolidados em {CONSOLIDATED_PTH}'
+                  f' ({len(report["sys_path"])} entradas no sys.path)')
+            print(f'- Inicialização: {before["wall_ms"]:.1f} ms → {after["wall_ms"]:.1f} ms'
+                  f' (importações: {before["import_ms"]:.1f} ms → {after["import_ms"]:.1f} ms)')
+            return
+
+        # Disk usage
+        if args.du:
+            from pyxenv.storage import StorageManager
+            usage = StorageManager.usage()
+            total = 0
+            for group, title in (('pythons', 'Versões'), ('envs', 'Ambientes')):
+                print(f'- {title}:')
+                for name, size, files in sorted(usage[group], key=lambda x: x[1], reverse=True):
+                    print(f'  {format_size(size):>10}  {name} ({files} arquivos)')
+                    total += size
+            print(f'- Total: {format_size(total)}')
+            return
+
+        # Garbage collection
+        if args.gc:
+            from pyxenv.storage import StorageManager, parse_duration
+            removed, skipped = StorageManager.collect(
+                parse_duration(args.older_than), args.keep_latest, dry_run=args.dry_run)
+            verb = 'Seria removido' if args.dry_run else 'Removido'
+            for path in removed:
+                print(f'- {verb}: {path}')
+            for path in skipped:
+                print(f'- Em uso, ignorado: {path}')
+            if not removed and not skipped:
+                print('- Nada para remover.')
+            return
+
         # List environments
         if args.list_envs:
+            if args.output_format:
+                _print_records((_env_record(env) for env in sorted(VenvManager.list_all())),
+                               args.output_format)
+                return
             print('- Ambientes disponíveis:')
             envs = VenvManager.list_all()
             if envs:
@@ -63,6 +408,26 @@ def main() -> None:
                 print('  (nenhum ambiente encontrado)')
             return
 
+        # Shell integration
+        if args.print_env:
+            env_name = args.env or find_project_env()
+            if not env_name:
+                parser.error('uso: pyxenv --env NAME --print-env (ou um arquivo .pyxenv-env)')
+            sys.stdout.write(render_exports(env_name, VenvManager.activation_delta(env_name)))
+            return
+
+        if args.version == 'shell-hook':
+            if args.script not in SHELLS:
+                parser.error(f'uso: pyxenv shell-hook {{{",".join(SHELLS)}}}')
+            sys.stdout.write(render_hook(args.script))
+            return
+
+        # Run a command inside an environment
+        if args.version == 'exec':
+            if not args.env or not args.script:
+                parser.error('uso: pyxenv --env NAME exec -- COMANDO [ARGS...]')
+            sys.exit(VenvManager.exec(args.env, [args.script] + extras))
+
         # Activate environment
         if args.activate:
             VenvManager.activate(args.activate)
@@ -71,20 +436,36 @@ def main() -> None:
         # Create environment
         if args.create_env:
             version = args.version or '3.11'
-            VenvManager.create(version, args.create_env)
+            create_options = dict(compile_options)
+            if args.requirements:
+                create_options['requirements'] = Path(args.requirements)
+            VenvManager.create(version, args.create_env, **create_options)
             return
 
         # Execute script with version
         if args.version and args.script:
             version = args.version
+            if version == 'run':
+                version = find_project_version()
             try:
                 python_exe = PythonManager.get_executable(version)
             except pyxenvError:
+                if version is None:
+                    raise
                 print(f'- Python {version} não encontrado. Instalando...')
-                PythonInstaller.install(version)
+                # Imported lazily: urllib is costly and only needed to install
+                from pyxenv.installer import PythonInstaller
+                PythonInstaller.install(version, **compile_options)
                 python_exe = PythonManager.get_executable(version)
             
-            run_command([python_exe, args.script] + extras)
+            from pyxenv.storage import StorageManager
+            owner = StorageManager.owner(python_exe)
+            if owner is None:
+                _run_script(python_exe, [args.script] + extras)
+                return
+            StorageManager.mark_used(owner)
+            with FileLock.for_target(owner, shared=True):
+                _run_script(python_exe, [args.script] + extras)
             return
 
         # No valid command
@@ -99,6 +480,10 @@ def main() -> None:
     except Exception as e:
         print(f'- Erro inesperado: {e}')
         sys.exit(1)
+    finally:
+        # Commands that recorded nothing else (--version, --help) leave the store untouched
+        if metrics.pending(ignore=('invocations_total',)):
+            metrics.flush()
 
 
 if __name__ == '__main__':
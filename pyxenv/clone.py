@@ -0,0 +1,191 @@
+'''Fast cloning and snapshots of environments (reflink, hardlink or copy).'''
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from pyxenv import config
+from pyxenv.exceptions import VenvError
+from pyxenv.integrity import IntegrityManager
+from pyxenv.locks import FileLock
+from pyxenv.storage import StorageManager
+from pyxenv.utils import report
+from pyxenv.venv_manager import VenvManager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+
+def reflink(src: str, dst: str) -> bool:
+    '''
+    Clone a file's extents copy-on-write (btrfs, XFS, ...).
+
+    Args:
+        src: Source file
+        dst: Destination file (created or truncated)
+
+    Returns:
+        True if cloned, False if the filesystem does not support it
+    '''
+    if fcntl is None or not sys.platform.startswith('linux'):
+        return False
+    with open(src, 'rb') as source, open(dst, 'wb') as target:
+        try:
+            fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+        except OSError:
+            return False
+    shutil.copystat(src, dst)
+    return True
+
+
+class _TreeCopier:
+    '''Copies a tree file by file in parallel, preferring the cheapest method.'''
+
+    def __init__(self, hardlink: bool = False):
+        self.hardlink = hardlink
+        self.counts = {'reflink': 0, 'hardlink': 0, 'copy': 0}
+        self._reflink_supported = True
+        self._lock = threading.Lock()
+
+    def _count(self, method: str) -> None:
+        with self._lock:
+            self.counts[method] += 1
+
+    def copy_file(self, src: str, dst: str, linkable: bool) -> None:
+        '''Copy one file with reflink, then hardlink (if allowed), then a plain copy.'''
+        if self._reflink_supported:
+            if reflink(src, dst):
+                self._count('reflink')
+                return
+            self._reflink_supported = False
+        if self.hardlink and linkable:
+            try:
+                if os.path.lexists(dst):
+                    os.unlink(dst)
+                os.link(src, dst)
+                self._count('hardlink')
+                return
+            except OSError:
+                pass
+        shutil.copy2(src, dst)
+        self._count('copy')
+
+    def copy_tree(self, src: Path, dst: Path, private: tuple = (), max_workers: Optional[int] = None) -> None:
+        '''
+        Recreate a tree, copying regular files in a thread pool.
+
+        Args:
+            src: Source directory
+            dst: Destination directory (must not exist)
+            private: Top-level names that are never hardlinked because they
+                are rewritten in place afterwards
+            max_workers: Thread pool size
+        '''
+        files = []
+        for root, dirs, names in os.walk(src):
+            relative = os.path.relpath(root, src)
+            target_root = dst if relative == '.' else dst / relative
+            target_root.mkdir(parents=True, exist_ok=True)
+            top = relative.split(os.sep)[0] if relative != '.' else None
+            for name in list(dirs):
+                source = os.path.join(root, name)
+                if os.path.islink(source):
+                    os.symlink(os.readlink(source), target_root / name)
+                    dirs.remove(name)
+            for name in names:
+                source = os.path.join(root, name)
+                if os.path.islink(source):
+                    os.symlink(os.readlink(source), target_root / name)
+                    continue
+                linkable = top is not None and top not in private
+                files.append((source, str(target_root / name), linkable))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for future in [pool.submit(self.copy_file, *item) for item in files]:
+                future.result()
+        shutil.copystat(src, dst)
+
+
+class EnvCloner:
+    '''Clones environments under ENV_DIR and fixes their paths.'''
+
+    @staticmethod
+    def clone(source: str, target: str, hardlink: bool = False) -> Path:
+        '''
+        Clone an environment.
+
+        Files are cloned copy-on-write where the filesystem supports it,
+        otherwise copied (or hardlinked, if requested) in parallel. The
+        scripts directory and top-level files are never hardlinked, since
+        relocating rewrites them.
+
+        Args:
+            source: Existing environment name
+            target: New environment name
+            hardlink: Hardlink library files when reflinks are unavailable
+                (shares them with the source; do not edit them in place)
+
+        Returns:
+            Path to the new environment
+
+        Raises:
+            VenvError: If the source does not exist or the target exists
+        '''
+        source_path = config.ENV_DIR / source
+        target_path = config.ENV_DIR / target
+        if not source_path.is_dir():
+            raise VenvError(f'Ambiente "{source}" não encontrado.')
+        if target_path.exists():
+            raise VenvError(f'Ambiente "{target}" já existe.')
+
+        scripts = VenvManager.python_path(source_path).parent.name
+        copier = _TreeCopier(hardlink=hardlink)
+        staging = Path(tempfile.mkdtemp(prefix='.clone-', dir=config.ENV_DIR))
+        try:
+            with FileLock.for_target(source_path, shared=True):
+                copier.copy_tree(source_path, staging / 'env', private=(scripts,),
+                                 max_workers=config.get_config().workers)
+            with FileLock.for_target(target_path):
+                if target_path.exists():
+                    raise VenvError(f'Ambiente "{target}" já existe.')
+                os.replace(staging / 'env', target_path)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        rewritten = VenvManager.relocate(target_path, {str(source_path): str(target_path)})
+        IntegrityManager.update(target_path, rewritten)
+        StorageManager.mark_used(target_path)
+        used = ', '.join(f'{count} {method}' for method, count in copier.counts.items() if count)
+        report(f'- Ambiente "{source}" clonado para "{target}" ({used or "vazio"})')
+        return target_path
+
+    @staticmethod
+    def snapshot(env_name: str, hardlink: bool = False) -> Path:
+        '''
+        Clone an environment under a timestamped name ("NAME@YYYYmmdd-HHMMSS").
+
+        Args:
+            env_name: Environment name
+            hardlink: See clone
+
+        Returns:
+            Path to the snapshot
+        '''
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        name = f'{env_name}@{stamp}'
+        suffix = 1
+        while (config.ENV_DIR / name).exists():
+            name = f'{env_name}@{stamp}-{suffix}'
+            suffix += 1
+        return EnvCloner.clone(env_name, name, hardlink=hardlink)
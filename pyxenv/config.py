@@ -1,18 +1,203 @@
-'''Configuration and constants for pyxenv.'''
+'''
+Configuration and constants for pyxenv.
 
+Settings are layered, later layers overriding earlier ones:
+
+1. Built-in defaults
+2. User file: ~/.pyxenv/config.toml (top-level keys)
+3. Project file: [tool.pyxenv] in the nearest pyproject.toml (tuning
+   knobs only, see PROJECT_KEYS)
+4. Environment variables: PYXENV_<KEY> (e.g. PYXENV_WORKERS=8)
+
+They are read lazily on first use and cached for the process lifetime.
+The legacy module constants (PYTHON_DIR, ENV_DIR, ...) are still
+available as attributes and can be patched in tests.
+'''
+
+import os
 from pathlib import Path
+from typing import NamedTuple, Optional
+
+
+class Settings(NamedTuple):
+    '''Resolved pyxenv settings.'''
+
+    # Diretórios base (derivados de home quando não configurados)
+    home: Path
+    python_dir: Path
+    env_dir: Path
+    shim_dir: Path
+    lock_dir: Path
+    mirror_dir: Path
+    cache_dir: Path
+    run_dir: Path
+    log_dir: Path
+    wheelhouse_dir: Path
+    store_dir: Path
+    # Store compartilhado (somente leitura, ex: NFS) de onde store_dir é preenchido
+    shared_store: Optional[Path] = None
+    # URLs (python_ftp_base pode apontar para um espelho HTTP ou diretório local)
+    python_ftp_base: str = 'https://www.python.org/ftp/python/'
+    python_ftp_upstream: str = 'https://www.python.org/ftp/python/'
+    # Versões Python suportadas
+    supported_versions: tuple = ('3.8', '3.9', '3.10', '3.11', '3.12', '3.13', '3.14')
+    # Concorrência e prazos
+    workers: Optional[int] = None
+    probe_timeout: float = 5.0
+    network_timeout: float = 30.0
+    # Limite de banda dos downloads (ex: "500K", "2M" bytes/s; vazio = sem limite)
+    limit_rate: Optional[str] = None
+    # Tamanhos de cache
+    project_cache_size: int = 256
+    # Interpretadores do store mantidos em store_dir (os menos usados são removidos)
+    store_cache_size: int = 8
+
+
+# Directories derived from home unless set explicitly
+_HOME_SUBDIRS = {
+    'python_dir': 'pythons',
+    'env_dir': 'envs',
+    'shim_dir': 'shims',
+    'lock_dir': 'locks',
+    'mirror_dir': 'mirror',
+    'cache_dir': 'cache',
+    'run_dir': 'run',
+    'log_dir': 'logs',
+    'wheelhouse_dir': 'wheelhouse',
+    'store_dir': 'store',
+}
+
+# Keys a project's pyproject.toml may set: locations and URLs are left to
+# the user so a checked-out repository cannot redirect downloads
+PROJECT_KEYS = frozenset({'supported_versions', 'workers', 'probe_timeout', 'network_timeout',
+                          'project_cache_size'})
+
+ENV_PREFIX = 'PYXENV_'
+USER_CONFIG_FILE = 'config.toml'
+
+# Legacy constant names -> Settings fields
+_LEGACY_NAMES = {
+    'pyxenv_HOME': 'home',
+    'PYTHON_DIR': 'python_dir',
+    'ENV_DIR': 'env_dir',
+    'SHIM_DIR': 'shim_dir',
+    'LOCK_DIR': 'lock_dir',
+    'MIRROR_DIR': 'mirror_dir',
+    'CACHE_DIR': 'cache_dir',
+    'RUN_DIR': 'run_dir',
+    'LOG_DIR': 'log_dir',
+    'WHEELHOUSE_DIR': 'wheelhouse_dir',
+    'STORE_DIR': 'store_dir',
+    'SHARED_STORE': 'shared_store',
+    'PYTHON_FTP_BASE': 'python_ftp_base',
+    'PYTHON_FTP_UPSTREAM': 'python_ftp_upstream',
+    'SUPPORTED_VERSIONS': 'supported_versions',
+}
+
+_settings: Optional[Settings] = None
+
+
+def _coerce(key: str, value):
+    '''Convert a raw file or environment value to the field's type.'''
+    if key == 'home' or key in _HOME_SUBDIRS or key == 'shared_store':
+        return Path(os.path.expanduser(str(value)))
+    if key == 'supported_versions':
+        if isinstance(value, str):
+            value = value.split(',')
+        return tuple(str(v).strip() for v in value if str(v).strip())
+    if key == 'workers':
+        return int(value) if value not in (None, '', 0, '0') else None
+    if key in ('probe_timeout', 'network_timeout'):
+        return float(value)
+    if key in ('project_cache_size', 'store_cache_size'):
+        return int(value)
+    return str(value)
+
+
+def _merge(values: dict, layer: dict, allowed=None) -> None:
+    '''Apply a configuration layer, ignoring unknown or disallowed keys.'''
+    for key, value in layer.items():
+        key = key.replace('-', '_')
+        if key not in Settings._fields or (allowed is not None and key not in allowed):
+            continue
+        if value is None or value == '':
+            continue
+        try:
+            values[key] = _coerce(key, value)
+        except (TypeError, ValueError):
+            continue
+
+
+def _project_layer(start: Optional[str] = None) -> dict:
+    '''Read [tool.pyxenv] from the nearest pyproject.toml.'''
+    from pyxenv.utils import load_toml
+
+    directory = os.path.abspath(start or os.getcwd())
+    while True:
+        candidate = os.path.join(directory, 'pyproject.toml')
+        if os.path.isfile(candidate):
+            return load_toml(Path(candidate)).get('tool', {}).get('pyxenv', {})
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return {}
+        directory = parent
+
+
+def load(environ: Optional[dict] = None, start: Optional[str] = None) -> Settings:
+    '''
+    Build settings from all layers without touching the cache.
+
+    Args:
+        environ: Environment variables (default: os.environ)
+        start: Directory where the project file lookup starts (default: cwd)
+
+    Returns:
+        Settings instance
+    '''
+    from pyxenv.utils import load_toml
+
+    environ = os.environ if environ is None else environ
+    env_layer = {
+        key[len(ENV_PREFIX):].lower(): value
+        for key, value in environ.items() if key.startswith(ENV_PREFIX)
+    }
+
+    values = {'home': Path.home() / '.pyxenv'}
+    _merge(values, {'home': env_layer.get('home')})
+    user_file = values['home'] / USER_CONFIG_FILE
+    if user_file.is_file():
+        _merge(values, load_toml(user_file))
+    _merge(values, _project_layer(start), allowed=PROJECT_KEYS)
+    _merge(values, env_layer)
+
+    for key, subdir in _HOME_SUBDIRS.items():
+        values.setdefault(key, values['home'] / subdir)
+    return Settings(**values)
+
+
+def get_config() -> Settings:
+    '''
+    Get the process-wide settings, loading them on first use.
+
+    Returns:
+        Cached Settings instance
+    '''
+    global _settings
+    if _settings is None:
+        _settings = load()
+    return _settings
 
-# Diretórios base
-pyxenv_HOME = Path.home() / '.pyxenv'
-PYTHON_DIR = pyxenv_HOME / 'pythons'
-ENV_DIR = pyxenv_HOME / 'envs'
 
-# URLs
-PYTHON_FTP_BASE = 'https://www.python.org/ftp/python/'
+def reload() -> Settings:
+    '''Discard the cached settings and load them again.'''
+    global _settings
+    _settings = None
+    return get_config()
 
-# Versões Python suportadas
-SUPPORTED_VERSIONS = ['3.8', '3.9', '3.10', '3.11', '3.12', '3.13']
 
-# Criar diretórios se não existirem
-for directory in [PYTHON_DIR, ENV_DIR]:
-    directory.mkdir(parents=True, exist_ok=True)
\ No newline at end of file
+def __getattr__(name: str):
+    '''Resolve the legacy constants (config.PYTHON_DIR, ...) from the settings.'''
+    field = _LEGACY_NAMES.get(name)
+    if field is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    return getattr(get_config(), field)
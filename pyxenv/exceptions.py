@@ -8,6 +8,10 @@ class PythonNotFoundError(pyxenvError):
     '''Raised when Python version is not found.'''
     pass
 
+class VersionError(pyxenvError):
+    '''Raised when a version or version specifier is invalid.'''
+    pass
+
 class DownloadError(pyxenvError):
     '''Raised when download fails.'''
     pass
@@ -19,3 +23,7 @@ class InstallationError(pyxenvError):
 class VenvError(pyxenvError):
     '''Raised when virtual environment operation fails.'''
     pass
+
+class LockError(pyxenvError):
+    '''Raised when a resource is locked by another operation.'''
+    pass
@@ -0,0 +1,216 @@
+'''Opt-in fork server: a warmed interpreter that forks to run scripts.'''
+
+import array
+import hashlib
+import json
+import os
+import signal
+import socket
+import struct
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from pyxenv import config
+from pyxenv.exceptions import pyxenvError
+
+SERVER_MODULE = 'forkserver_main.py'
+
+# sun_path holds 108 bytes on Linux and 104 on macOS
+MAX_SOCKET_PATH = 100
+
+# Seconds to wait for a started server to bind its socket (imports included)
+START_TIMEOUT = 30.0
+
+_HEADER = struct.Struct('!I')
+
+
+def supported() -> bool:
+    '''Tell whether the platform can fork and pass descriptors over Unix sockets.'''
+    return (hasattr(os, 'fork') and hasattr(socket, 'AF_UNIX')
+            and hasattr(socket, 'SCM_RIGHTS') and hasattr(socket.socket, 'sendmsg'))
+
+
+def _send_fds(sock: socket.socket, data: bytes, fds: list[int]) -> None:
+    '''Send a message with descriptors attached to its first byte.'''
+    if hasattr(socket, 'send_fds'):  # Python 3.9+
+        sent = socket.send_fds(sock, [data], fds)
+    else:
+        sent = sock.sendmsg([data], [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array('i', fds))])
+    if sent < len(data):
+        sock.sendall(data[sent:])
+
+
+class ForkServer:
+    '''Starts, stops and talks to per-interpreter fork servers in RUN_DIR.'''
+
+    @staticmethod
+    def _key(python_exe: str) -> str:
+        '''Short stable identifier of an interpreter (socket paths are length-limited).'''
+        return hashlib.sha1(os.path.realpath(python_exe).encode('utf-8')).hexdigest()[:12]
+
+    @staticmethod
+    def socket_path(python_exe: str) -> Path:
+        '''Get the Unix socket path of an interpreter's server.'''
+        return config.RUN_DIR / f'forkserver-{ForkServer._key(python_exe)}.sock'
+
+    @staticmethod
+    def _pid_path(python_exe: str) -> Path:
+        '''Get the pid file path of an interpreter's server.'''
+        return config.RUN_DIR / f'forkserver-{ForkServer._key(python_exe)}.pid'
+
+    @staticmethod
+    def _read_pid(python_exe: str) -> Optional[int]:
+        '''Get the pid of a running server, or None.'''
+        try:
+            pid = int(ForkServer._pid_path(python_exe).read_text().strip())
+            os.kill(pid, 0)
+        except (OSError, ValueError):
+            return None
+        return pid
+
+    @staticmethod
+    def start(python_exe: str, preload: tuple = ()) -> int:
+        '''
+        Start a server for an interpreter in the background.
+
+        The server imports the preload modules once; each served script then
+        starts from a fork of that process. Modules that start threads or
+        open connections at import time are not safe to preload.
+
+        Args:
+            python_exe: Interpreter path
+            preload: Module names to import in the server
+
+        Returns:
+            Server pid
+
+        Raises:
+            pyxenvError: If unsupported, already running, or the server fails
+        '''
+        if not supported():
+            raise pyxenvError('Fork server requer um sistema Unix (fork e sockets Unix).')
+        if ForkServer._read_pid(python_exe) is not None:
+            raise pyxenvError(f'Servidor já em execução para {python_exe}.')
+
+        sock_path = ForkServer.socket_path(python_exe)
+        if len(os.fsencode(str(sock_path))) > MAX_SOCKET_PATH:
+            raise pyxenvError(f'Caminho do socket muito longo: {sock_path} '
+                              '(defina PYXENV_RUN_DIR com um caminho curto).')
+        log_path = sock_path.with_suffix('.log')
+        # Private to the user: whoever can reach the socket runs code as them
+        config.RUN_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if sock_path.exists():
+            sock_path.unlink()
+        import pkgutil  # only needed to start a server
+        source = pkgutil.get_data('pyxenv', SERVER_MODULE).decode('utf-8')
+
+        with open(log_path, 'ab') as log, open(os.devnull, 'rb') as devnull:
+            process = subprocess.Popen(
+                [python_exe, '-c', source, str(sock_path), ','.join(preload)],
+                stdin=devnull, stdout=log, stderr=subprocess.STDOUT,
+                cwd='/', start_new_session=True,
+            )
+        deadline = time.monotonic() + START_TIMEOUT
+        while not sock_path.exists():
+            if process.poll() is not None or time.monotonic() > deadline:
+                if process.poll() is None:
+                    process.kill()
+                tail = log_path.read_text(encoding='utf-8', errors='replace').strip().splitlines()[-5:]
+                raise pyxenvError('Falha ao iniciar o servidor:\n' + '\n'.join(tail))
+            time.sleep(0.02)
+        ForkServer._pid_path(python_exe).write_text(str(process.pid))
+        return process.pid
+
+    @staticmethod
+    def stop(python_exe: str) -> bool:
+        '''
+        Stop an interpreter's server.
+
+        Args:
+            python_exe: Interpreter path
+
+        Returns:
+            True if a server was running
+        '''
+        pid = ForkServer._read_pid(python_exe)
+        if pid is not None:
+            os.kill(pid, signal.SIGTERM)
+        for path in (ForkServer.socket_path(python_exe), ForkServer._pid_path(python_exe)):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        return pid is not None
+
+    @staticmethod
+    def run(python_exe: str, argv: list[str], env: Optional[dict] = None,
+            cwd: Optional[str] = None) -> Optional[int]:
+        '''
+        Run a script through the interpreter's server, if one is running.
+
+        The caller's stdin, stdout and stderr are handed to the forked child,
+        which runs with the given argv, environment and working directory.
+        SIGINT and SIGTERM received meanwhile are forwarded to it.
+
+        Args:
+            python_exe: Interpreter path
+            argv: Script path followed by its arguments
+            env: Environment (default: os.environ)
+            cwd: Working directory (default: current)
+
+        Returns:
+            Exit code, or None when no server could take the request (the
+            caller should then run the interpreter normally)
+        '''
+        if not supported() or not argv or not os.path.isfile(argv[0]):
+            return None
+        sock_path = ForkServer.socket_path(python_exe)
+        if not sock_path.exists():
+            return None
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(str(sock_path))
+        except OSError:
+            sock.close()
+            return None
+
+        request = json.dumps({
+            'argv': list(argv),
+            'env': dict(os.environ if env is None else env),
+            'cwd': cwd or os.getcwd(),
+        }).encode('utf-8')
+        for stream in (sys.stdout, sys.stderr):
+            stream.flush()
+
+        child = None
+
+        def forward(signum, frame):
+            if child is not None:
+                os.kill(child, signum)
+
+        previous = {}
+        try:
+            _send_fds(sock, _HEADER.pack(len(request)) + request, [0, 1, 2])
+            if threading.current_thread() is threading.main_thread():
+                for signum in (signal.SIGINT, signal.SIGTERM):
+                    previous[signum] = signal.signal(signum, forward)
+            with sock.makefile('rb') as replies:
+                for line in replies:
+                    message = json.loads(line)
+                    if 'pid' in message:
+                        child = message['pid']
+                    elif 'exit' in message:
+                        return message['exit']
+        except OSError:
+            if child is None:
+                return None
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+            sock.close()
+        # The child died without reporting (e.g. killed by a signal)
+        return 1
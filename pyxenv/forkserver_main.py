@@ -0,0 +1,178 @@
+'''
+pyxenv fork server, run by the target interpreter with "-c".
+
+Usage: python -c <this source> SOCKET_PATH PRELOAD_MODULES
+
+Imports the preload modules once, then forks a child per connection. The
+socket is private to its owner (mode 0600) and connections from other
+users are refused, since a served script runs as the server's user. The
+child receives the client's stdio descriptors (SCM_RIGHTS) and a JSON
+request with argv, environment and working directory, runs the script as
+__main__ and reports its exit code. Only the standard library is used and
+the code stays compatible with Python 3.8.
+'''
+
+import array
+import atexit
+import json
+import os
+import runpy
+import signal
+import socket
+import struct
+import sys
+import traceback
+
+_HEADER = struct.Struct('!I')
+
+
+def _recv_request(conn):
+    '''Read a length-prefixed JSON request and the descriptors sent with it.'''
+    fds = array.array('i')
+    data = b''
+    length = None
+    while length is None or len(data) < _HEADER.size + length:
+        msg, ancdata, _, _ = conn.recvmsg(65536, socket.CMSG_SPACE(3 * fds.itemsize))
+        if not msg:
+            raise EOFError('request truncated')
+        for level, kind, cdata in ancdata:
+            if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+                fds.frombytes(cdata[:len(cdata) - len(cdata) % fds.itemsize])
+        data += msg
+        if length is None and len(data) >= _HEADER.size:
+            length = _HEADER.unpack(data[:_HEADER.size])[0]
+    request = json.loads(data[_HEADER.size:_HEADER.size + length].decode('utf-8'))
+    return request, list(fds)
+
+
+def _peer_uid(conn):
+    '''Get the uid of the process at the other end of a Unix socket, or None.'''
+    if hasattr(socket, 'SO_PEERCRED'):
+        # struct ucred {pid_t pid; uid_t uid; gid_t gid;}
+        creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+        return struct.unpack('3i', creds)[1]
+    if hasattr(socket, 'LOCAL_PEERCRED'):
+        # struct xucred {u_int cr_version; uid_t cr_uid; short cr_ngroups; gid_t cr_groups[16];}
+        creds = conn.getsockopt(0, socket.LOCAL_PEERCRED, struct.calcsize('IIh16I'))
+        return struct.unpack_from('I', creds, 4)[0]
+    return None
+
+
+def _send(conn, message):
+    '''Send one JSON line to the client.'''
+    conn.sendall((json.dumps(message) + '\n').encode('utf-8'))
+
+
+def _exit_code(exc):
+    '''Translate a SystemExit into a process exit code.'''
+    if exc.code is None:
+        return 0
+    if isinstance(exc.code, int):
+        return exc.code
+    print(exc.code, file=sys.stderr)
+    return 1
+
+
+def _serve_one(conn):
+    '''Run one request in a forked child; never returns.'''
+    code = 1
+    try:
+        request, fds = _recv_request(conn)
+        for target, fd in enumerate(fds[:3]):
+            os.dup2(fd, target)
+        for fd in fds:
+            if fd > 2:
+                os.close(fd)
+        _send(conn, {'pid': os.getpid()})
+
+        os.chdir(request['cwd'])
+        os.environ.clear()
+        os.environ.update(request['env'])
+        sys.argv = request['argv']
+        sys.path.insert(0, os.path.dirname(os.path.abspath(sys.argv[0])))
+        for stream in (sys.stdout, sys.stderr):
+            if hasattr(stream, 'reconfigure'):
+                stream.reconfigure(line_buffering=stream.isatty())
+
+        try:
+            runpy.run_path(sys.argv[0], run_name='__main__')
+            code = 0
+        except SystemExit as e:
+            code = _exit_code(e)
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        try:
+            atexit._run_exitfuncs()
+        except BaseException:
+            traceback.print_exc()
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except Exception:
+                pass
+        try:
+            _send(conn, {'exit': code})
+        except Exception:
+            pass
+        os._exit(code)
+
+
+def main(argv):
+    '''Preload modules, bind the socket and fork a child per connection.'''
+    socket_path, preload = argv[1], argv[2] if len(argv) > 2 else ''
+    if sys.path and sys.path[0] == '':
+        del sys.path[0]
+    for name in filter(None, preload.split(',')):
+        __import__(name.strip())
+
+    # Bind under a temporary relative name, then rename: clients never see a
+    # socket that is not listening yet
+    os.chdir(os.path.dirname(socket_path))
+    tmp_name = '.%s.%d' % (os.path.basename(socket_path), os.getpid())
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    umask = os.umask(0o077)
+    try:
+        listener.bind(tmp_name)
+    finally:
+        os.umask(umask)
+    os.chmod(tmp_name, 0o600)
+    listener.listen(64)
+    os.replace(tmp_name, socket_path)
+
+    def stop(signum, frame):
+        try:
+            os.unlink(socket_path)
+        except OSError:
+            pass
+        os._exit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)  # auto-reap children
+    print('ready pid=%d preload=%s' % (os.getpid(), preload), flush=True)
+
+    while True:
+        conn, _ = listener.accept()
+        try:
+            uid = _peer_uid(conn)
+        except OSError:
+            uid = None
+        # Fail closed when the platform cannot tell who connected
+        if uid != os.getuid():
+            print('refused connection from uid %s' % uid, flush=True)
+            conn.close()
+            continue
+        sys.stdout.flush()
+        sys.stderr.flush()
+        if os.fork() == 0:
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            listener.close()
+            _serve_one(conn)
+        conn.close()
+
+
+if __name__ == '__main__':
+    main(sys.argv)
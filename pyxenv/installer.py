@@ -1,26 +1,84 @@
 '''Python download and installation for Windows.'''
 
+import hashlib
 import re
 import tempfile
+import time
 import urllib.error
+import urllib.parse
 import urllib.request
 from pathlib import Path
+from typing import Optional
 
-from pyxenv.config import PYTHON_DIR, PYTHON_FTP_BASE
+from pyxenv import config, metrics
 from pyxenv.exceptions import DownloadError, InstallationError
-from pyxenv.utils import is_version_prefix, run_command
+from pyxenv.integrity import IntegrityManager
+from pyxenv.locks import FileLock
+from pyxenv.shims import ShimManager
+from pyxenv.transfer import DownloadMonitor, retrieve
+from pyxenv.utils import format_size, is_version_prefix, precompile, report, run_command
+from pyxenv.versions import Version, executable_name, split_variant, version_key
+
+CHECKSUM_SUFFIX = '.sha256'
+
+# Installer options adding the binaries of each build variant
+VARIANT_OPTIONS = {'t': 'Include_freethreaded=1', 'd': 'Include_debug=1'}
+
+
+def base_url(base: Optional[str] = None) -> str:
+    '''
+    Normalize a download base into a URL ending with "/".
+
+    Args:
+        base: URL or local directory (default: config.PYTHON_FTP_BASE)
+
+    Returns:
+        http(s):// or file:// URL
+    '''
+    base = base or config.PYTHON_FTP_BASE
+    if '://' not in base:
+        base = Path(base).expanduser().resolve().as_uri()
+    return base if base.endswith('/') else base + '/'
+
+
+def local_path(url: str) -> Optional[Path]:
+    '''Get the filesystem path of a file:// URL (None for other schemes).'''
+    parsed = urllib.parse.urlparse(url)
+    if parsed.scheme != 'file':
+        return None
+    return Path(urllib.request.url2pathname(parsed.path))
+
+
+def _read_index(url: str) -> str:
+    '''Read a directory listing; local directories get a synthesized one.'''
+    path = local_path(url)
+    if path is not None and path.is_dir():
+        return ''.join(
+            f'<a href="{entry.name}{"/" if entry.is_dir() else ""}">' for entry in sorted(path.iterdir())
+        )
+    return urllib.request.urlopen(url, timeout=config.get_config().network_timeout).read().decode('utf-8')
+
+
+def file_checksum(path: Path) -> str:
+    '''Compute the SHA-256 hex digest of a file.'''
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
 
 
 class PythonInstaller:
     '''Handles Python download and installation on Windows.'''
 
     @staticmethod
-    def find_available_installer(version_prefix: str) -> tuple[str, str]:
+    def find_available_installer(version_prefix: str, base: Optional[str] = None) -> tuple[str, str]:
         '''
         Find the latest installer for a Python version series.
         
         Args:
             version_prefix: Version prefix like "3.11"
+            base: Download base URL or mirror directory (default: config.PYTHON_FTP_BASE)
             
         Returns:
             Tuple of (full_version, installer_url)
@@ -28,18 +86,19 @@ class PythonInstaller:
         Raises:
             DownloadError: If no installer found
         '''
-        print(f'- Procurando versões disponíveis para {version_prefix}...')
+        report(f'- Procurando versões disponíveis para {version_prefix}...')
+        base = base_url(base)
         
         try:
-            html = urllib.request.urlopen(PYTHON_FTP_BASE).read().decode('utf-8')
+            html = _read_index(base)
         except Exception as e:
-            raise DownloadError(f'Falha ao acessar {PYTHON_FTP_BASE}: {e}')
+            raise DownloadError(f'Falha ao acessar {base}: {e}')
 
         # Find all versions in the series
         pattern = rf'href="({re.escape(version_prefix)}\.\d+)/"'
         versions = sorted(
             re.findall(pattern, html),
-            key=lambda v: list(map(int, v.split('.'))),
+            key=version_key,
             reverse=True,
         )
         
@@ -48,15 +107,15 @@ class PythonInstaller:
 
         # Find a version with available installer
         for ver in versions:
-            ver_url = f'{PYTHON_FTP_BASE}{ver}/'
+            ver_url = f'{base}{ver}/'
             try:
-                sub_html = urllib.request.urlopen(ver_url).read().decode('utf-8')
+                sub_html = _read_index(ver_url)
                 exe_match = re.search(r'href="(python-[\w\.-]*amd64\.exe)"', sub_html)
                 
                 if exe_match:
                     filename = exe_match.group(1)
                     full_url = ver_url + filename
-                    print(f'- Encontrado instalador: {full_url}')
+                    report(f'- Encontrado instalador: {full_url}')
                     return ver, full_url
             except Exception:
                 continue
@@ -80,27 +139,105 @@ class PythonInstaller:
         if is_version_prefix(version):
             version, installer_url = PythonInstaller.find_available_installer(version)
         else:
-            installer_url = f'{PYTHON_FTP_BASE}{version}/python-{version}-amd64.exe'
+            installer_url = f'{base_url()}{version}/python-{version}-amd64.exe'
+
+        # Installers in a local mirror are used in place
+        mirrored = local_path(installer_url)
+        if mirrored is not None and mirrored.is_file():
+            PythonInstaller._verify(mirrored, installer_url)
+            report(f'- Usando instalador do espelho local: {mirrored}')
+            return mirrored
 
         installer_path = Path(tempfile.gettempdir()) / Path(installer_url).name
-        print(f'-  Baixando instalador de {installer_url}')
+        report(f'-  Baixando instalador de {installer_url}')
         
+        monitor = DownloadMonitor(installer_url)
         try:
-            urllib.request.urlretrieve(installer_url, installer_path)
-            print(f'- Instalador salvo em: {installer_path}')
-            return installer_path
+            retrieve(installer_url, installer_path, reporthook=monitor)
         except urllib.error.HTTPError as e:
+            monitor.finish(ok=False)
             raise DownloadError(f'Erro HTTP {e.code} ao baixar {installer_url}')
         except Exception as e:
+            monitor.finish(ok=False)
             raise DownloadError(f'Erro ao baixar Python {version}: {e}')
+        record = monitor.finish()
+        if record['bytes_per_second']:
+            report(f'- {format_size(record["bytes"])} em {record["seconds"]:.1f}s '
+                   f'({format_size(record["bytes_per_second"])}/s)')
+
+        if base_url() != base_url(config.PYTHON_FTP_UPSTREAM):
+            PythonInstaller._verify(installer_path, installer_url)
+        report(f'- Instalador salvo em: {installer_path}')
+        return installer_path
+
+    @staticmethod
+    def _verify(path: Path, url: str) -> None:
+        '''
+        Check a mirrored installer against the ".sha256" file next to it.
+
+        The checksum comes from the mirror itself ("--mirror sync" computes it
+        from what it downloaded), so it detects corruption in the mirror, not
+        an installer that was already bad upstream.
+
+        Raises:
+            DownloadError: If the mirror has no checksum or it does not match
+        '''
+        try:
+            checksum_file = local_path(url + CHECKSUM_SUFFIX)
+            if checksum_file is not None:
+                text = checksum_file.read_text(encoding='utf-8')
+            else:
+                timeout = config.get_config().network_timeout
+                text = urllib.request.urlopen(url + CHECKSUM_SUFFIX, timeout=timeout).read().decode('utf-8')
+        except Exception as e:
+            raise DownloadError(f'Checksum de {path.name} indisponível no espelho: {e}')
+        expected = text.split()[0].lower() if text.split() else ''
+        if not expected:
+            raise DownloadError(f'Checksum de {path.name} vazio no espelho')
+        if file_checksum(path) != expected:
+            raise DownloadError(f'Checksum inválido para {path.name}')
+
+    @staticmethod
+    def _library_paths(python_exe: Path, install_dir: Path) -> list[Path]:
+        '''
+        Get the standard library and site-packages directories of a fresh install.
+
+        Args:
+            python_exe: Installed interpreter
+            install_dir: Installation directory (used if the interpreter cannot be probed)
+
+        Returns:
+            Existing directories, without duplicates
+        '''
+        # Imported here: python_manager is not needed to download or run installers
+        from pyxenv.python_manager import PythonManager
+
+        info = PythonManager.fingerprint(str(python_exe))
+        if not info:
+            return [install_dir]
+        paths = []
+        for key in ('stdlib', 'platstdlib', 'purelib'):
+            path = info['paths'].get(key)
+            if path and Path(path).is_dir() and Path(path) not in paths:
+                paths.append(Path(path))
+        return paths or [install_dir]
 
     @staticmethod
-    def install(version: str) -> Path:
+    def install(version: str, precompile_bytecode: bool = False,
+                invalidation_mode: Optional[str] = None) -> Path:
         '''
         Install Python silently to pyxenv directory.
         
+        Build variants get their own directory, so "3.13" and "3.13t" can be
+        installed side by side; the variant binaries come from the same
+        installer.
+        
         Args:
-            version: Python version to install
+            version: Python version to install, optionally with a variant
+                suffix ("3.13t" free-threaded, "3.12d" debug, "3.13td")
+            precompile_bytecode: Compile the standard library and site-packages
+                bytecode right after installing
+            invalidation_mode: compileall invalidation mode (e.g. "unchecked-hash")
             
         Returns:
             Path to installation directory
@@ -108,34 +245,48 @@ class PythonInstaller:
         Raises:
             InstallationError: If installation fails
         '''
-        install_dir = PYTHON_DIR / version
-        
-        if install_dir.exists():
-            print(f'- Python {version} já instalado em {install_dir}')
-            return install_dir
+        release, variant = split_variant(version)
+        if 't' in variant and version_key(release) < version_key('3.13'):
+            raise InstallationError(f'Builds free-threaded existem a partir do Python 3.13: {version}')
+        install_dir = config.PYTHON_DIR / version
 
-        installer = PythonInstaller.download(version)
-        print(f'- Instalando Python {version} em {install_dir}')
-        
-        cmd = [
-            str(installer),
-            '/quiet',
-            'InstallAllUsers=0',
-            'PrependPath=0',
-            f'TargetDir={install_dir}',
-            'Include_launcher=0',
-            'Include_test=0',
-            'SimpleInstall=1',
-        ]
-        
-        try:
-            run_command(cmd)
-        except Exception as e:
-            raise InstallationError(f'Falha na instalação: {e}')
+        with FileLock.for_target(install_dir):
+            if install_dir.exists():
+                report(f'- Python {version} já instalado em {install_dir}')
+                return install_dir
+
+            started = time.perf_counter()
+            installer = PythonInstaller.download(release)
+            report(f'- Instalando Python {version} em {install_dir}')
+
+            cmd = [
+                str(installer),
+                '/quiet',
+                'InstallAllUsers=0',
+                'PrependPath=0',
+                f'TargetDir={install_dir}',
+                'Include_launcher=0',
+                'Include_test=0',
+                'SimpleInstall=1',
+            ]
+            cmd += [VARIANT_OPTIONS[flag] for flag in variant]
+
+            try:
+                run_command(cmd)
+            except Exception as e:
+                raise InstallationError(f'Falha na instalação: {e}')
+
+            python_exe = install_dir / executable_name(Version.parse(version), windows=True)
+            if not python_exe.exists():
+                raise InstallationError(f'{python_exe.name} não encontrado em {install_dir}')
 
-        python_exe = install_dir / 'python.exe'
-        if not python_exe.exists():
-            raise InstallationError(f'python.exe não encontrado em {install_dir}')
+            if precompile_bytecode:
+                report(f'- Pré-compilando bytecode de Python {version}...')
+                precompile(str(python_exe), PythonInstaller._library_paths(python_exe, install_dir),
+                           invalidation_mode)
+            IntegrityManager.record(install_dir)
+            metrics.observe('install_seconds', time.perf_counter() - started)
 
-        print(f'- Python {version} instalado com sucesso.')
+        report(f'- Python {version} instalado com sucesso.')
+        ShimManager.refresh()
         return install_dir
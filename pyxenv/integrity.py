@@ -0,0 +1,224 @@
+'''Integrity manifests and parallel verification of installs.'''
+
+import hashlib
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Iterable, Optional
+
+from pyxenv import config
+
+MANIFEST_FILE = '.pyxenv-manifest.json'
+
+# Below this many files hashing runs in-process: starting workers costs more
+_POOL_THRESHOLD = 64
+
+
+def file_digest(path: str) -> str:
+    '''
+    Hash a file's contents with BLAKE2b using a memory-mapped read.
+
+    Args:
+        path: File path
+
+    Returns:
+        Hex digest
+    '''
+    digest = hashlib.blake2b(digest_size=32)
+    with open(path, 'rb') as fh:
+        if os.fstat(fh.fileno()).st_size:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                digest.update(data)
+    return digest.hexdigest()
+
+
+def _digests(paths: list[str], max_workers: Optional[int] = None) -> list[Optional[str]]:
+    '''Hash files, in a process pool when there are many (None for unreadable files).'''
+    if len(paths) < _POOL_THRESHOLD:
+        return [_safe_digest(p) for p in paths]
+    # Imported here: concurrent.futures.process is slow to import and only --deep needs it
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = max_workers or config.get_config().workers or os.cpu_count() or 1
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_safe_digest, paths, chunksize=chunksize))
+
+
+def _safe_digest(path: str) -> Optional[str]:
+    '''Hash a file, returning None if it cannot be read.'''
+    try:
+        return file_digest(path)
+    except OSError:
+        return None
+
+
+def _excluded(relative: str) -> bool:
+    '''Tell whether a path is expected to change (pyxenv state, bytecode).'''
+    parts = relative.split('/')
+    return (parts[0].startswith('.pyxenv-') or '__pycache__' in parts
+            or relative.endswith(('.pyc', '.pyo')))
+
+
+def _scan(root: Path) -> tuple[dict[str, os.stat_result], dict[str, str]]:
+    '''Collect the regular files and symlinks of a tree, keyed by relative path.'''
+    files, links = {}, {}
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                relative = os.path.relpath(entry.path, root).replace(os.sep, '/')
+                if _excluded(relative):
+                    continue
+                if entry.is_symlink():
+                    links[relative] = os.readlink(entry.path)
+                elif entry.is_dir():
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    files[relative] = entry.stat()
+    return files, links
+
+
+class IntegrityManager:
+    '''Records per-file manifests and checks installs against them.'''
+
+    @staticmethod
+    def scan(root: Path, max_workers: Optional[int] = None) -> dict:
+        '''
+        Build the manifest of a tree as it is now, without writing it.
+
+        Bytecode caches and pyxenv's own state files are left out.
+
+        Args:
+            root: Interpreter or environment directory
+            max_workers: Process pool size (default: the "workers" setting or CPU count)
+
+        Returns:
+            Manifest with the size, mtime and BLAKE2b hash of each file and
+            the target of each symlink
+        '''
+        files, links = _scan(root)
+        names = sorted(files)
+        digests = _digests([str(root / name) for name in names], max_workers)
+        return {
+            'algorithm': 'blake2b-256',
+            'files': {
+                name: [files[name].st_size, files[name].st_mtime_ns, digest]
+                for name, digest in zip(names, digests) if digest is not None
+            },
+            'links': links,
+        }
+
+    @staticmethod
+    def record(root: Path, max_workers: Optional[int] = None) -> int:
+        '''
+        Write the manifest (size, mtime and BLAKE2b hash per file) of a tree.
+
+        Args:
+            root: Interpreter or environment directory
+            max_workers: Process pool size (default: the "workers" setting or CPU count)
+
+        Returns:
+            Number of files recorded
+        '''
+        manifest = IntegrityManager.scan(root, max_workers)
+        IntegrityManager._write(root, manifest)
+        return len(manifest['files'])
+
+    @staticmethod
+    def update(root: Path, paths: Iterable[Path]) -> None:
+        '''
+        Refresh the manifest entries of files pyxenv rewrote (e.g. on relocation).
+
+        Args:
+            root: Interpreter or environment directory
+            paths: Rewritten files or symlinks
+        '''
+        manifest = IntegrityManager.load(root)
+        if manifest is None:
+            return
+        for path in paths:
+            relative = os.path.relpath(path, root).replace(os.sep, '/')
+            if os.path.islink(path):
+                manifest['links'][relative] = os.readlink(path)
+            elif relative in manifest['files']:
+                st = os.stat(path)
+                manifest['files'][relative] = [st.st_size, st.st_mtime_ns, file_digest(str(path))]
+        IntegrityManager._write(root, manifest)
+
+    @staticmethod
+    def load(root: Path) -> Optional[dict]:
+        '''Read a tree's manifest, or None if it has none.'''
+        try:
+            return json.loads((root / MANIFEST_FILE).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write(root: Path, manifest: dict) -> None:
+        '''Atomically write a manifest.'''
+        target = root / MANIFEST_FILE
+        tmp = target.with_name(f'{target.name}.{os.getpid()}.tmp')
+        tmp.write_text(json.dumps(manifest, separators=(',', ':')), encoding='utf-8')
+        os.replace(tmp, target)
+
+    @staticmethod
+    def verify(root: Path, deep: bool = False, max_workers: Optional[int] = None) -> Optional[dict[str, list[str]]]:
+        '''
+        Check a tree against its manifest.
+
+        The fast mode compares sizes and mtimes (to the second, as archives
+        keep no more); the deep mode hashes every file instead and ignores
+        mtimes.
+
+        Args:
+            root: Interpreter or environment directory
+            deep: Hash contents
+            max_workers: Process pool size (default: the "workers" setting or CPU count)
+
+        Returns:
+            Mapping with "missing" and "modified" paths, or None without a manifest
+        '''
+        manifest = IntegrityManager.load(root)
+        if manifest is None:
+            return None
+        files, links = _scan(root)
+        recorded = manifest.get('files', {})
+        missing = sorted(set(recorded) - set(files))
+        missing += sorted(name for name in manifest.get('links', {}) if name not in links)
+
+        present = sorted(set(recorded) & set(files))
+        if deep:
+            digests = _digests([str(root / name) for name in present], max_workers)
+            modified = [name for name, digest in zip(present, digests) if digest != recorded[name][2]]
+        else:
+            modified = [
+                name for name in present
+                if files[name].st_size != recorded[name][0]
+                or files[name].st_mtime_ns // 10**9 != recorded[name][1] // 10**9
+            ]
+        modified += sorted(
+            name for name, target in manifest.get('links', {}).items()
+            if name in links and links[name] != target
+        )
+        return {'missing': missing, 'modified': modified}
+
+    @staticmethod
+    def targets(name: Optional[str] = None) -> list[Path]:
+        '''
+        Resolve what to verify: an environment, an interpreter, or everything.
+
+        Args:
+            name: Environment name or interpreter directory name (default: all)
+
+        Returns:
+            Directories to verify
+        '''
+        bases = (config.PYTHON_DIR, config.ENV_DIR)
+        if name is not None:
+            return [base / name for base in bases if (base / name).is_dir()]
+        return [
+            path for base in bases if base.is_dir()
+            for path in sorted(base.iterdir()) if path.is_dir() and not path.name.startswith('.')
+        ]
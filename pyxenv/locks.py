@@ -0,0 +1,113 @@
+'''Inter-process file locks for pyxenv operations.'''
+
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+from pyxenv import config, metrics
+from pyxenv.exceptions import LockError
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+
+class FileLock:
+    '''
+    Advisory lock on a file under LOCK_DIR.
+
+    Shared locks allow concurrent readers (e.g. scripts running with an
+    interpreter) while exclusive locks are taken by operations that modify
+    or delete a directory. On Windows only exclusive locks exist, so shared
+    locks are not taken there and nothing stops a removal of an interpreter
+    in use; StorageManager.collect() refuses to remove there for that reason.
+    '''
+
+    def __init__(self, path: Path, shared: bool = False, blocking: bool = True):
+        self.path = path
+        self.shared = shared
+        self.blocking = blocking
+        self._fh = None
+
+    @classmethod
+    def for_target(cls, target: Path, shared: bool = False, blocking: bool = True) -> 'FileLock':
+        '''
+        Get the lock guarding a directory under PYTHON_DIR or ENV_DIR.
+
+        Args:
+            target: Interpreter or environment directory
+            shared: Take a shared (read) lock instead of an exclusive one
+            blocking: Wait for the lock instead of failing immediately
+
+        Returns:
+            FileLock instance (not yet acquired)
+        '''
+        name = f'{target.parent.name}-{target.name}.lock'
+        return cls(config.LOCK_DIR / name, shared=shared, blocking=blocking)
+
+    def acquire(self) -> bool:
+        '''
+        Acquire the lock.
+
+        Returns:
+            True if acquired, False if non-blocking and held by someone else
+        '''
+        if self.shared and os.name == 'nt':
+            return True
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = open(self.path, 'a+')
+        started = time.perf_counter()
+        try:
+            if os.name == 'nt':
+                mode = msvcrt.LK_LOCK if self.blocking else msvcrt.LK_NBLCK
+                self._fh.seek(0)
+                msvcrt.locking(self._fh.fileno(), mode, 1)
+            else:
+                flags = fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX
+                if not self.blocking:
+                    flags |= fcntl.LOCK_NB
+                fcntl.flock(self._fh.fileno(), flags)
+        except OSError:
+            self._fh.close()
+            self._fh = None
+            if self.blocking:
+                raise
+            return False
+        if self.blocking:
+            metrics.observe('lock_wait_seconds', time.perf_counter() - started)
+        return True
+
+    def inherit(self) -> None:
+        '''
+        Keep the lock held by a process that replaces this one via exec.
+
+        The lock file descriptor is made inheritable, so the lock lives as
+        long as the exec'd program (POSIX only).
+        '''
+        if self._fh is not None:
+            os.set_inheritable(self._fh.fileno(), True)
+
+    def release(self) -> None:
+        '''Release the lock if held.'''
+        if self._fh is None:
+            return
+        try:
+            if os.name == 'nt':
+                self._fh.seek(0)
+                msvcrt.locking(self._fh.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._fh.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._fh.close()
+            self._fh = None
+
+    def __enter__(self) -> 'FileLock':
+        if not self.acquire():
+            raise LockError(f'Recurso em uso por outra operação: {self.path.stem}')
+        return self
+
+    def __exit__(self, *exc_info) -> Optional[bool]:
+        self.release()
+        return None
@@ -0,0 +1,214 @@
+'''Cumulative operational metrics (counters and histograms) kept on disk.'''
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from pyxenv import config
+
+METRICS_FILE = 'metrics.json'
+PREFIX = 'pyxenv_'
+
+# Histogram bucket upper bounds in seconds (+Inf is implicit)
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 120.0, 600.0)
+
+HELP = {
+    'resolve_seconds': 'Time to resolve a version to an interpreter',
+    'index_hits_total': 'Version index lookups served from memory',
+    'index_misses_total': 'Version index rebuilds',
+    'registry_hits_total': 'Interpreter fingerprints served from the registry',
+    'registry_misses_total': 'Interpreter fingerprints not in the registry',
+    'probes_total': 'Interpreters launched to fingerprint them',
+    'probe_seconds': 'Interpreter probe duration',
+    'download_bytes_total': 'Bytes downloaded',
+    'download_failures_total': 'Failed downloads',
+    'download_seconds': 'Download duration',
+    'install_seconds': 'Interpreter install duration',
+    'venv_create_seconds': 'Environment creation duration',
+    'lock_wait_seconds': 'Time spent waiting for file locks',
+    'commands_total': 'Commands run by pyxenv',
+    'command_seconds': 'Duration of commands run by pyxenv',
+    'store_hits_total': 'Shared store interpreters found in the local cache',
+    'store_fetches_total': 'Interpreters copied from the shared store',
+    'store_fetch_seconds': 'Time to copy an interpreter from the shared store',
+    'invocations_total': 'pyxenv CLI invocations that recorded other metrics',
+}
+
+_lock = threading.Lock()
+# Observations not yet flushed to disk
+_counters: dict[str, float] = {}
+_histograms: dict[str, dict] = {}
+
+
+def _empty_histogram() -> dict:
+    return {'buckets': [0] * (len(BUCKETS) + 1), 'sum': 0.0, 'count': 0}
+
+
+def inc(name: str, value: float = 1) -> None:
+    '''Add to a counter.'''
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def observe(name: str, seconds: float) -> None:
+    '''Record a duration in a histogram.'''
+    index = next((i for i, bound in enumerate(BUCKETS) if seconds <= bound), len(BUCKETS))
+    with _lock:
+        histogram = _histograms.setdefault(name, _empty_histogram())
+        histogram['buckets'][index] += 1
+        histogram['sum'] += seconds
+        histogram['count'] += 1
+
+
+@contextmanager
+def timer(name: str) -> Iterator[None]:
+    '''Time a block into a histogram.'''
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started)
+
+
+def pending(ignore: Iterable[str] = ()) -> bool:
+    '''Tell whether observations other than the ignored counters await a flush.'''
+    with _lock:
+        return bool(_histograms) or any(name not in ignore for name in _counters)
+
+
+def reset() -> None:
+    '''Drop observations that were not flushed.'''
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def _path() -> Path:
+    '''Get the metrics store path.'''
+    return config.pyxenv_HOME / METRICS_FILE
+
+
+def load() -> dict:
+    '''
+    Read the cumulative metrics.
+
+    Returns:
+        {"counters": {name: value}, "histograms": {name: {"buckets", "sum", "count"}}}
+    '''
+    try:
+        data = json.loads(_path().read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        data = {}
+    if not isinstance(data, dict):
+        data = {}
+    data.setdefault('counters', {})
+    data.setdefault('histograms', {})
+    return data
+
+
+def _merge(data: dict, counters: dict, histograms: dict) -> None:
+    '''Add pending observations to stored totals.'''
+    for name, value in counters.items():
+        data['counters'][name] = data['counters'].get(name, 0) + value
+    for name, pending in histograms.items():
+        stored = data['histograms'].get(name)
+        if not stored or len(stored.get('buckets', [])) != len(pending['buckets']):
+            stored = data['histograms'][name] = _empty_histogram()
+        stored['buckets'] = [a + b for a, b in zip(stored['buckets'], pending['buckets'])]
+        stored['sum'] += pending['sum']
+        stored['count'] += pending['count']
+
+
+def flush() -> None:
+    '''
+    Add the pending observations to the store.
+
+    Concurrent pyxenv processes serialize on a file lock; a store that
+    cannot be written is skipped rather than failing the command.
+    '''
+    # Imported here: locks report their wait times to this module
+    from pyxenv.locks import FileLock
+
+    if not pending():
+        return
+    path = _path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(config.LOCK_DIR / 'metrics.lock'):
+            # Taken after the lock so its own wait time is part of this flush
+            with _lock:
+                counters, histograms = dict(_counters), {k: dict(v) for k, v in _histograms.items()}
+                _counters.clear()
+                _histograms.clear()
+            data = load()
+            _merge(data, counters, histograms)
+            data['updated'] = time.time()
+            tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+            tmp.write_text(json.dumps(data, separators=(',', ':')), encoding='utf-8')
+            os.replace(tmp, path)
+    except OSError:
+        reset()
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_prometheus(data: Optional[dict] = None) -> str:
+    '''
+    Render metrics in the Prometheus text exposition format (for textfile collectors).
+
+    Args:
+        data: Metrics as returned by load() (default: the store)
+
+    Returns:
+        Text ending with a newline
+    '''
+    data = load() if data is None else data
+    lines = []
+    for name, value in sorted(data['counters'].items()):
+        metric = PREFIX + name
+        lines.append(f'# HELP {metric} {HELP.get(name, name)}')
+        lines.append(f'# TYPE {metric} counter')
+        lines.append(f'{metric} {_format_number(value)}')
+    for name, histogram in sorted(data['histograms'].items()):
+        metric = PREFIX + name
+        lines.append(f'# HELP {metric} {HELP.get(name, name)}')
+        lines.append(f'# TYPE {metric} histogram')
+        cumulative = 0
+        for bound, count in zip(BUCKETS + (None,), histogram['buckets']):
+            cumulative += count
+            le = '+Inf' if bound is None else _format_number(bound)
+            lines.append(f'{metric}_bucket{{le="{le}"}} {cumulative}')
+        lines.append(f'{metric}_sum {_format_number(histogram["sum"])}')
+        lines.append(f'{metric}_count {histogram["count"]}')
+    return '\n'.join(lines) + '\n' if lines else ''
+
+
+def render_json(data: Optional[dict] = None) -> str:
+    '''
+    Render metrics as JSON, with bucket bounds alongside the counts.
+
+    Args:
+        data: Metrics as returned by load() (default: the store)
+
+    Returns:
+        JSON text
+    '''
+    data = load() if data is None else data
+    return json.dumps({
+        'counters': data['counters'],
+        'histograms': {
+            name: {
+                'buckets': dict(zip([str(b) for b in BUCKETS] + ['+Inf'], histogram['buckets'])),
+                'sum': histogram['sum'],
+                'count': histogram['count'],
+            }
+            for name, histogram in data['histograms'].items()
+        },
+        'updated': data.get('updated'),
+    }, indent=2, sort_keys=True)
@@ -0,0 +1,87 @@
+'''Local mirror of Python installers for offline provisioning.'''
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from pyxenv import config
+from pyxenv.exceptions import DownloadError
+from pyxenv.installer import CHECKSUM_SUFFIX, PythonInstaller, file_checksum
+from pyxenv.transfer import DownloadMonitor, retrieve
+from pyxenv.utils import report
+
+
+class MirrorManager:
+    '''Populates a directory laid out like python.org/ftp/python.'''
+
+    @staticmethod
+    def _is_current(target: Path) -> bool:
+        '''Check whether a mirrored file exists and matches its checksum.'''
+        checksum_file = target.with_name(target.name + CHECKSUM_SUFFIX)
+        try:
+            expected = checksum_file.read_text(encoding='utf-8').split()[0]
+        except (OSError, IndexError):
+            return False
+        return target.is_file() and file_checksum(target) == expected
+
+    @staticmethod
+    def _fetch(series: str, destination: Path, upstream: str) -> Path:
+        '''Mirror the latest installer of a series with its checksum.'''
+        version, url = PythonInstaller.find_available_installer(series, base=upstream)
+        target = destination / version / url.rsplit('/', 1)[-1]
+        if MirrorManager._is_current(target):
+            report(f'- Já espelhado: {target}')
+            return target
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f'.{target.name}.{os.getpid()}.tmp')
+        # Series download concurrently: no progress line, but the shared rate limit applies
+        monitor = DownloadMonitor(url, progress=False)
+        ok = False
+        try:
+            retrieve(url, tmp, reporthook=monitor)
+            ok = True
+            checksum = file_checksum(tmp)
+            os.replace(tmp, target)
+        except Exception as e:
+            raise DownloadError(f'Erro ao espelhar {url}: {e}')
+        finally:
+            monitor.finish(ok=ok)
+            if tmp.exists():
+                tmp.unlink()
+
+        checksum_file = target.with_name(target.name + CHECKSUM_SUFFIX)
+        checksum_file.write_text(f'{checksum}  {target.name}\n', encoding='utf-8')
+        report(f'- Espelhado: {target}')
+        return target
+
+    @staticmethod
+    def sync(series: list[str], destination: Optional[Path] = None, upstream: Optional[str] = None,
+             max_workers: Optional[int] = None) -> list[Path]:
+        '''
+        Download the latest installer of each series into the mirror.
+
+        Series are fetched concurrently. Each installer is stored as
+        "<version>/<file>" next to a "<file>.sha256" checksum, so the
+        mirror directory can be used directly as PYXENV_PYTHON_FTP_BASE.
+
+        Args:
+            series: Version prefixes (e.g. ["3.11", "3.12"])
+            destination: Mirror directory (default: config.MIRROR_DIR)
+            upstream: Source URL or directory (default: config.PYTHON_FTP_UPSTREAM)
+            max_workers: Thread pool size (default: the "workers" setting, or one per series)
+
+        Returns:
+            Paths of the mirrored installers
+
+        Raises:
+            DownloadError: If any series cannot be mirrored
+        '''
+        destination = Path(destination or config.MIRROR_DIR)
+        upstream = upstream or config.PYTHON_FTP_UPSTREAM
+        if not series:
+            return []
+        with ThreadPoolExecutor(max_workers=max_workers or config.get_config().workers or len(series)) as pool:
+            futures = [pool.submit(MirrorManager._fetch, s, destination, upstream) for s in series]
+            return [future.result() for future in futures]
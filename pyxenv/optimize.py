@@ -0,0 +1,284 @@
+'''Startup tuning of environments: consolidated .pth files and startup measurements.'''
+
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import time
+from pathlib import Path
+from typing import Optional
+
+from pyxenv import config
+from pyxenv.exceptions import VenvError
+from pyxenv.integrity import IntegrityManager
+from pyxenv.locks import FileLock
+from pyxenv.utils import precompile
+from pyxenv.venv_manager import VenvManager
+
+CONSOLIDATED_PTH = 'pyxenv-paths.pth'
+BACKUP_DIR = '.pyxenv-pth-backup'
+STATE_FILE = '.pyxenv-optimize.json'
+
+# Consolidated entries are listed on these comment lines so later runs can merge them
+_ENTRY_PREFIX = '# entry: '
+
+# Interpreter starts per startup measurement (the median is reported)
+RUNS = 5
+
+# Runs inside the environment's interpreter
+_SITE_SCRIPT = 'import json, site, sys; print(json.dumps({"site": site.getsitepackages(), "path": sys.path}))'
+
+
+def parse_importtime(output: str) -> float:
+    '''
+    Sum the cumulative time of top-level imports in "-X importtime" output.
+
+    Args:
+        output: stderr of an interpreter run with -X importtime
+
+    Returns:
+        Milliseconds spent importing
+    '''
+    total = 0
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        # Nested imports are indented under their parent, whose time includes them
+        if len(fields) != 3 or fields[2].startswith('  '):
+            continue
+        try:
+            total += int(fields[1])
+        except ValueError:
+            continue
+    return total / 1000
+
+
+def _read_pth(path: Path) -> Optional[list[str]]:
+    '''Read a .pth file's lines, or None if it cannot be decoded.'''
+    try:
+        return path.read_text(encoding='utf-8-sig').splitlines()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def read_entries(path: Path) -> list[str]:
+    '''
+    Get the entries of a consolidated .pth file.
+
+    Args:
+        path: CONSOLIDATED_PTH file
+
+    Returns:
+        Directories relative to the environment, or absolute outside it
+    '''
+    return [line[len(_ENTRY_PREFIX):] for line in _read_pth(path) or [] if line.startswith(_ENTRY_PREFIX)]
+
+
+def render_pth(entries: list[str]) -> str:
+    '''
+    Render a consolidated .pth file that extends sys.path in one step.
+
+    site checks every path line of a .pth file on disk; this file holds a
+    single import line with the entries resolved ahead of time instead.
+    Relative entries are joined to sys.prefix, so copies of the
+    environment stay valid.
+
+    Args:
+        entries: Directories relative to the environment, or absolute
+
+    Returns:
+        File content
+    '''
+    paths = ', '.join(repr(entry) if os.path.isabs(entry) else f'os.path.join(sys.prefix, {entry!r})'
+                      for entry in entries)
+    return ('# Generated by pyxenv --optimize-env\n'
+            + ''.join(f'{_ENTRY_PREFIX}{entry}\n' for entry in entries)
+            + f'import os, sys; sys.path.extend(p for p in [{paths}] if p not in sys.path)\n')
+
+
+class EnvOptimizer:
+    '''Rewrites an environment's site setup so its interpreter starts faster.'''
+
+    @staticmethod
+    def _env_path(env_name: str) -> Path:
+        '''Get an existing environment's directory.'''
+        env_path = config.ENV_DIR / env_name
+        if not env_path.is_dir():
+            raise VenvError(f'Ambiente "{env_name}" não encontrado.')
+        return env_path
+
+    @staticmethod
+    def _inspect(python_exe: Path) -> dict:
+        '''Get the site-packages directories and sys.path of an environment.'''
+        result = subprocess.run([str(python_exe), '-c', _SITE_SCRIPT], capture_output=True, text=True)
+        if result.returncode != 0:
+            raise VenvError(f'Não foi possível executar {python_exe}: {result.stderr.strip()}')
+        return json.loads(result.stdout)
+
+    @staticmethod
+    def measure(python_exe: Path, runs: int = RUNS) -> dict:
+        '''
+        Measure how long an interpreter takes to start and exit.
+
+        Args:
+            python_exe: Interpreter to start
+            runs: Number of starts (the median is reported)
+
+        Returns:
+            {"wall_ms": median wall time, "import_ms": median -X importtime total}
+        '''
+        wall, imports = [], []
+        for _ in range(runs):
+            started = time.perf_counter()
+            result = subprocess.run([str(python_exe), '-X', 'importtime', '-c', 'pass'],
+                                    capture_output=True, text=True)
+            wall.append((time.perf_counter() - started) * 1000)
+            imports.append(parse_importtime(result.stderr))
+        return {'wall_ms': round(statistics.median(wall), 2), 'import_ms': round(statistics.median(imports), 2)}
+
+    @staticmethod
+    def consolidate(env_path: Path, site_dirs: list[str]) -> list[str]:
+        '''
+        Merge the path-only .pth files of each site directory into one.
+
+        Entries are resolved, deduplicated and filtered to existing
+        directories ahead of time, as site would do at every start, and
+        written as one precomputed sys.path extension (see render_pth).
+        Paths inside the environment stay relative to it, so clones remain
+        valid. Files with "import" lines (editable finders, setuptools'
+        distutils hook) run code at startup and are left in place. Originals are moved
+        under the environment's BACKUP_DIR.
+
+        Args:
+            env_path: Environment directory
+            site_dirs: site-packages directories of the environment
+
+        Returns:
+            Relative paths of the .pth files that were consolidated
+        '''
+        moved = []
+        for site_dir in map(Path, site_dirs):
+            if not site_dir.is_dir():
+                continue
+            entries, sources = [], []
+            seen = set()
+            for pth in sorted(site_dir.glob('*.pth')):
+                if pth.name == CONSOLIDATED_PTH or pth.name.startswith('.'):
+                    continue
+                lines = _read_pth(pth)
+                if lines is None or any(line.startswith(('import ', 'import\t')) for line in lines):
+                    continue
+                sources.append(pth)
+                for line in lines:
+                    line = line.rstrip()
+                    if not line or line.startswith('#'):
+                        continue
+                    directory = os.path.normcase(os.path.abspath(os.path.join(site_dir, line)))
+                    if directory in seen or not os.path.isdir(directory):
+                        continue
+                    seen.add(directory)
+                    relative = os.path.relpath(directory, env_path)
+                    entries.append(directory if relative.startswith('..') else Path(relative).as_posix())
+            if not sources:
+                continue
+
+            target = site_dir / CONSOLIDATED_PTH
+            existing = read_entries(target)
+            entries = existing + [entry for entry in entries if entry not in existing]
+            tmp = target.with_name(f'.{target.name}.{os.getpid()}.tmp')
+            tmp.write_text(render_pth(entries), encoding='utf-8')
+            os.replace(tmp, target)
+
+            for pth in sources:
+                relative = pth.relative_to(env_path)
+                backup = env_path / BACKUP_DIR / relative
+                backup.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(pth, backup)
+                moved.append(relative.as_posix())
+        return moved
+
+    @staticmethod
+    def optimize(env_name: str, invalidation_mode: Optional[str] = None, runs: int = RUNS) -> dict:
+        '''
+        Tune an environment's startup and measure it before and after.
+
+        Args:
+            env_name: Environment name
+            invalidation_mode: Recompile site-packages with this compileall
+                mode (e.g. "unchecked-hash", for environments that are not edited)
+            runs: Interpreter starts per measurement
+
+        Returns:
+            {"before", "after": measurements, "consolidated": .pth files,
+            "sys_path": the resulting sys.path}
+
+        Raises:
+            VenvError: If the environment does not exist or cannot be run
+        '''
+        env_path = EnvOptimizer._env_path(env_name)
+        python_exe = VenvManager.python_path(env_path)
+        with FileLock.for_target(env_path):
+            before = EnvOptimizer.measure(python_exe, runs)
+            site_dirs = EnvOptimizer._inspect(python_exe)['site']
+            state = EnvOptimizer.load(env_name) or {'consolidated': []}
+            moved = EnvOptimizer.consolidate(env_path, site_dirs)
+            if invalidation_mode:
+                precompile(str(python_exe), [Path(d) for d in site_dirs if os.path.isdir(d)], invalidation_mode)
+            sys_path = EnvOptimizer._inspect(python_exe)['path']
+            after = EnvOptimizer.measure(python_exe, runs)
+
+            report = {
+                'before': before,
+                'after': after,
+                'consolidated': sorted(set(state['consolidated']) | set(moved)),
+                'invalidation_mode': invalidation_mode or state.get('invalidation_mode'),
+                'sys_path': sys_path,
+            }
+            (env_path / STATE_FILE).write_text(json.dumps(report, indent=2), encoding='utf-8')
+            if moved and IntegrityManager.load(env_path) is not None:
+                IntegrityManager.record(env_path)
+        return report
+
+    @staticmethod
+    def load(env_name: str) -> Optional[dict]:
+        '''Get the report of an environment's last optimization, if any.'''
+        try:
+            return json.loads((config.ENV_DIR / env_name / STATE_FILE).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def restore(env_name: str) -> int:
+        '''
+        Put back the original .pth files and drop the consolidated ones.
+
+        Bytecode recompiled with another invalidation mode is kept; it is
+        still valid.
+
+        Args:
+            env_name: Environment name
+
+        Returns:
+            Number of .pth files restored
+
+        Raises:
+            VenvError: If the environment does not exist
+        '''
+        env_path = EnvOptimizer._env_path(env_name)
+        backup_root = env_path / BACKUP_DIR
+        restored = 0
+        with FileLock.for_target(env_path):
+            if backup_root.is_dir():
+                for backup in backup_root.rglob('*.pth'):
+                    target = env_path / backup.relative_to(backup_root)
+                    (target.parent / CONSOLIDATED_PTH).unlink(missing_ok=True)
+                    if target.parent.is_dir():
+                        os.replace(backup, target)
+                        restored += 1
+                shutil.rmtree(backup_root, ignore_errors=True)
+            (env_path / STATE_FILE).unlink(missing_ok=True)
+            if restored and IntegrityManager.load(env_path) is not None:
+                IntegrityManager.record(env_path)
+        return restored
@@ -0,0 +1,195 @@
+'''Project-local Python version and environment pinning.'''
+
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from pyxenv import config
+from pyxenv.locks import FileLock
+from pyxenv.utils import load_toml
+
+PIN_FILE = '.python-version'
+PYPROJECT_FILE = 'pyproject.toml'
+ENV_PIN_FILE = '.pyxenv-env'
+CACHE_FILE = 'projects.json'
+
+# Parse cache, persisted in CACHE_DIR/projects.json and loaded on first use:
+# directory -> [[pin mtime, pyproject mtime], version or None], oldest first
+_CACHE: 'Optional[OrderedDict[str, list]]' = None
+_dirty = False
+
+
+def _mtime(path: str) -> Optional[int]:
+    '''Return the mtime of path in nanoseconds, or None if missing.'''
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _cache_path() -> Path:
+    '''Get the parse cache file path.'''
+    return config.CACHE_DIR / CACHE_FILE
+
+
+def _read_cache() -> 'OrderedDict[str, list]':
+    '''Read the parse cache file (empty if missing or corrupt).'''
+    try:
+        data = json.loads(_cache_path().read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return OrderedDict()
+    return OrderedDict(data) if isinstance(data, dict) else OrderedDict()
+
+
+def _loaded() -> 'OrderedDict[str, list]':
+    '''Get the in-memory parse cache, reading it on first use.'''
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = _read_cache()
+    return _CACHE
+
+
+def _trim(cache: 'OrderedDict[str, list]') -> None:
+    '''Drop the least recently used entries beyond the "project_cache_size" setting.'''
+    while len(cache) > config.get_config().project_cache_size:
+        cache.popitem(last=False)
+
+
+def save_cache() -> None:
+    '''Merge new lookups into the parse cache file (no-op if nothing changed).'''
+    global _CACHE, _dirty
+    if not _dirty:
+        return
+    path = _cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(config.LOCK_DIR / 'projects.lock'):
+            merged = _read_cache()
+            for directory, entry in _CACHE.items():
+                merged.pop(directory, None)
+                merged[directory] = entry
+            _trim(merged)
+            tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+            tmp.write_text(json.dumps(merged, separators=(',', ':')), encoding='utf-8')
+            os.replace(tmp, path)
+    except OSError:
+        return
+    _CACHE = merged
+    _dirty = False
+
+
+def _read_pin_file(path: str) -> Optional[str]:
+    '''Read the first version listed in a .python-version file.'''
+    try:
+        with open(path, encoding='utf-8') as fh:
+            for line in fh:
+                line = line.split('#', 1)[0].strip()
+                if line:
+                    return line.split()[0]
+    except OSError:
+        pass
+    return None
+
+
+def _read_pyproject(path: str) -> Optional[str]:
+    '''Read [tool.pyxenv] python from a pyproject.toml file.'''
+    data = load_toml(Path(path))
+    value = data.get('tool', {}).get('pyxenv', {}).get('python')
+    return str(value) if value else None
+
+
+def _version_in_directory(directory: str) -> Optional[str]:
+    '''
+    Get the version pinned directly in a directory, using the parse cache.
+
+    Call save_cache() afterwards to persist new lookups.
+
+    Args:
+        directory: Absolute directory path
+
+    Returns:
+        Pinned version or None
+    '''
+    global _dirty
+    pin_path = os.path.join(directory, PIN_FILE)
+    pyproject_path = os.path.join(directory, PYPROJECT_FILE)
+    signature = [_mtime(pin_path), _mtime(pyproject_path)]
+
+    cache = _loaded()
+    cached = cache.get(directory)
+    if isinstance(cached, list) and len(cached) == 2 and cached[0] == signature:
+        cache.move_to_end(directory)
+        return cached[1]
+
+    version = None
+    if signature[0] is not None:
+        version = _read_pin_file(pin_path)
+    if version is None and signature[1] is not None:
+        version = _read_pyproject(pyproject_path)
+
+    cache[directory] = [signature, version]
+    cache.move_to_end(directory)
+    _trim(cache)
+    _dirty = True
+    return version
+
+
+def find_project_version(start: Optional[Path] = None) -> Optional[str]:
+    '''
+    Find the Python version pinned for a project.
+
+    Searches upward from start for a .python-version file or a
+    [tool.pyxenv] table in pyproject.toml. The nearest directory wins and,
+    within a directory, .python-version takes precedence.
+
+    Args:
+        start: Directory to start from (default: current directory)
+
+    Returns:
+        Pinned version (e.g., "3.11") or None if nothing is pinned
+    '''
+    directory = os.path.abspath(start or os.getcwd())
+    try:
+        while True:
+            version = _version_in_directory(directory)
+            if version is not None:
+                return None if version == 'system' else version
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                return None
+            directory = parent
+    finally:
+        save_cache()
+
+
+def find_project_env(start: Optional[Path] = None) -> Optional[str]:
+    '''
+    Find the environment pinned for a directory by a .pyxenv-env file.
+
+    The file holds a single environment name; the nearest one wins. The
+    shell hook performs the same lookup in shell code.
+
+    Args:
+        start: Directory to start from (default: current directory)
+
+    Returns:
+        Environment name or None if nothing is pinned
+    '''
+    directory = os.path.abspath(start or os.getcwd())
+    while True:
+        name = _read_pin_file(os.path.join(directory, ENV_PIN_FILE))
+        if name is not None:
+            return name
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+def clear_cache() -> None:
+    '''Forget the in-memory lookups (the cache file is re-read on next use).'''
+    global _CACHE, _dirty
+    _CACHE = None
+    _dirty = False
@@ -1,87 +1,187 @@
 '''Python version detection and management.'''
 
 import os
-import shutil
-import subprocess
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
-from pyxenv.config import PYTHON_DIR
-from pyxenv.exceptions import PythonNotFoundError
-from pyxenv.utils import extract_version
+from pyxenv import config, metrics
+from pyxenv.exceptions import PythonNotFoundError, VersionError
+from pyxenv.registry import InterpreterRegistry, build_variant
+from pyxenv.versions import (SpecifierSet, Version, VersionIndex, executable_name,
+                             version_key)
+
+
+def _shared_store():
+    '''Get the SharedStore class, or None without a shared store (sparing its imports).'''
+    if not config.SHARED_STORE:
+        return None
+    from pyxenv.store import SharedStore
+    return SharedStore
 
 
 class PythonManager:
     '''Manages Python installations and version detection.'''
 
+    _index: Optional[VersionIndex] = None
+    _index_signature: Optional[tuple] = None
+
     @staticmethod
-    def find_versions(list_all: bool = False) -> list[tuple[str, str, str]]:
-        '''
-        List Python versions installed globally and via pyxenv.
-        
-        Args:
-            list_all: Include global Python installations
-            
-        Returns:
-            List of tuples (version, path, source)
-        '''
-        versions = []
+    def _which(name: str) -> Optional[str]:
+        '''Find an executable on PATH, skipping the pyxenv shim directory.'''
+        search_path = os.environ.get('PATH', os.defpath)
+        shim_dir = os.path.normcase(str(config.SHIM_DIR))
+        search_path = os.pathsep.join(
+            entry for entry in search_path.split(os.pathsep)
+            if os.path.normcase(os.path.abspath(entry)) != shim_dir
+        )
+        import shutil
+        return shutil.which(name, path=search_path)
+
+    @staticmethod
+    def _global_names() -> list[str]:
+        '''Executable names probed on PATH, newest first.'''
+        minors = sorted(config.SUPPORTED_VERSIONS, key=version_key, reverse=True)
+        names = []
+        for minor in minors:
+            names.append(f'python{minor}')
+            # Free-threaded builds exist from 3.13 on
+            if version_key(minor) >= version_key('3.13'):
+                names.append(f'python{minor}t')
+        return names + ['python3', 'python']
+
+    @staticmethod
+    def _candidates(list_all: bool = False) -> list[tuple[str, str]]:
+        '''List interpreter executables to probe as (path, source) tuples.'''
+        candidates = []
         seen = set()
 
         # Global versions
         if list_all:
-            possible_names = [
-                'python3.13', 'python3.12', 'python3.11', 'python3.10',
-                'python3.9', 'python3.8', 'python3', 'python'
-            ]
-            for name in possible_names:
-                path = shutil.which(name)
+            for name in PythonManager._global_names():
+                path = PythonManager._which(name)
                 if path and path.lower() not in seen:
-                    version = PythonManager._get_version_from_executable(path)
-                    if version:
-                        versions.append((version, path, 'global'))
-                        seen.add(path.lower())
+                    candidates.append((path, 'global'))
+                    seen.add(path.lower())
 
         # pyxenv versions
-        if PYTHON_DIR.exists():
-            for directory in PYTHON_DIR.iterdir():
+        if config.PYTHON_DIR.exists():
+            for directory in config.PYTHON_DIR.iterdir():
                 if directory.is_dir():
                     py_exe = PythonManager._get_python_executable_path(directory)
                     if py_exe and py_exe.exists() and str(py_exe).lower() not in seen:
-                        version = PythonManager._get_version_from_executable(str(py_exe))
-                        if version:
-                            versions.append((version, str(py_exe), 'pyxenv'))
-                            seen.add(str(py_exe).lower())
-
-        # Sort by version (descending)
-        versions = sorted(
-            versions,
-            key=lambda x: tuple(map(int, x[0].split('.'))),
-            reverse=True
-        )
-        return versions
+                        candidates.append((str(py_exe), 'pyxenv'))
+                        seen.add(str(py_exe).lower())
+
+        # Shared store versions (the local copy when there is one; listing fetches nothing)
+        store = _shared_store()
+        for version, digest in (store.refs() if store else {}).items():
+            for directory in (store.cache_path(digest), store.object_path(digest)):
+                py_exe = PythonManager._get_python_executable_path(directory, version)
+                if py_exe and py_exe.exists():
+                    if str(py_exe).lower() not in seen:
+                        candidates.append((str(py_exe), 'shared'))
+                        seen.add(str(py_exe).lower())
+                    break
+        return candidates
+
+    @staticmethod
+    def iter_versions(list_all: bool = False, max_workers: Optional[int] = None) -> Iterator[tuple[str, str, str]]:
+        '''
+        Probe Python installations in parallel, yielding each as it finishes.
+        
+        Args:
+            list_all: Include global Python installations
+            max_workers: Thread pool size (default: the "workers" setting)
+            
+        Yields:
+            Tuples (version, path, source) in completion order
+        '''
+        candidates = PythonManager._candidates(list_all)
+        if not candidates:
+            return
+        # concurrent.futures pulls in logging; only listings need a pool
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        with ThreadPoolExecutor(max_workers=max_workers or config.get_config().workers) as pool:
+            futures = {
+                pool.submit(PythonManager._get_version_from_executable, path): (path, source)
+                for path, source in candidates
+            }
+            for future in as_completed(futures):
+                version = future.result()
+                if version:
+                    path, source = futures[future]
+                    yield version, path, source
+        InterpreterRegistry.save()
+
+    @staticmethod
+    def find_versions(list_all: bool = False) -> list[tuple[str, str, str]]:
+        '''
+        List Python versions installed globally, via pyxenv and in the shared store.
+        
+        Args:
+            list_all: Include global Python installations
+            
+        Returns:
+            List of tuples (version, path, source), newest first
+        '''
+        versions = PythonManager.iter_versions(list_all)
+        return sorted(versions, key=lambda x: version_key(x[0]), reverse=True)
 
     @staticmethod
-    def _get_python_executable_path(directory: Path) -> Optional[Path]:
-        '''Get Python executable path for a directory.'''
+    def _get_python_executable_path(directory: Path, name: Optional[str] = None) -> Optional[Path]:
+        '''
+        Get Python executable path for a directory.
+        
+        Directories of build variants (e.g. "3.13t") point at the variant's
+        binary, such as "python3.13t.exe" or "bin/python3.13t".
+        
+        Args:
+            directory: Installation directory
+            name: Version the directory holds (default: the directory name;
+                store directories are named by digest)
+        '''
+        try:
+            version = Version.parse(name or directory.name)
+        except VersionError:
+            version = None
         if os.name == 'nt':
-            return directory / 'python.exe'
+            return directory / (executable_name(version, windows=True) if version else 'python.exe')
+        if version and version.variant:
+            variant_exe = directory / 'bin' / executable_name(version)
+            if variant_exe.exists():
+                return variant_exe
         return directory / 'bin' / 'python'
 
     @staticmethod
     def _get_version_from_executable(executable: str) -> Optional[str]:
-        '''Get Python version from executable.'''
+        '''Get Python version and build variant (e.g. "3.13.1t") from executable.'''
         try:
-            result = subprocess.run(
-                [executable, '--version'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            version_string = result.stdout.strip() or result.stderr.strip()
-            return extract_version(version_string)
+            info = InterpreterRegistry.get(executable)
         except Exception:
             return None
+        return info['version'] + build_variant(info) if info else None
+
+    @staticmethod
+    def fingerprint(executable: str) -> Optional[dict]:
+        '''
+        Get an interpreter's version, tags, build flags and paths.
+        
+        The interpreter is launched at most once (a single probe script
+        gathers everything); results are kept in the interpreter registry
+        until the binary changes.
+        
+        Args:
+            executable: Interpreter path
+            
+        Returns:
+            Fingerprint dict (version, version_info, implementation,
+            interpreter/abi/platform tags, free_threaded, debug, prefix,
+            sysconfig paths...) or None if it cannot be run
+        '''
+        info = InterpreterRegistry.get(executable)
+        InterpreterRegistry.save()
+        return info
 
     @staticmethod
     def get_executable(version: Optional[str] = None) -> str:
@@ -89,7 +189,8 @@ class PythonManager:
         Get Python executable for specified version.
         
         Args:
-            version: Python version (e.g., "3.11" or "3.11.5") or None for default
+            version: Python version (e.g., "3.11", "3.11.5" or "3.13t" for the
+                free-threaded build) or None for default
             
         Returns:
             Path to Python executable
@@ -97,20 +198,108 @@ class PythonManager:
         Raises:
             PythonNotFoundError: If version not found
         '''
+        with metrics.timer('resolve_seconds'):
+            return PythonManager._resolve(version)
+
+    @staticmethod
+    def _resolve(version: Optional[str]) -> str:
+        '''Resolve a version for get_executable.'''
         if version in (None, 'default'):
-            exe = shutil.which('python3') or shutil.which('python')
+            exe = PythonManager._which('python3') or PythonManager._which('python')
             if not exe:
                 raise PythonNotFoundError('No default Python found')
             return exe
 
         # Try global installation
-        exe = shutil.which(f'python{version}')
+        exe = PythonManager._which(f'python{version}')
         if exe:
             return exe
 
         # Try pyxenv installation
-        local_exe = PYTHON_DIR / version / ('python.exe' if os.name == 'nt' else 'bin/python')
+        local_exe = PythonManager._get_python_executable_path(config.PYTHON_DIR / version)
         if local_exe.exists():
             return str(local_exe)
 
+        # Try the shared store (copied into STORE_DIR on first use)
+        store = _shared_store()
+        cached = store.get(version) if store else None
+        if cached is not None:
+            store_exe = PythonManager._get_python_executable_path(cached, version)
+            if store_exe.exists():
+                return str(store_exe)
+
+        # Try matching a specifier (e.g. "3", ">=3.10,<3.13", "pypy3.10")
+        try:
+            spec = SpecifierSet.parse(version)
+        except VersionError:
+            raise PythonNotFoundError(f'Python {version} not found')
+
+        match = PythonManager.index().best(spec)
+        if match:
+            return _shared_store().localize(match[1]) if match[2] == 'shared' else match[1]
+
         raise PythonNotFoundError(f'Python {version} not found')
+
+    @staticmethod
+    def index() -> VersionIndex:
+        '''
+        Get the presorted index of known interpreters.
+        
+        The index is built without launching any interpreter: pyxenv
+        installations are keyed by their directory name and global ones by
+        their executable name (e.g. "python3.12"), shared store versions by
+        their published name. It is rebuilt only when PYTHON_DIR, PATH or
+        the shared store's refs change.
+        
+        Returns:
+            VersionIndex of (version, path, source) entries
+        '''
+        try:
+            dir_mtime = config.PYTHON_DIR.stat().st_mtime_ns
+        except OSError:
+            dir_mtime = None
+        store = _shared_store()
+        signature = (str(config.PYTHON_DIR), dir_mtime, os.environ.get('PATH', ''),
+                     str(config.SHARED_STORE), store.signature() if store else None)
+        if PythonManager._index is not None and PythonManager._index_signature == signature:
+            metrics.inc('index_hits_total')
+            return PythonManager._index
+        metrics.inc('index_misses_total')
+
+        entries = []
+        if dir_mtime is not None:
+            for directory in config.PYTHON_DIR.iterdir():
+                py_exe = PythonManager._get_python_executable_path(directory)
+                try:
+                    version = Version.parse(directory.name)
+                except VersionError:
+                    continue
+                if py_exe and py_exe.exists():
+                    entries.append((version, str(py_exe), 'pyxenv'))
+
+        # Published versions point into the shared store until resolved
+        for label, digest in (store.refs() if store else {}).items():
+            try:
+                version = Version.parse(label)
+            except VersionError:
+                continue
+            py_exe = PythonManager._get_python_executable_path(store.object_path(digest), label)
+            if py_exe and py_exe.exists():
+                entries.append((version, str(py_exe), 'shared'))
+
+        for name in PythonManager._global_names():
+            path = PythonManager._which(name)
+            if path:
+                # Prefer the exact version of an already fingerprinted interpreter
+                info = InterpreterRegistry.cached(path)
+                label = name
+                if info and not info.get('partial'):
+                    label = info['version'] + build_variant(info)
+                try:
+                    entries.append((Version.parse(label), path, 'global'))
+                except VersionError:
+                    continue
+
+        PythonManager._index = VersionIndex(entries)
+        PythonManager._index_signature = signature
+        return PythonManager._index
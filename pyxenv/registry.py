@@ -0,0 +1,246 @@
+'''Interpreter fingerprints gathered in one launch and cached on disk.'''
+
+import json
+import os
+import shlex
+import threading
+from typing import Optional
+
+from pyxenv import config, metrics
+from pyxenv.locks import FileLock
+from pyxenv.utils import extract_version
+
+REGISTRY_FILE = 'interpreters.json'
+
+# Runs inside the probed interpreter: keep it compatible with Python 3.8
+# and limited to modules that are cheap to import.
+PROBE_SCRIPT = '''
+import json, sys, sysconfig
+v = sys.version_info
+var = sysconfig.get_config_var
+name = sys.implementation.name
+ft = bool(var("Py_GIL_DISABLED"))
+debug = hasattr(sys, "gettotalrefcount")
+pre = {"alpha": "a", "beta": "b", "candidate": "rc"}.get(v.releaselevel)
+interp = {"cpython": "cp", "pypy": "pp"}.get(name, name) + "%d%d" % v[:2]
+paths = sysconfig.get_paths()
+print(json.dumps({
+    "version": "%d.%d.%d" % v[:3] + (pre + str(v.serial) if pre else ""),
+    "version_info": list(v),
+    "implementation": name,
+    "interpreter_tag": interp,
+    "abi_tag": interp + ("t" if ft else "") + ("d" if debug else ""),
+    "platform_tag": sysconfig.get_platform().replace("-", "_").replace(".", "_"),
+    "soabi": var("SOABI"),
+    "ext_suffix": var("EXT_SUFFIX"),
+    "free_threaded": ft,
+    "debug": debug,
+    "config_args": var("CONFIG_ARGS") or "",
+    "executable": sys.executable,
+    "prefix": sys.prefix,
+    "base_prefix": sys.base_prefix,
+    "paths": {k: paths.get(k) for k in ("stdlib", "platstdlib", "purelib", "platlib", "include", "scripts")},
+}))
+'''
+
+
+# configure options that mark optimized builds: (feature, option)
+BUILD_FEATURES = (
+    ('pgo', '--enable-optimizations'),
+    ('lto', '--with-lto'),
+    ('jit', '--enable-experimental-jit'),
+)
+
+
+def build_variant(info: Optional[dict]) -> str:
+    '''
+    Get the variant suffix of a fingerprinted interpreter.
+
+    Args:
+        info: Fingerprint
+
+    Returns:
+        "" for regular builds, "t" (free-threaded), "d" (debug) or "td"
+    '''
+    if not info:
+        return ''
+    return ('t' if info.get('free_threaded') else '') + ('d' if info.get('debug') else '')
+
+
+def build_features(info: Optional[dict]) -> tuple[str, ...]:
+    '''
+    Get the optimizations an interpreter was configured with.
+
+    Read from its configure arguments, which Windows builds do not record.
+
+    Args:
+        info: Fingerprint
+
+    Returns:
+        Subset of ("pgo", "lto", "jit")
+    '''
+    try:
+        args = shlex.split((info or {}).get('config_args') or '')
+    except ValueError:
+        return ()
+    enabled = set()
+    for arg in args:
+        option, _, value = arg.strip("'\"").partition('=')
+        if value != 'no':
+            enabled.add(option)
+    return tuple(feature for feature, option in BUILD_FEATURES if option in enabled)
+
+
+def _stat_key(executable: str) -> Optional[list[int]]:
+    '''Identify an interpreter binary by inode, size and mtime (None if missing).'''
+    try:
+        st = os.stat(executable)
+    except OSError:
+        return None
+    return [st.st_ino, st.st_size, st.st_mtime_ns]
+
+
+class InterpreterRegistry:
+    '''
+    Process-wide cache of interpreter fingerprints, persisted in
+    CACHE_DIR/interpreters.json.
+
+    Entries are keyed by executable path and invalidated when the binary's
+    stat data changes, so each interpreter is launched once per upgrade.
+    '''
+
+    _entries: Optional[dict] = None
+    _dirty = False
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _path():
+        '''Get the registry file path.'''
+        return config.CACHE_DIR / REGISTRY_FILE
+
+    @staticmethod
+    def _read() -> dict:
+        '''Read the registry file (empty if missing or corrupt).'''
+        try:
+            data = json.loads(InterpreterRegistry._path().read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    @staticmethod
+    def _loaded() -> dict:
+        '''Get the in-memory registry, reading it on first use.'''
+        if InterpreterRegistry._entries is None:
+            InterpreterRegistry._entries = InterpreterRegistry._read()
+        return InterpreterRegistry._entries
+
+    @staticmethod
+    def probe(executable: str, timeout: Optional[float] = None) -> Optional[dict]:
+        '''
+        Launch an interpreter once and collect its fingerprint.
+
+        Interpreters that cannot run the probe script are identified from
+        their output by version only; such partial results are not cached.
+
+        Args:
+            executable: Interpreter path
+            timeout: Seconds to wait (default: the "probe_timeout" setting)
+
+        Returns:
+            Fingerprint dict (at least "version"), or None if it cannot be run
+        '''
+        import subprocess  # only probes need it; most lookups hit the registry
+
+        metrics.inc('probes_total')
+        try:
+            with metrics.timer('probe_seconds'):
+                result = subprocess.run(
+                    [executable, '-I', '-c', PROBE_SCRIPT],
+                    capture_output=True,
+                    text=True,
+                    timeout=timeout or config.get_config().probe_timeout,
+                )
+        except Exception:
+            return None
+        output = (result.stdout or '').strip()
+        try:
+            info = json.loads(output)
+            if isinstance(info, dict) and info.get('version'):
+                return info
+        except ValueError:
+            pass
+        version = extract_version(output or (result.stderr or '').strip())
+        return {'version': version, 'partial': True} if version else None
+
+    @staticmethod
+    def cached(executable: str) -> Optional[dict]:
+        '''
+        Get a fingerprint without launching anything.
+
+        Args:
+            executable: Interpreter path
+
+        Returns:
+            Fingerprint dict, or None if unknown or the binary changed
+        '''
+        key = _stat_key(executable)
+        if key is None:
+            return None
+        with InterpreterRegistry._lock:
+            entry = InterpreterRegistry._loaded().get(executable)
+        if entry and entry.get('stat') == key:
+            return entry.get('info')
+        return None
+
+    @staticmethod
+    def get(executable: str) -> Optional[dict]:
+        '''
+        Get an interpreter's fingerprint, probing it if not cached.
+
+        Call save() afterwards to persist new fingerprints.
+
+        Args:
+            executable: Interpreter path
+
+        Returns:
+            Fingerprint dict, or None if the interpreter cannot be run
+        '''
+        info = InterpreterRegistry.cached(executable)
+        if info is not None:
+            metrics.inc('registry_hits_total')
+            return info
+        metrics.inc('registry_misses_total')
+        key = _stat_key(executable)
+        info = InterpreterRegistry.probe(executable)
+        if info is not None and not info.get('partial') and key is not None:
+            with InterpreterRegistry._lock:
+                InterpreterRegistry._loaded()[executable] = {'stat': key, 'info': info}
+                InterpreterRegistry._dirty = True
+        return info
+
+    @staticmethod
+    def save() -> None:
+        '''Merge new fingerprints into the registry file (no-op if nothing changed).'''
+        with InterpreterRegistry._lock:
+            if not InterpreterRegistry._dirty:
+                return
+            path = InterpreterRegistry._path()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with FileLock(config.LOCK_DIR / 'registry.lock'):
+                merged = InterpreterRegistry._read()
+                merged.update(InterpreterRegistry._entries)
+                tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+                try:
+                    tmp.write_text(json.dumps(merged, separators=(',', ':')), encoding='utf-8')
+                    os.replace(tmp, path)
+                except OSError:
+                    return
+            InterpreterRegistry._entries = merged
+            InterpreterRegistry._dirty = False
+
+    @staticmethod
+    def clear() -> None:
+        '''Forget the in-memory registry (the file is re-read on next use).'''
+        with InterpreterRegistry._lock:
+            InterpreterRegistry._entries = None
+            InterpreterRegistry._dirty = False
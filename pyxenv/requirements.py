@@ -0,0 +1,99 @@
+'''Requirement file parsing and change detection for incremental installs.'''
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Optional
+
+STAMP_FILE = '.pyxenv-requirements.json'
+
+_NAME_RE = re.compile(r'^([A-Za-z0-9][A-Za-z0-9._-]*)')
+_INCLUDE_RE = re.compile(r'^(?:-r|--requirement|-c|--constraint)[\s=]+(\S+)')
+
+
+def normalize_name(name: str) -> str:
+    '''Normalize a project name as in PEP 503 (e.g. "Foo_Bar" -> "foo-bar").'''
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+
+def read_lines(path: Path) -> list[str]:
+    '''Read the significant lines of a requirements file (no comments or blanks).'''
+    lines = []
+    pending = ''
+    with open(path, encoding='utf-8') as fh:
+        for raw in fh:
+            raw = raw.rstrip('\n')
+            if raw.endswith('\\'):
+                pending += raw[:-1]
+                continue
+            line = re.sub(r'(^|\s)#.*$', '', pending + raw).strip()
+            pending = ''
+            if line:
+                lines.append(line)
+    return lines
+
+
+def fingerprint(path: Path, python_version: Optional[str]) -> str:
+    '''
+    Hash a requirements file, the files it includes and the interpreter version.
+
+    Args:
+        path: Requirements file
+        python_version: Environment interpreter version
+
+    Returns:
+        SHA-256 hex digest
+    '''
+    digest = hashlib.sha256(f'python={python_version}\n'.encode('utf-8'))
+    seen = set()
+    pending = [Path(path)]
+    while pending:
+        current = pending.pop()
+        key = os.path.realpath(current)
+        if key in seen:
+            continue
+        seen.add(key)
+        for line in read_lines(current):
+            digest.update(line.encode('utf-8') + b'\n')
+            include = _INCLUDE_RE.match(line)
+            if include:
+                pending.append(current.parent / include.group(1))
+    return digest.hexdigest()
+
+
+def parse(path: Path) -> Optional[dict[str, str]]:
+    '''
+    Map normalized project names to their requirement lines.
+
+    Args:
+        path: Requirements file
+
+    Returns:
+        Mapping, or None when the file uses options (includes, editables,
+        index URLs...) that can only be honoured by a full "pip install -r"
+    '''
+    requirements = {}
+    for line in read_lines(path):
+        match = _NAME_RE.match(line)
+        if line.startswith('-') or not match:
+            return None
+        requirements[normalize_name(match.group(1))] = line
+    return requirements
+
+
+def read_stamp(env_path: Path) -> dict:
+    '''Read the stamp of the last successful install (empty if missing).'''
+    try:
+        return json.loads((env_path / STAMP_FILE).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def write_stamp(env_path: Path, stamp: dict) -> None:
+    '''Atomically record a successful install.'''
+    target = env_path / STAMP_FILE
+    tmp = target.with_name(f'{target.name}.{os.getpid()}.tmp')
+    tmp.write_text(json.dumps(stamp, indent=2, sort_keys=True), encoding='utf-8')
+    os.replace(tmp, target)
@@ -0,0 +1,107 @@
+'''Shell integration: activation exports and the directory-change hook.'''
+
+import shlex
+
+from pyxenv.project import ENV_PIN_FILE
+
+SHELLS = ('bash', 'zsh')
+
+# Removes the previously activated environment's scripts directory from PATH
+_STRIP_PATH = (
+    'if [ -n "${_PYXENV_ENV_BIN:-}" ]; then\n'
+    '  PATH=":$PATH:"; PATH="${PATH//":$_PYXENV_ENV_BIN:"/:}"; PATH="${PATH#:}"; PATH="${PATH%:}"\n'
+    'fi\n'
+)
+
+_HOOK = '''_pyxenv_deactivate() {{
+  [ -n "${{PYXENV_ACTIVE_ENV:-}}" ] || return 0
+{strip}  unset VIRTUAL_ENV VIRTUAL_ENV_PROMPT PYXENV_ACTIVE_ENV _PYXENV_ENV_BIN
+}}
+
+_pyxenv_hook() {{
+  [ "$PWD" = "${{_PYXENV_LAST_PWD:-}}" ] && return 0
+  _PYXENV_LAST_PWD=$PWD
+  local dir=$PWD pinned= exports
+  while :; do
+    if [ -f "$dir/{pin_file}" ]; then
+      read -r pinned < "$dir/{pin_file}"
+      break
+    fi
+    [ -z "$dir" ] && break
+    dir=${{dir%/*}}
+  done
+  [ "$pinned" = "${{PYXENV_ACTIVE_ENV:-}}" ] && return 0
+  _pyxenv_deactivate
+  [ -n "$pinned" ] || return 0
+  if exports=$(command {command} --env "$pinned" --print-env); then
+    eval "$exports"
+  else
+    printf '%s\\n' "$exports" >&2
+  fi
+}}
+'''
+
+_REGISTER = {
+    'bash': (
+        'case ";${PROMPT_COMMAND:-};" in\n'
+        '  *";_pyxenv_hook;"*) ;;\n'
+        '  *) PROMPT_COMMAND="_pyxenv_hook${PROMPT_COMMAND:+;$PROMPT_COMMAND}" ;;\n'
+        'esac\n'
+    ),
+    'zsh': (
+        'autoload -Uz add-zsh-hook\n'
+        'add-zsh-hook chpwd _pyxenv_hook\n'
+        '_pyxenv_hook\n'
+    ),
+}
+
+
+def render_exports(env_name: str, delta: dict) -> str:
+    '''
+    Render an activation delta as shell code for bash/zsh.
+
+    A previously activated pyxenv environment is removed from PATH first,
+    so the output can be evaluated repeatedly without PATH growing.
+
+    Args:
+        env_name: Environment name
+        delta: Mapping returned by VenvManager.activation_delta
+
+    Returns:
+        Shell code to evaluate
+    '''
+    lines = [_STRIP_PATH.rstrip('\n')]
+    lines += [f'unset {key}' for key in delta['unset']]
+    for key, value in delta['set'].items():
+        lines.append(f'export {key}={shlex.quote(value)}')
+    bin_dir = shlex.quote(delta['path'])
+    lines.append(f'export PYXENV_ACTIVE_ENV={shlex.quote(env_name)}')
+    lines.append(f'export _PYXENV_ENV_BIN={bin_dir}')
+    lines.append(f'export PATH={bin_dir}"${{PATH:+:$PATH}}"')
+    return '\n'.join(lines) + '\n'
+
+
+def render_hook(shell: str, command: str = 'pyxenv') -> str:
+    '''
+    Render the hook that switches environments when the directory changes.
+
+    The pinned environment is looked up in shell code (nearest
+    .pyxenv-env file), so nothing is run while it stays the same; pyxenv
+    is only invoked to print the cached exports of a newly pinned
+    environment.
+
+    Args:
+        shell: "bash" or "zsh"
+        command: Command used to invoke pyxenv
+
+    Returns:
+        Shell code to evaluate from the shell's rc file
+
+    Raises:
+        ValueError: If the shell is not supported
+    '''
+    if shell not in SHELLS:
+        raise ValueError(f'Shell não suportado: {shell} (use {", ".join(SHELLS)})')
+    strip = ''.join(f'  {line}\n' for line in _STRIP_PATH.splitlines())
+    hook = _HOOK.format(strip=strip, pin_file=ENV_PIN_FILE, command=command)
+    return hook + _REGISTER[shell]
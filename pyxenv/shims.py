@@ -0,0 +1,136 @@
+'''Per-version launcher shims.'''
+
+import os
+from pathlib import Path
+from typing import Optional
+
+from pyxenv import config
+from pyxenv.versions import SpecifierSet, Version
+
+SHIM_MODES = ('script', 'link')
+
+# Names of the launchers written by the last generate(), one per line
+MANIFEST_FILE = '.shims'
+
+_MARKER = 'Generated by pyxenv'
+_POSIX_SHIM = '#!/bin/sh\n# ' + _MARKER + ' - do not edit.\nexec "{exe}" "$@"\n'
+_WINDOWS_SHIM = '@echo off\r\nrem ' + _MARKER + ' - do not edit.\r\n"{exe}" %*\r\n'
+
+
+class ShimManager:
+    '''Generates launchers that run interpreters without going through pyxenv.'''
+
+    @staticmethod
+    def _shim_name(version: Version) -> str:
+        '''Get the launcher name for a version (e.g. "python3.12", "python3.13t", "pypy3.10").'''
+        prefix = 'python' if version.implementation == 'cpython' else version.implementation
+        minor = '.'.join(map(str, version.release[:2]))
+        return f'{prefix}{minor}{version.variant}'
+
+    @staticmethod
+    def resolve() -> dict[str, str]:
+        '''
+        Resolve the interpreter each launcher should point at.
+
+        Returns:
+            Mapping of launcher name to interpreter path
+        '''
+        from pyxenv.python_manager import PythonManager
+
+        index = PythonManager.index()
+        shims = {}
+        for version, _, _ in index:
+            if len(version.release) < 2:
+                continue
+            name = ShimManager._shim_name(version)
+            if name not in shims:
+                match = index.best(SpecifierSet.parse(name.replace('python', '', 1)))
+                if match:
+                    shims[name] = match[1]
+        return shims
+
+    @staticmethod
+    def _write(path: Path, exe: str, mode: str) -> None:
+        '''Atomically write a single launcher.'''
+        tmp = path.with_name(f'.{path.name}.tmp')
+        if tmp.exists() or tmp.is_symlink():
+            tmp.unlink()
+        if mode == 'link':
+            tmp.symlink_to(exe)
+        else:
+            template = _WINDOWS_SHIM if os.name == 'nt' else _POSIX_SHIM
+            tmp.write_text(template.format(exe=exe), encoding='utf-8')
+            tmp.chmod(0o755)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _generated(entry: Path, listed: set[str]) -> bool:
+        '''Tell whether a file in SHIM_DIR is a launcher pyxenv wrote.'''
+        if entry.name in listed:
+            return entry.is_symlink() or entry.is_file()
+        if entry.is_symlink() or not entry.is_file():
+            return False
+        try:
+            with open(entry, 'rb') as fh:
+                return _MARKER.encode() in fh.read(256)
+        except OSError:
+            return False
+
+    @staticmethod
+    def generate(mode: str = 'script') -> dict[str, str]:
+        '''
+        Regenerate the shim directory.
+
+        Launchers for interpreters that are no longer available are removed;
+        files pyxenv did not write (listed in MANIFEST_FILE or marked as
+        generated) are left alone.
+
+        Args:
+            mode: "script" for small shell/batch launchers, "link" for symlinks
+
+        Returns:
+            Mapping of launcher name to interpreter path
+        '''
+        if mode not in SHIM_MODES:
+            raise ValueError(f'Modo de shim inválido: {mode}')
+        if os.name == 'nt':
+            mode = 'script'
+
+        shim_dir = config.SHIM_DIR
+        shim_dir.mkdir(parents=True, exist_ok=True)
+        shims = ShimManager.resolve()
+        suffix = '.cmd' if os.name == 'nt' else ''
+
+        wanted = set()
+        for name, exe in shims.items():
+            path = shim_dir / f'{name}{suffix}'
+            wanted.add(path.name)
+            ShimManager._write(path, exe, mode)
+
+        manifest = shim_dir / MANIFEST_FILE
+        try:
+            listed = set(manifest.read_text(encoding='utf-8').split())
+        except OSError:
+            listed = set()
+        for entry in shim_dir.iterdir():
+            if entry.name not in wanted and not entry.name.startswith('.') \
+                    and ShimManager._generated(entry, listed):
+                entry.unlink()
+
+        manifest.write_text(''.join(f'{name}\n' for name in sorted(wanted)), encoding='utf-8')
+        (shim_dir / '.mode').write_text(mode, encoding='utf-8')
+        return shims
+
+    @staticmethod
+    def refresh() -> Optional[dict[str, str]]:
+        '''
+        Regenerate shims if the user has generated them before.
+
+        Returns:
+            Mapping of launcher name to interpreter path, or None if shims are not in use
+        '''
+        mode_file = config.SHIM_DIR / '.mode'
+        if not mode_file.exists():
+            return None
+        mode = mode_file.read_text(encoding='utf-8').strip() or 'script'
+        return ShimManager.generate(mode if mode in SHIM_MODES else 'script')
@@ -0,0 +1,296 @@
+'''Disk usage and garbage collection for PYTHON_DIR and ENV_DIR.'''
+
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from pyxenv import config
+from pyxenv.exceptions import pyxenvError
+from pyxenv.locks import FileLock
+from pyxenv.shims import ShimManager
+
+LAST_USED_MARKER = '.pyxenv-last-used'
+
+_DURATION_RE = re.compile(r'^(\d+(?:\.\d+)?)([smhdw]?)$')
+_DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800, '': 86400}
+
+
+def parse_duration(text: str) -> float:
+    '''
+    Parse a duration like "30d", "12h" or "2w" (plain numbers are days).
+
+    Args:
+        text: Duration string
+
+    Returns:
+        Duration in seconds
+
+    Raises:
+        pyxenvError: If the duration is invalid
+    '''
+    match = _DURATION_RE.match(text.strip().lower())
+    if not match:
+        raise pyxenvError(f'Duração inválida: {text!r} (use por ex. 30d, 12h, 2w)')
+    return float(match.group(1)) * _DURATION_UNITS[match.group(2)]
+
+
+class _UsageWalker:
+    '''Sums disk usage of directory trees, counting hardlinked files once.'''
+
+    def __init__(self):
+        self._seen: set[tuple[int, int]] = set()
+        self._lock = threading.Lock()
+
+    def _first_sighting(self, st: os.stat_result) -> bool:
+        '''Return True the first time a hardlinked inode is seen.'''
+        key = (st.st_dev, st.st_ino)
+        with self._lock:
+            if key in self._seen:
+                return False
+            self._seen.add(key)
+            return True
+
+    def walk(self, root: Path) -> tuple[int, int]:
+        '''
+        Compute the usage of a tree without following symlinks.
+
+        Args:
+            root: Directory to walk
+
+        Returns:
+            Tuple (bytes, files)
+        '''
+        total = files = 0
+        stack = [str(root)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                                continue
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        if st.st_nlink > 1 and not self._first_sighting(st):
+                            continue
+                        total += getattr(st, 'st_blocks', 0) * 512 or st.st_size
+                        files += 1
+            except OSError:
+                continue
+        return total, files
+
+
+class StorageManager:
+    '''Reports and reclaims disk space used by interpreters and environments.'''
+
+    @staticmethod
+    def mark_used(path: Path) -> None:
+        '''
+        Record that an interpreter or environment directory was just used.
+
+        Args:
+            path: Directory under PYTHON_DIR or ENV_DIR
+        '''
+        marker = path / LAST_USED_MARKER
+        try:
+            os.utime(marker)
+        except FileNotFoundError:
+            try:
+                marker.touch()
+            except OSError:
+                pass
+        except OSError:
+            pass
+
+    @staticmethod
+    def last_used(path: Path) -> float:
+        '''
+        Get when a directory was last used (falls back to its mtime).
+
+        Args:
+            path: Directory under PYTHON_DIR or ENV_DIR
+
+        Returns:
+            Timestamp in seconds since the epoch
+        '''
+        for candidate in (path / LAST_USED_MARKER, path):
+            try:
+                return candidate.stat().st_mtime
+            except OSError:
+                continue
+        return 0.0
+
+    @staticmethod
+    def owner(executable: str) -> Optional[Path]:
+        '''
+        Get the PYTHON_DIR, ENV_DIR or STORE_DIR entry containing a path.
+
+        Args:
+            executable: Path to an interpreter or any file
+
+        Returns:
+            Top-level interpreter/environment directory, or None if unmanaged
+        '''
+        path = Path(os.path.abspath(executable))
+        for base in (config.PYTHON_DIR, config.ENV_DIR, config.STORE_DIR):
+            try:
+                relative = path.relative_to(base)
+            except ValueError:
+                continue
+            if relative.parts:
+                return base / relative.parts[0]
+        return None
+
+    @staticmethod
+    def _entries(base: Path) -> list[Path]:
+        '''List the directories directly under base.'''
+        if not base.exists():
+            return []
+        return sorted(p for p in base.iterdir() if p.is_dir() and not p.name.startswith('.'))
+
+    @staticmethod
+    def usage(max_workers: Optional[int] = None) -> dict[str, list[tuple[str, int, int]]]:
+        '''
+        Compute disk usage of every interpreter and environment in parallel.
+
+        Args:
+            max_workers: Thread pool size (default: the "workers" setting)
+
+        Returns:
+            Mapping {"pythons": [...], "envs": [...]} of (name, bytes, files) tuples
+        '''
+        from concurrent.futures import ThreadPoolExecutor
+
+        walker = _UsageWalker()
+        groups = {
+            'pythons': StorageManager._entries(config.PYTHON_DIR),
+            'envs': StorageManager._entries(config.ENV_DIR),
+        }
+        with ThreadPoolExecutor(max_workers=max_workers or config.get_config().workers) as pool:
+            futures = {
+                group: [(path.name, pool.submit(walker.walk, path)) for path in paths]
+                for group, paths in groups.items()
+            }
+            return {
+                group: [(name, *future.result()) for name, future in items]
+                for group, items in futures.items()
+            }
+
+    @staticmethod
+    def _select(paths: list[Path], cutoff: float, keep_latest: int) -> list[Path]:
+        '''Pick paths unused since cutoff, sparing the keep_latest most recently used.'''
+        by_recency = sorted(paths, key=StorageManager.last_used, reverse=True)
+        return [p for p in by_recency[keep_latest:] if StorageManager.last_used(p) < cutoff]
+
+    @staticmethod
+    def _interpreter_of(env_path: Path) -> Optional[Path]:
+        '''Get the managed interpreter directory an environment was created from.'''
+        # venv_manager imports this module, so it is imported at call time
+        from pyxenv.venv_manager import VenvManager
+
+        home = VenvManager.read_config(env_path).get('home')
+        return StorageManager.owner(home) if home else None
+
+    @staticmethod
+    def _unreferenced_pythons(cutoff: float, keep_latest: int, referenced: set) -> list[Path]:
+        '''Pick idle interpreters that no remaining environment was created from.'''
+        pythons = [p for p in StorageManager._entries(config.PYTHON_DIR) if p not in referenced]
+        return StorageManager._select(pythons, cutoff, keep_latest)
+
+    @staticmethod
+    def plan(older_than: float, keep_latest: int = 0) -> list[Path]:
+        '''
+        Decide which environments and interpreters can be removed.
+
+        Environments are removed when unused for older_than seconds.
+        Interpreters are removed when, in addition, no remaining
+        environment references them. The keep_latest most recently used
+        environments and interpreters are always kept.
+
+        Args:
+            older_than: Minimum idle time in seconds
+            keep_latest: Number of most recently used entries to keep per kind
+
+        Returns:
+            Directories to remove
+        '''
+        cutoff = time.time() - older_than
+        envs = StorageManager._entries(config.ENV_DIR)
+        doomed_envs = StorageManager._select(envs, cutoff, keep_latest)
+        referenced = {StorageManager._interpreter_of(env) for env in envs if env not in doomed_envs}
+        return doomed_envs + StorageManager._unreferenced_pythons(cutoff, keep_latest, referenced)
+
+    @staticmethod
+    def _remove(path: Path) -> bool:
+        '''Remove a directory unless another operation holds its lock.'''
+        lock = FileLock.for_target(path, blocking=False)
+        if not lock.acquire():
+            return False
+        import shutil
+        try:
+            shutil.rmtree(path)
+            return True
+        except OSError:
+            return False
+        finally:
+            lock.release()
+
+    @staticmethod
+    def collect(older_than: float, keep_latest: int = 0, dry_run: bool = False,
+                max_workers: Optional[int] = None) -> tuple[list[Path], list[Path]]:
+        '''
+        Remove unused environments and interpreters concurrently.
+
+        Args:
+            older_than: Minimum idle time in seconds
+            keep_latest: Number of most recently used entries to keep per kind
+            dry_run: Only report what would be removed
+            max_workers: Thread pool size (default: the "workers" setting)
+
+        Environments are removed first; interpreters are then chosen among
+        those no environment references any more, so an environment that
+        was skipped (locked or not fully removed) keeps its interpreter.
+
+        Returns:
+            Tuple (removed, skipped) where skipped entries were locked by
+            in-flight operations or could not be removed
+
+        Raises:
+            pyxenvError: If asked to remove on Windows, where running scripts
+                hold no shared lock that would keep their interpreter alive
+        '''
+        if dry_run:
+            return StorageManager.plan(older_than, keep_latest), []
+        if os.name == 'nt':
+            raise pyxenvError('--gc só pode remover com --dry-run no Windows '
+                              '(não há como detectar interpretadores em uso)')
+
+        cutoff = time.time() - older_than
+        envs = StorageManager._entries(config.ENV_DIR)
+        # Read before removal: a partly removed environment may have lost its pyvenv.cfg
+        interpreters = {env: StorageManager._interpreter_of(env) for env in envs}
+        doomed_envs = StorageManager._select(envs, cutoff, keep_latest)
+        workers = max_workers or config.get_config().workers
+        removed, skipped = [], []
+
+        def remove_all(paths: list[Path]) -> None:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                outcomes = list(pool.map(StorageManager._remove, paths))
+            removed.extend(p for p, ok in zip(paths, outcomes) if ok)
+            skipped.extend(p for p, ok in zip(paths, outcomes) if not ok)
+
+        if doomed_envs:
+            remove_all(doomed_envs)
+        referenced = {interpreters[env] for env in envs if env not in removed}
+        doomed_pythons = StorageManager._unreferenced_pythons(cutoff, keep_latest, referenced)
+        if doomed_pythons:
+            remove_all(doomed_pythons)
+        if any(p.parent == config.PYTHON_DIR for p in removed):
+            ShimManager.refresh()
+        return removed, skipped
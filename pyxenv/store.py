@@ -0,0 +1,271 @@
+'''
+Two-tier interpreter store.
+
+A shared store (SHARED_STORE, e.g. on NFS) holds published interpreters
+read-only and content-addressed:
+
+    <shared>/objects/<digest>/   interpreter tree with its integrity manifest
+    <shared>/refs/<version>      text file naming the digest of a version
+
+Each host copies the interpreters it actually uses into STORE_DIR on first
+use and keeps the most recently used ones (the "store_cache_size" setting).
+'''
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from pyxenv import config, metrics
+from pyxenv.exceptions import pyxenvError
+from pyxenv.integrity import IntegrityManager
+from pyxenv.locks import FileLock
+from pyxenv.utils import report
+
+OBJECTS_DIR = 'objects'
+REFS_DIR = 'refs'
+
+
+def tree_digest(root: Path) -> str:
+    '''
+    Get the content address of an interpreter tree.
+
+    Every file is hashed again, so the digest covers the tree as it is now.
+    Nothing is written, so a shared lock on the tree is enough. Only paths,
+    sizes, file hashes and symlink targets count, so a copy of the same
+    files has the same digest.
+
+    Args:
+        root: Interpreter directory
+
+    Returns:
+        Hex digest
+
+    Raises:
+        pyxenvError: If files recorded at install time are missing or changed
+    '''
+    previous = IntegrityManager.load(root)
+    manifest = IntegrityManager.scan(root)
+    if previous is not None:
+        current = manifest['files']
+        damaged = [name for name, entry in previous.get('files', {}).items()
+                   if name not in current or current[name][2] != entry[2]]
+        if damaged:
+            raise pyxenvError(f'{root.name} foi alterado desde a instalação ({len(damaged)} arquivos, '
+                              f'ex: {damaged[0]}); use pyxenv --verify {root.name} --deep')
+    content = {
+        'files': {name: [entry[0], entry[2]] for name, entry in manifest.get('files', {}).items()},
+        'links': manifest.get('links', {}),
+    }
+    return hashlib.blake2b(json.dumps(content, sort_keys=True).encode(), digest_size=16).hexdigest()
+
+
+class SharedStore:
+    '''Resolves interpreters through the shared store and the local cache.'''
+
+    @staticmethod
+    def refs() -> dict[str, str]:
+        '''
+        List the published versions.
+
+        Returns:
+            Mapping of version (e.g. "3.12.4", "3.13t") to digest; empty
+            without a shared store or when it is unreachable
+        '''
+        shared = config.SHARED_STORE
+        if not shared:
+            return {}
+        refs = {}
+        try:
+            for entry in os.scandir(Path(shared) / REFS_DIR):
+                if entry.name.startswith('.') or not entry.is_file():
+                    continue
+                with open(entry.path, encoding='utf-8') as fh:
+                    digest = fh.read().strip()
+                if digest:
+                    refs[entry.name] = digest
+        except OSError:
+            return {}
+        return refs
+
+    @staticmethod
+    def signature() -> Optional[int]:
+        '''Get the refs directory mtime, which changes when a version is published.'''
+        shared = config.SHARED_STORE
+        if not shared:
+            return None
+        try:
+            return (Path(shared) / REFS_DIR).stat().st_mtime_ns
+        except OSError:
+            return None
+
+    @staticmethod
+    def object_path(digest: str) -> Path:
+        '''Get an interpreter's directory in the shared store.'''
+        return Path(config.SHARED_STORE) / OBJECTS_DIR / digest
+
+    @staticmethod
+    def cache_path(digest: str) -> Path:
+        '''Get an interpreter's directory in the local cache.'''
+        return config.STORE_DIR / digest
+
+    @staticmethod
+    def publish(version: str) -> str:
+        '''
+        Copy an interpreter from PYTHON_DIR into the shared store.
+
+        Objects are written under a temporary name and renamed, so readers
+        never see a partial tree; publishing the same files twice is a no-op.
+
+        Args:
+            version: Directory name under PYTHON_DIR (e.g. "3.12.4", "3.13t")
+
+        Returns:
+            Digest of the published interpreter
+
+        Raises:
+            pyxenvError: If there is no shared store or the version is not installed
+        '''
+        if not config.SHARED_STORE:
+            raise pyxenvError('Nenhum store compartilhado configurado (PYXENV_SHARED_STORE).')
+        source = config.PYTHON_DIR / version
+        if not source.is_dir():
+            raise pyxenvError(f'Python {version} não está instalado em {config.PYTHON_DIR}')
+
+        with FileLock.for_target(source, shared=True):
+            digest = tree_digest(source)
+            target = SharedStore.object_path(digest)
+            if not target.exists():
+                target.parent.mkdir(parents=True, exist_ok=True)
+                staging = Path(tempfile.mkdtemp(prefix='.publish-', dir=target.parent))
+                try:
+                    shutil.copytree(source, staging / digest, symlinks=True)
+                    # The source keeps its install-time manifest; the object gets a current one
+                    IntegrityManager.record(staging / digest)
+                    try:
+                        os.rename(staging / digest, target)
+                    except OSError:
+                        # Published concurrently by another host
+                        if not target.exists():
+                            raise
+                finally:
+                    shutil.rmtree(staging, ignore_errors=True)
+
+        refs = Path(config.SHARED_STORE) / REFS_DIR
+        refs.mkdir(parents=True, exist_ok=True)
+        tmp = refs / f'.{version}.{os.getpid()}.tmp'
+        tmp.write_text(digest + '\n', encoding='utf-8')
+        os.replace(tmp, refs / version)
+        report(f'- Python {version} publicado em {config.SHARED_STORE} ({digest})')
+        return digest
+
+    @staticmethod
+    def fetch(digest: str) -> Path:
+        '''
+        Get an interpreter from the local cache, copying it from the shared store on first use.
+
+        The copy is checked against the object's manifest before it is
+        renamed into place, then least recently used entries are evicted.
+
+        Args:
+            digest: Object digest
+
+        Returns:
+            Directory in STORE_DIR
+
+        Raises:
+            pyxenvError: If the object is missing or the copy does not match
+        '''
+        # Imported here: storage imports python_manager, which resolves through this module
+        from pyxenv.storage import StorageManager
+
+        local = SharedStore.cache_path(digest)
+        with FileLock.for_target(local):
+            if local.is_dir():
+                metrics.inc('store_hits_total')
+            else:
+                source = SharedStore.object_path(digest)
+                if not source.is_dir():
+                    raise pyxenvError(f'Objeto {digest} não encontrado em {config.SHARED_STORE}')
+                report(f'- Copiando {digest} do store compartilhado para {config.STORE_DIR}')
+                metrics.inc('store_fetches_total')
+                config.STORE_DIR.mkdir(parents=True, exist_ok=True)
+                staging = Path(tempfile.mkdtemp(prefix='.fetch-', dir=config.STORE_DIR))
+                try:
+                    with metrics.timer('store_fetch_seconds'):
+                        shutil.copytree(source, staging / digest, symlinks=True)
+                    result = IntegrityManager.verify(staging / digest)
+                    if result is None or result['missing'] or result['modified']:
+                        raise pyxenvError(f'Cópia de {digest} não confere com o manifesto')
+                    os.replace(staging / digest, local)
+                finally:
+                    shutil.rmtree(staging, ignore_errors=True)
+            StorageManager.mark_used(local)
+        SharedStore.evict(keep=local)
+        return local
+
+    @staticmethod
+    def get(version: str) -> Optional[Path]:
+        '''
+        Get a published version from the local cache, fetching it if needed.
+
+        Args:
+            version: Version exactly as published (e.g. "3.12.4")
+
+        Returns:
+            Directory in STORE_DIR, or None if the version was not published
+        '''
+        digest = SharedStore.refs().get(version)
+        return SharedStore.fetch(digest) if digest else None
+
+    @staticmethod
+    def localize(path: str) -> str:
+        '''
+        Map a path inside the shared store to the same path in the local cache,
+        fetching the interpreter if needed.
+
+        Args:
+            path: Path to a file of a shared object (or any other path)
+
+        Returns:
+            Local path (other paths are returned unchanged)
+        '''
+        if not config.SHARED_STORE:
+            return path
+        try:
+            relative = Path(path).relative_to(Path(config.SHARED_STORE) / OBJECTS_DIR)
+        except ValueError:
+            return path
+        return str(SharedStore.fetch(relative.parts[0]).joinpath(*relative.parts[1:]))
+
+    @staticmethod
+    def evict(keep: Optional[Path] = None) -> list[Path]:
+        '''
+        Remove the least recently used interpreters beyond "store_cache_size".
+
+        Entries in use are never evicted: those an environment was created
+        from (as with --gc) and those locked by a running script.
+
+        Args:
+            keep: Entry never to evict (the one just used)
+
+        Returns:
+            Removed directories
+        '''
+        from pyxenv.storage import StorageManager
+
+        if not config.STORE_DIR.is_dir():
+            return []
+        entries = sorted(
+            (p for p in config.STORE_DIR.iterdir() if p.is_dir() and not p.name.startswith('.')),
+            key=StorageManager.last_used, reverse=True)
+        referenced = {StorageManager._interpreter_of(env) for env in StorageManager._entries(config.ENV_DIR)}
+        limit = max(config.get_config().store_cache_size, 1)
+        removed = []
+        for path in entries[limit:]:
+            if path != keep and path not in referenced and StorageManager._remove(path):
+                removed.append(path)
+        return removed
@@ -0,0 +1,269 @@
+'''Download progress, bandwidth throttling and throughput records.'''
+
+import json
+import re
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Callable, Optional, TextIO
+
+from pyxenv import config, metrics
+from pyxenv.exceptions import pyxenvError
+from pyxenv.utils import format_size
+
+DOWNLOAD_LOG = 'downloads.jsonl'
+
+_RATE_RE = re.compile(r'^(\d+(?:\.\d+)?)\s*([kmg]?)i?b?(?:/s)?$')
+_RATE_UNITS = {'': 1, 'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3}
+
+# Seconds between progress line updates
+PROGRESS_INTERVAL = 0.2
+
+# Bytes read per block by retrieve()
+BLOCK_SIZE = 64 * 1024
+
+
+def parse_rate(text: str) -> float:
+    '''
+    Parse a bandwidth like "500K", "2M" or "1.5MB/s" (plain numbers are bytes/s).
+
+    Args:
+        text: Rate string
+
+    Returns:
+        Bytes per second
+
+    Raises:
+        pyxenvError: If the rate is invalid
+    '''
+    match = _RATE_RE.match(text.strip().lower())
+    if not match or float(match.group(1)) <= 0:
+        raise pyxenvError(f'Taxa inválida: {text!r} (use por ex. 500K, 2M)')
+    return float(match.group(1)) * _RATE_UNITS[match.group(2)]
+
+
+class TokenBucket:
+    '''
+    Thread-safe token bucket shared by concurrent downloads.
+
+    Consumers may overdraw the bucket; they then sleep until the debt is
+    repaid, so chunks larger than the burst size are still throttled.
+    '''
+
+    def __init__(self, rate: float, burst: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        '''
+        Args:
+            rate: Bytes per second
+            burst: Bucket capacity in bytes (default: a quarter second of rate)
+            clock: Monotonic clock (injectable for tests)
+            sleep: Sleep function (injectable for tests)
+        '''
+        self.rate = rate
+        self.burst = burst if burst is not None else rate / 4
+        self._tokens = self.burst
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def consume(self, amount: float) -> float:
+        '''
+        Take tokens for a transferred chunk, sleeping if the rate is exceeded.
+
+        Args:
+            amount: Bytes transferred
+
+        Returns:
+            Seconds slept
+        '''
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if delay:
+            self._sleep(delay)
+        return delay
+
+
+_bucket: Optional[TokenBucket] = None
+_bucket_rate: Optional[str] = None
+_bucket_lock = threading.Lock()
+
+
+def set_limit(rate: Optional[str]) -> None:
+    '''
+    Override the "limit_rate" setting for this process.
+
+    Args:
+        rate: Rate string (e.g. "2M"), or None to lift the limit
+
+    Raises:
+        pyxenvError: If the rate is invalid
+    '''
+    global _bucket, _bucket_rate
+    bucket = TokenBucket(parse_rate(rate)) if rate else None
+    with _bucket_lock:
+        _bucket, _bucket_rate = bucket, rate or ''
+
+
+def shared_bucket() -> Optional[TokenBucket]:
+    '''Get the process-wide bucket all downloads draw from (None if unlimited).'''
+    global _bucket, _bucket_rate
+    with _bucket_lock:
+        if _bucket_rate is None:
+            rate = config.get_config().limit_rate
+            _bucket = TokenBucket(parse_rate(rate)) if rate else None
+            _bucket_rate = rate or ''
+        return _bucket
+
+
+def _format_duration(seconds: float) -> str:
+    '''Format an ETA like "1m05s".'''
+    seconds = int(seconds + 0.5)
+    if seconds < 60:
+        return f'{seconds}s'
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f'{minutes}m{seconds:02d}s'
+    hours, minutes = divmod(minutes, 60)
+    return f'{hours}h{minutes:02d}m'
+
+
+class DownloadMonitor:
+    '''
+    retrieve() reporthook that shows progress, applies the rate limit and
+    records throughput.
+
+    Progress is redrawn in place on stderr when it is a terminal, at most
+    every PROGRESS_INTERVAL seconds.
+    '''
+
+    def __init__(self, url: str, bucket: Optional[TokenBucket] = None, progress: bool = True,
+                 stream: Optional[TextIO] = None):
+        '''
+        Args:
+            url: Downloaded URL (for the log)
+            bucket: Token bucket to draw from (default: the shared one)
+            progress: Draw the progress line
+            stream: Progress output (default: sys.stderr)
+        '''
+        self.url = url
+        self.bucket = bucket if bucket is not None else shared_bucket()
+        self.stream = stream or sys.stderr
+        self.progress = progress and self.stream.isatty()
+        self.received = 0
+        self.total: Optional[int] = None
+        self.started = time.monotonic()
+        self._drawn = 0.0
+
+    def __call__(self, blocknum: int, blocksize: int, totalsize: int) -> None:
+        '''Account for a block reported by retrieve().'''
+        if totalsize > 0:
+            self.total = totalsize
+        received = blocknum * blocksize
+        if self.total:
+            received = min(received, self.total)
+        delta, self.received = received - self.received, received
+        if self.bucket is not None and delta > 0:
+            self.bucket.consume(delta)
+        now = time.monotonic()
+        if self.progress and now - self._drawn >= PROGRESS_INTERVAL:
+            self._drawn = now
+            self.stream.write('\r' + self.status(now) + '\033[K')
+            self.stream.flush()
+
+    def rate(self, now: Optional[float] = None) -> float:
+        '''Average throughput so far, in bytes per second.'''
+        elapsed = (now or time.monotonic()) - self.started
+        return self.received / elapsed if elapsed > 0 else 0.0
+
+    def status(self, now: Optional[float] = None) -> str:
+        '''Progress line: bytes, rate and ETA.'''
+        rate = self.rate(now)
+        if not self.total:
+            return f'-  {format_size(self.received)}  {format_size(rate)}/s'
+        percent = 100 * self.received / self.total
+        eta = _format_duration((self.total - self.received) / rate) if rate else '?'
+        return (f'-  {format_size(self.received)}/{format_size(self.total)} ({percent:.0f}%)'
+                f'  {format_size(rate)}/s  ETA {eta}')
+
+    def finish(self, ok: bool = True) -> dict:
+        '''
+        Close the progress line and append the download to LOG_DIR/downloads.jsonl.
+
+        Args:
+            ok: Whether the download succeeded
+
+        Returns:
+            The logged record
+        '''
+        seconds = time.monotonic() - self.started
+        if self.progress:
+            self.stream.write('\r\033[K')
+            self.stream.flush()
+        record = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'url': self.url,
+            'bytes': self.received,
+            'seconds': round(seconds, 3),
+            'bytes_per_second': round(self.received / seconds) if seconds > 0 else None,
+            'limit': self.bucket.rate if self.bucket is not None else None,
+            'ok': ok,
+        }
+        metrics.inc('download_bytes_total', self.received)
+        metrics.observe('download_seconds', seconds)
+        if not ok:
+            metrics.inc('download_failures_total')
+        try:
+            config.LOG_DIR.mkdir(parents=True, exist_ok=True)
+            with open(config.LOG_DIR / DOWNLOAD_LOG, 'a', encoding='utf-8') as log:
+                log.write(json.dumps(record) + '\n')
+        except OSError:
+            pass
+        return record
+
+
+def retrieve(url: str, path: Path, reporthook: Optional[Callable[[int, int, int], None]] = None,
+             timeout: Optional[float] = None) -> int:
+    '''
+    Download a URL into a file block by block, like urlretrieve but with a timeout.
+
+    Args:
+        url: URL to download
+        path: Destination file
+        reporthook: Called as (blocknum, blocksize, totalsize) after each block
+        timeout: Seconds to wait on the connection and each read (default: network_timeout)
+
+    Returns:
+        Bytes written
+
+    Raises:
+        urllib.error.ContentTooShortError: If fewer bytes than announced arrived
+    '''
+    if timeout is None:
+        timeout = config.get_config().network_timeout
+    with urllib.request.urlopen(url, timeout=timeout) as response, open(path, 'wb') as out:
+        total = int(response.headers.get('Content-Length') or -1)
+        received = blocknum = 0
+        if reporthook:
+            reporthook(blocknum, BLOCK_SIZE, total)
+        while True:
+            block = response.read(BLOCK_SIZE)
+            if not block:
+                break
+            out.write(block)
+            received += len(block)
+            blocknum += 1
+            if reporthook:
+                reporthook(blocknum, BLOCK_SIZE, total)
+    if 0 <= received < total:
+        raise urllib.error.ContentTooShortError(
+            f'download incompleto: {received} de {total} bytes', (path, response.headers))
+    return received
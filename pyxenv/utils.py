@@ -1,10 +1,52 @@
 '''Utility functions for pyxenv.'''
 
 import re
-import subprocess
-from typing import Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Optional
 
-def run_command(cmd: list[str], check: bool = True, **kwargs) -> subprocess.CompletedProcess:
+from pyxenv import metrics
+
+if TYPE_CHECKING:
+    import subprocess
+
+INVALIDATION_MODES = ('timestamp', 'checked-hash', 'unchecked-hash')
+
+# Receives progress messages instead of stdout (see reporting_to)
+_reporter: ContextVar[Optional[Callable[[str], None]]] = ContextVar('pyxenv_reporter', default=None)
+
+def report(message: str) -> None:
+    '''
+    Show a progress message: print it, or pass it to the callback set with reporting_to.
+    
+    Args:
+        message: Message text
+    '''
+    callback = _reporter.get()
+    if callback is None:
+        print(message)
+    else:
+        callback(message)
+
+@contextmanager
+def reporting_to(callback: Optional[Callable[[str], None]]) -> Iterator[None]:
+    '''
+    Send progress messages of the current context to a callback.
+    
+    The callback follows the context into tasks and executor calls started
+    with contextvars.copy_context; plain worker threads print as before.
+    
+    Args:
+        callback: Called with each message, or None to print them
+    '''
+    token = _reporter.set(callback)
+    try:
+        yield
+    finally:
+        _reporter.reset(token)
+
+def run_command(cmd: list[str], check: bool = True, **kwargs) -> 'subprocess.CompletedProcess':
     '''
     Execute a command and print it.
     
@@ -16,8 +58,50 @@ def run_command(cmd: list[str], check: bool = True, **kwargs) -> subprocess.Comp
     Returns:
         CompletedProcess instance
     '''
-    print(f"- Executando: {' '.join(map(str, cmd))}")
-    return subprocess.run(cmd, check=check, **kwargs)
+    import subprocess  # costly, and --version or --list never run commands
+
+    report(f"- Executando: {' '.join(map(str, cmd))}")
+    metrics.inc('commands_total')
+    with metrics.timer('command_seconds'):
+        return subprocess.run(cmd, check=check, **kwargs)
+
+def precompile(python_exe: str, paths: Iterable[Path] = (),
+               invalidation_mode: Optional[str] = None) -> bool:
+    '''
+    Precompile bytecode with compileall using all CPU cores.
+    
+    Runs the target interpreter so the .pyc files match its magic number,
+    in isolated mode (-I) so the working directory and user site are not
+    on its path. Without paths, compileall compiles everything on sys.path.
+    
+    Args:
+        python_exe: Interpreter that compiles (and will later import) the files
+        paths: Directories to compile
+        invalidation_mode: "timestamp", "checked-hash" or "unchecked-hash"
+        
+    Returns:
+        True if every file compiled cleanly
+    '''
+    cmd = [python_exe, '-I', '-m', 'compileall', '-q', '-j', '0']
+    if invalidation_mode:
+        if invalidation_mode not in INVALIDATION_MODES:
+            raise ValueError(f'Modo de invalidação inválido: {invalidation_mode}')
+        cmd += ['--invalidation-mode', invalidation_mode]
+    cmd += [str(path) for path in paths]
+    import subprocess
+
+    result = run_command(cmd, check=False, stdout=subprocess.DEVNULL)
+    if result.returncode != 0:
+        report('- Aviso: alguns arquivos não puderam ser pré-compilados.')
+    return result.returncode == 0
+
+def format_size(size: float) -> str:
+    '''Format a byte count for humans.'''
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024:
+            return f'{size:.0f} {unit}' if unit == 'B' else f'{size:.1f} {unit}'
+        size /= 1024
+    return f'{size:.1f} TB'
 
 def extract_version(version_string: str) -> Optional[str]:
     '''
@@ -43,3 +127,34 @@ def is_version_prefix(version: str) -> bool:
         True if it's a prefix (major.minor only)
     '''
     return bool(re.match(r'^\d+\.\d+$', version))
+
+# TOML files already reported as unreadable for lack of a parser
+_toml_warned: set[Path] = set()
+
+def load_toml(path: Path) -> dict:
+    '''
+    Load a TOML file.
+    
+    Args:
+        path: Path to the TOML file
+        
+    Returns:
+        Parsed data, or an empty dict if the file is missing, invalid or
+        no TOML parser is available (tomllib/tomli; a warning is shown)
+    '''
+    # Imported lazily: TOML is only needed when a project or config file exists
+    try:
+        import tomllib
+    except ImportError:  # Python < 3.11
+        try:
+            import tomli as tomllib
+        except ImportError:
+            if path.is_file() and path not in _toml_warned:
+                _toml_warned.add(path)
+                report(f'- Aviso: {path} ignorado; instale "tomli" para ler TOML no Python < 3.11.')
+            return {}
+    try:
+        with open(path, 'rb') as fh:
+            return tomllib.load(fh)
+    except (OSError, ValueError):
+        return {}
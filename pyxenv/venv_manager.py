@@ -1,27 +1,37 @@
 '''Virtual environment management.'''
 
+import json
 import os
-import subprocess
+import time
 from pathlib import Path
 from typing import Optional
 
-from pyxenv.config import ENV_DIR
+from pyxenv import config, metrics
 from pyxenv.exceptions import VenvError
+from pyxenv.locks import FileLock
 from pyxenv.python_manager import PythonManager
-from pyxenv.utils import run_command
+from pyxenv.storage import StorageManager
+from pyxenv.utils import precompile, report, run_command
+
+ACTIVATION_SNAPSHOT = '.pyxenv-activate.json'
 
 
 class VenvManager:
     '''Manages virtual environments.'''
 
     @staticmethod
-    def create(version: str, env_name: Optional[str] = None) -> Path:
+    def create(version: str, env_name: Optional[str] = None, precompile_bytecode: bool = False,
+               invalidation_mode: Optional[str] = None, requirements: Optional[Path] = None) -> Path:
         '''
         Create a virtual environment with specified Python version.
         
         Args:
             version: Python version
             env_name: Environment name (default: "pyxenv-{version}")
+            precompile_bytecode: Compile the environment's bytecode after creation
+            invalidation_mode: compileall invalidation mode (e.g. "unchecked-hash")
+            requirements: Requirements file to install (also synced when the
+                environment already exists)
             
         Returns:
             Path to created environment
@@ -29,26 +39,171 @@ class VenvManager:
         Raises:
             VenvError: If creation fails
         '''
+        # Imported here: hashing is only needed when an environment changes
+        from pyxenv.integrity import IntegrityManager
+
         env_name = env_name or f'pyxenv-{version}'
-        env_path = ENV_DIR / env_name
-        
-        if env_path.exists():
-            print(f'-  Ambiente "{env_name}" já existe.')
+        env_path = config.ENV_DIR / env_name
+
+        with FileLock.for_target(env_path):
+            if env_path.exists():
+                report(f'-  Ambiente "{env_name}" já existe.')
+                if requirements is not None and VenvManager.sync_requirements(env_path, requirements):
+                    IntegrityManager.record(env_path)
+                return env_path
+
+            started = time.perf_counter()
+            try:
+                python_exe = PythonManager.get_executable(version)
+            except Exception as e:
+                raise VenvError(f'Erro ao obter Python {version}: {e}')
+
+            report(f'🔧 Criando ambiente virtual "{env_name}" com Python {version}...')
+
+            try:
+                run_command([python_exe, '-m', 'venv', str(env_path)])
+            except Exception as e:
+                raise VenvError(f'Erro ao criar ambiente: {e}')
+
+            report(f'- Ambiente criado em {env_path}')
+            if requirements is not None:
+                VenvManager.sync_requirements(env_path, requirements)
+            if precompile_bytecode:
+                report(f'- Pré-compilando bytecode de "{env_name}"...')
+                precompile(str(VenvManager.python_path(env_path)), [env_path], invalidation_mode)
+            if env_path.exists():
+                VenvManager.activation_delta(env_name)
+                IntegrityManager.record(env_path)
+            StorageManager.mark_used(env_path)
+            owner = StorageManager.owner(python_exe)
+            if owner is not None:
+                StorageManager.mark_used(owner)
+            metrics.observe('venv_create_seconds', time.perf_counter() - started)
             return env_path
 
-        try:
-            python_exe = PythonManager.get_executable(version)
-        except Exception as e:
-            raise VenvError(f'Erro ao obter Python {version}: {e}')
+    @staticmethod
+    def python_path(env_path: Path) -> Path:
+        '''Get the interpreter path inside an environment.'''
+        if os.name == 'nt':
+            return env_path / 'Scripts' / 'python.exe'
+        return env_path / 'bin' / 'python'
 
-        print(f'🔧 Criando ambiente virtual "{env_name}" com Python {version}...')
+    @staticmethod
+    def sync_requirements(env_path: Path, requirements: Path) -> bool:
+        '''
+        Install a requirements file, skipping pip when nothing changed.
+        
+        The requirements (including files they reference) and the
+        interpreter version are hashed and compared with the stamp of the
+        last successful install. When only plain requirement lines changed,
+        just the added or changed lines are installed and removed projects
+        are uninstalled; otherwise a full "pip install -r" is run. When the
+        wheelhouse was filled for this file and interpreter ("--wheelhouse
+        fetch"), pip installs from it without querying the index.
         
+        Args:
+            env_path: Environment directory
+            requirements: Requirements file
+            
+        Returns:
+            True if pip was run
+            
+        Raises:
+            VenvError: If the file cannot be read or pip fails
+        '''
+        # Imported here: hashing requirements is only needed to sync them
+        from pyxenv import requirements as reqs
+
+        requirements = Path(requirements)
+        python_version = VenvManager.read_config(env_path).get('version')
         try:
-            run_command([python_exe, '-m', 'venv', str(env_path)])
-            print(f'- Ambiente criado em {env_path}')
-            return env_path
+            digest = reqs.fingerprint(requirements, python_version)
+            wanted = reqs.parse(requirements)
+        except OSError as e:
+            raise VenvError(f'Erro ao ler {requirements}: {e}')
+
+        stamp = reqs.read_stamp(env_path)
+        if stamp.get('hash') == digest:
+            report(f'- Dependências de {env_path.name} já atualizadas.')
+            return False
+
+        python = str(VenvManager.python_path(env_path))
+        pip = [python, '-m', 'pip']
+        # Imported here: only requirement syncs need the wheelhouse
+        from pyxenv.wheelhouse import WheelhouseManager
+        options = WheelhouseManager.install_options(requirements, python)
+        if options:
+            report(f'- Instalando a partir do wheelhouse {config.WHEELHOUSE_DIR}')
+        installed = stamp.get('requirements')
+        incremental = (wanted is not None and isinstance(installed, dict)
+                       and stamp.get('python') == python_version)
+        try:
+            if incremental:
+                changed = [line for name, line in wanted.items() if installed.get(name) != line]
+                removed = sorted(set(installed) - set(wanted))
+                if removed:
+                    run_command(pip + ['uninstall', '-y'] + removed)
+                if changed:
+                    run_command(pip + ['install'] + options + changed)
+            else:
+                run_command(pip + ['install'] + options + ['-r', str(requirements)])
         except Exception as e:
-            raise VenvError(f'Erro ao criar ambiente: {e}')
+            raise VenvError(f'Erro ao instalar dependências: {e}')
+
+        reqs.write_stamp(env_path, {'hash': digest, 'python': python_version, 'requirements': wanted})
+        return True
+
+    @staticmethod
+    def relocate(env_path: Path, replacements: dict[str, str]) -> list[Path]:
+        '''
+        Rewrite absolute paths after an environment was moved or copied.
+        
+        Updates pyvenv.cfg, the activation scripts, script shebangs and
+        symlinks in the scripts directory. Binary launchers (Windows .exe
+        scripts) are left untouched.
+        
+        Args:
+            env_path: Environment directory
+            replacements: Mapping of old path prefix to new path prefix
+            
+        Returns:
+            Files and symlinks that were rewritten
+        '''
+        replacements = {old: new for old, new in replacements.items() if old and old != new}
+        if not replacements:
+            return []
+
+        scripts_dir = env_path / ('Scripts' if os.name == 'nt' else 'bin')
+        candidates = [env_path / 'pyvenv.cfg']
+        if scripts_dir.is_dir():
+            candidates += sorted(scripts_dir.iterdir())
+
+        encoded = [(old.encode(), new.encode()) for old, new in replacements.items()]
+        rewritten = []
+        for path in candidates:
+            if path.is_symlink():
+                target = os.readlink(path)
+                for old, new in replacements.items():
+                    if target.startswith(old):
+                        path.unlink()
+                        path.symlink_to(new + target[len(old):])
+                        rewritten.append(path)
+                        break
+                continue
+            if not path.is_file():
+                continue
+            data = path.read_bytes()
+            if b'\0' in data:
+                continue
+            updated = data
+            for old, new in encoded:
+                updated = updated.replace(old, new)
+            if updated != data:
+                mode = path.stat().st_mode
+                path.write_bytes(updated)
+                path.chmod(mode)
+                rewritten.append(path)
+        return rewritten
 
     @staticmethod
     def activate(env_name: str) -> None:
@@ -61,11 +216,19 @@ class VenvManager:
         Raises:
             VenvError: If environment not found or activation fails
         '''
-        env_path = ENV_DIR / env_name
+        env_path = config.ENV_DIR / env_name
         
         if not env_path.exists():
             raise VenvError(f'Ambiente "{env_name}" não encontrado.')
 
+        StorageManager.mark_used(env_path)
+        with FileLock.for_target(env_path, shared=True):
+            VenvManager._spawn_shell(env_name, env_path)
+
+    @staticmethod
+    def _spawn_shell(env_name: str, env_path: Path) -> None:
+        '''Spawn an interactive shell with the environment activated.'''
+        import subprocess
         if os.name == 'nt':
             activate_script = env_path / 'Scripts' / 'activate.bat'
             if not activate_script.exists():
@@ -81,6 +244,141 @@ class VenvManager:
             print(f'- Abrindo shell com ambiente "{env_name}" ativado...')
             subprocess.run(['bash', '--rcfile', str(activate_script)])
 
+    @staticmethod
+    def activation_delta(env_name: str) -> dict:
+        '''
+        Get the variables activating an environment changes.
+        
+        The delta is computed once and cached next to the environment in
+        .pyxenv-activate.json; it is recomputed when the environment was
+        moved (e.g. imported under another name).
+        
+        Args:
+            env_name: Environment name
+            
+        Returns:
+            Mapping with "set" (variables to export), "unset" (variables
+            to remove) and "path" (directory to prepend to PATH)
+            
+        Raises:
+            VenvError: If environment not found
+        '''
+        env_path = config.ENV_DIR / env_name
+        if not env_path.exists():
+            raise VenvError(f'Ambiente "{env_name}" não encontrado.')
+
+        snapshot = env_path / ACTIVATION_SNAPSHOT
+        try:
+            delta = json.loads(snapshot.read_text(encoding='utf-8'))
+            if delta['set']['VIRTUAL_ENV'] == str(env_path) and delta['set']['VIRTUAL_ENV_PROMPT'] == env_name:
+                return delta
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        delta = {
+            'set': {'VIRTUAL_ENV': str(env_path), 'VIRTUAL_ENV_PROMPT': env_name},
+            'unset': ['PYTHONHOME'],
+            'path': str(VenvManager.python_path(env_path).parent),
+        }
+        tmp = snapshot.with_name(f'{snapshot.name}.{os.getpid()}.tmp')
+        try:
+            tmp.write_text(json.dumps(delta, indent=2), encoding='utf-8')
+            os.replace(tmp, snapshot)
+        except OSError:
+            pass
+        return delta
+
+    @staticmethod
+    def activation_env(env_name: str, base: Optional[dict[str, str]] = None) -> dict[str, str]:
+        '''
+        Compute the environment variables of an activated environment.
+        
+        Equivalent to sourcing the activate script, without running a shell.
+        
+        Args:
+            env_name: Environment name
+            base: Variables to start from (default: os.environ)
+            
+        Returns:
+            New environment mapping
+            
+        Raises:
+            VenvError: If environment not found
+        '''
+        delta = VenvManager.activation_delta(env_name)
+        env = dict(os.environ if base is None else base)
+        env.update(delta['set'])
+        env['PATH'] = os.pathsep.join(filter(None, [delta['path'], env.get('PATH', '')]))
+        for key in delta['unset']:
+            env.pop(key, None)
+        return env
+
+    @staticmethod
+    def exec(env_name: str, command: list[str]) -> int:
+        '''
+        Run a command inside an environment without spawning a shell.
+        
+        On POSIX the current process is replaced (execvpe) and this function
+        does not return; on Windows the command runs as a child process.
+        
+        Args:
+            env_name: Environment name
+            command: Command and arguments
+            
+        Returns:
+            Exit code of the command (Windows only)
+            
+        Raises:
+            VenvError: If environment not found or the command cannot be run
+        '''
+        if not command:
+            raise VenvError('Nenhum comando informado.')
+
+        env = VenvManager.activation_env(env_name)
+        env_path = config.ENV_DIR / env_name
+        StorageManager.mark_used(env_path)
+
+        if os.name == 'nt':
+            import subprocess
+            with FileLock.for_target(env_path, shared=True):
+                try:
+                    return subprocess.run(command, env=env).returncode
+                except OSError as e:
+                    raise VenvError(f'Erro ao executar {command[0]}: {e}')
+
+        lock = FileLock.for_target(env_path, shared=True)
+        lock.acquire()
+        lock.inherit()
+        # exec replaces the process before cli.main can flush
+        metrics.flush()
+        try:
+            os.execvpe(command[0], command, env)
+        except OSError as e:
+            lock.release()
+            raise VenvError(f'Erro ao executar {command[0]}: {e}')
+
+    @staticmethod
+    def read_config(env_path: Path) -> dict[str, str]:
+        '''
+        Read the key/value pairs of an environment's pyvenv.cfg.
+        
+        Args:
+            env_path: Environment directory
+            
+        Returns:
+            Mapping of keys (e.g. "home", "version") to values; empty if unreadable
+        '''
+        values = {}
+        try:
+            with open(env_path / 'pyvenv.cfg', encoding='utf-8') as fh:
+                for line in fh:
+                    key, sep, value = line.partition('=')
+                    if sep:
+                        values[key.strip()] = value.strip()
+        except OSError:
+            pass
+        return values
+
     @staticmethod
     def list_all() -> list[str]:
         '''
@@ -89,7 +387,7 @@ class VenvManager:
         Returns:
             List of environment names
         '''
-        if not ENV_DIR.exists():
+        if not config.ENV_DIR.exists():
             return []
         
-        return [env.name for env in ENV_DIR.iterdir() if env.is_dir()]
+        return [env.name for env in config.ENV_DIR.iterdir() if env.is_dir() and not env.name.startswith('.')]
@@ -0,0 +1,318 @@
+'''Python version model, specifiers and interpreter index.'''
+
+import bisect
+import re
+import sys
+from typing import Iterable, Iterator, Optional
+
+from pyxenv.exceptions import VersionError
+
+_VERSION_RE = re.compile(
+    r'^(?P<impl>[a-z]+)?'
+    r'(?P<release>\d+(?:\.\d+)*)'
+    r'(?:(?P<phase>a|b|rc)(?P<serial>\d+))?'
+    r'(?P<variant>t?d?)$'
+)
+_CLAUSE_RE = re.compile(r'^(?P<op>~=|==|!=|>=|<=|>|<)?\s*(?P<version>[^\s]+)$')
+
+_VARIANT_RE = re.compile(r'^(?P<base>.*?\d)(?P<variant>t?d?)$')
+
+# Build variant suffixes, as in "python3.13t" and the "cp313td" ABI tag
+VARIANTS = {'t': 'free-threaded', 'd': 'debug'}
+
+_IMPLEMENTATIONS = {'': 'cpython', 'python': 'cpython', 'cpython': 'cpython', 'pypy': 'pypy'}
+_PHASES = {'a': 0, 'b': 1, 'rc': 2}
+_MAX = sys.maxsize
+
+
+class Version:
+    '''A parsed Python version such as "3.13.0rc1", "3.14t" or "pypy3.10".'''
+
+    __slots__ = ('implementation', 'release', 'pre', 'variant')
+
+    def __init__(self, release: tuple[int, ...], pre: Optional[tuple[str, int]] = None,
+                 implementation: str = 'cpython', variant: str = ''):
+        self.implementation = implementation
+        self.release = release
+        self.pre = pre
+        self.variant = variant
+
+    @classmethod
+    def parse(cls, text: str) -> 'Version':
+        '''
+        Parse a version string.
+
+        Args:
+            text: Version like "3.11", "3.13.0rc1", "3.14t" or "pypy3.10"
+
+        Returns:
+            Version instance
+
+        Raises:
+            VersionError: If the string is not a valid version
+        '''
+        match = _VERSION_RE.match(text.strip().lower())
+        if not match or match.group('impl') not in (None, *_IMPLEMENTATIONS):
+            raise VersionError(f'Versão inválida: {text!r}')
+        pre = (match.group('phase'), int(match.group('serial'))) if match.group('phase') else None
+        return cls(
+            release=tuple(int(part) for part in match.group('release').split('.')),
+            pre=pre,
+            implementation=_IMPLEMENTATIONS[match.group('impl') or ''],
+            variant=match.group('variant'),
+        )
+
+    @property
+    def is_prerelease(self) -> bool:
+        '''True for alpha, beta and release candidate versions.'''
+        return self.pre is not None
+
+    @property
+    def free_threaded(self) -> bool:
+        '''True for free-threaded (no-GIL) builds.'''
+        return 't' in self.variant
+
+    def release_key(self) -> tuple:
+        '''Sort key of the release and pre-release parts (3.13 == 3.13.0).'''
+        release = self.release + (0,) * (3 - len(self.release))
+        pre = (_PHASES[self.pre[0]], self.pre[1]) if self.pre else (_MAX, 0)
+        return (release, pre)
+
+    def sort_key(self) -> tuple:
+        '''Sort key grouping by implementation and variant, then by release.'''
+        return (self.implementation, self.variant) + self.release_key()
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.sort_key() == other.sort_key()
+
+    def __lt__(self, other: 'Version') -> bool:
+        return self.sort_key() < other.sort_key()
+
+    def __hash__(self) -> int:
+        return hash(self.sort_key())
+
+    def __str__(self) -> str:
+        impl = '' if self.implementation == 'cpython' else self.implementation
+        pre = f'{self.pre[0]}{self.pre[1]}' if self.pre else ''
+        return f'{impl}{".".join(map(str, self.release))}{pre}{self.variant}'
+
+    def __repr__(self) -> str:
+        return f'Version({str(self)!r})'
+
+
+def split_variant(text: str) -> tuple[str, str]:
+    '''
+    Split a version string into its base and build variant.
+
+    Args:
+        text: Version like "3.13t", "3.13.1td" or "3.12"
+
+    Returns:
+        Tuple (base, variant), e.g. ("3.13", "t")
+    '''
+    match = _VARIANT_RE.match(text.strip())
+    if not match:
+        return text, ''
+    return match.group('base'), match.group('variant')
+
+
+def executable_name(version: Version, windows: bool = False) -> str:
+    '''
+    Get the interpreter file name of a CPython build variant.
+
+    Windows installers put the variant binaries next to "python.exe":
+    "python3.13t.exe" (free-threaded), "python_d.exe" (debug) and
+    "python3.13t_d.exe".
+
+    Args:
+        version: Version with its variant
+        windows: Windows naming
+
+    Returns:
+        File name, e.g. "python3.13t" or "python.exe"
+    '''
+    minor = '.'.join(map(str, version.release[:2]))
+    if not windows:
+        return f'python{minor}{version.variant}' if version.variant else 'python'
+    if 't' in version.variant:
+        return f'python{minor}t{"_d" if "d" in version.variant else ""}.exe'
+    return 'python_d.exe' if version.variant == 'd' else 'python.exe'
+
+
+def version_key(text: str) -> tuple:
+    '''
+    Sort key for a version string that never raises.
+
+    Unparseable strings sort before every valid version.
+
+    Args:
+        text: Version string
+
+    Returns:
+        Tuple usable as a sort key
+    '''
+    try:
+        return (1,) + Version.parse(text).release_key()
+    except VersionError:
+        return (0,)
+
+
+class Specifier:
+    '''A single version clause such as ">=3.10", "3.12" or "!=3.11.2".'''
+
+    __slots__ = ('operator', 'version')
+
+    def __init__(self, operator: str, version: Version):
+        self.operator = operator
+        self.version = version
+
+    def _prefix_match(self, candidate: Version) -> bool:
+        '''Match "3.12" against 3.12, 3.12.4, 3.12.0rc1, ...'''
+        size = len(self.version.release)
+        if candidate.release[:size] != self.version.release:
+            return False
+        return self.version.pre is None or candidate.pre == self.version.pre
+
+    def contains(self, candidate: Version) -> bool:
+        '''Check whether candidate satisfies this clause (implementation/variant excluded).'''
+        op = self.operator
+        if op == '':
+            return self._prefix_match(candidate)
+        if op == '==':
+            return candidate.release_key() == self.version.release_key()
+        if op == '!=':
+            return candidate.release_key() != self.version.release_key()
+        if op == '~=':
+            prefix = Specifier('', Version(self.version.release[:-1]))
+            return candidate.release_key() >= self.version.release_key() and prefix.contains(candidate)
+        key, bound = candidate.release_key(), self.version.release_key()
+        return {'>=': key >= bound, '<=': key <= bound, '>': key > bound, '<': key < bound}[op]
+
+    def upper_bound(self) -> Optional[tuple]:
+        '''Highest release key this clause can match, or None if unbounded.'''
+        if self.operator in ('', '~='):
+            release = self.version.release if self.operator == '' else self.version.release[:-1]
+            if self.version.pre and self.operator == '':
+                return self.version.release_key()
+            return (release + (_MAX,) * (3 - len(release)), (_MAX, _MAX))
+        if self.operator in ('==', '<=', '<'):
+            return self.version.release_key()
+        return None
+
+    def __str__(self) -> str:
+        return f'{self.operator}{self.version}'
+
+
+class SpecifierSet:
+    '''A comma-separated set of clauses such as ">=3.10,<3.13" or "pypy3.10".'''
+
+    __slots__ = ('clauses', 'implementation', 'variant', 'allows_prereleases')
+
+    def __init__(self, clauses: list[Specifier], implementation: str = 'cpython', variant: str = ''):
+        self.clauses = clauses
+        self.implementation = implementation
+        self.variant = variant
+        self.allows_prereleases = any(c.version.pre for c in clauses)
+
+    @classmethod
+    def parse(cls, text: str) -> 'SpecifierSet':
+        '''
+        Parse a specifier string.
+
+        Args:
+            text: Specifier like "3.12", ">=3.10,<3.13", "pypy3.10" or "3.14t"
+
+        Returns:
+            SpecifierSet instance
+
+        Raises:
+            VersionError: If the specifier is invalid or mixes implementations/variants
+        '''
+        clauses = []
+        for part in filter(None, (p.strip() for p in text.split(','))):
+            match = _CLAUSE_RE.match(part)
+            if not match:
+                raise VersionError(f'Especificador inválido: {text!r}')
+            clauses.append(Specifier(match.group('op') or '', Version.parse(match.group('version'))))
+        if not clauses:
+            raise VersionError(f'Especificador vazio: {text!r}')
+
+        identities = {(c.version.implementation, c.version.variant) for c in clauses}
+        if len(identities) > 1:
+            raise VersionError(f'Especificador mistura implementações ou variantes: {text!r}')
+        implementation, variant = identities.pop()
+        return cls(clauses, implementation, variant)
+
+    def contains(self, candidate: Version) -> bool:
+        '''Check whether a version satisfies every clause.'''
+        return (
+            candidate.implementation == self.implementation
+            and candidate.variant == self.variant
+            and all(clause.contains(candidate) for clause in self.clauses)
+        )
+
+    def upper_bound(self) -> tuple:
+        '''Highest release key any matching version can have.'''
+        bounds = [b for b in (c.upper_bound() for c in self.clauses) if b is not None]
+        return min(bounds) if bounds else ((_MAX, _MAX, _MAX), (_MAX, _MAX))
+
+    def __str__(self) -> str:
+        return ','.join(map(str, self.clauses))
+
+
+class VersionIndex:
+    '''Presorted index of interpreters for fast specifier matching.'''
+
+    __slots__ = ('_keys', '_entries')
+
+    def __init__(self, entries: Iterable[tuple[Version, str, str]]):
+        '''
+        Build the index.
+
+        Args:
+            entries: Tuples of (version, path, source); earlier entries win ties
+        '''
+        ordered = sorted(
+            enumerate(entries),
+            key=lambda item: (item[1][0].sort_key(), -item[0]),
+        )
+        self._entries = [entry for _, entry in ordered]
+        self._keys = [entry[0].sort_key() for entry in self._entries]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[tuple[Version, str, str]]:
+        return iter(self._entries)
+
+    def best(self, spec: SpecifierSet) -> Optional[tuple[Version, str, str]]:
+        '''
+        Find the highest version matching a specifier.
+
+        Final releases are preferred over pre-releases unless the specifier
+        names a pre-release explicitly.
+
+        Args:
+            spec: Specifier to match
+
+        Returns:
+            Tuple (version, path, source) or None
+        '''
+        group = (spec.implementation, spec.variant)
+        upper = group + spec.upper_bound()
+        position = bisect.bisect_right(self._keys, upper)
+
+        prerelease = None
+        for index in range(position - 1, -1, -1):
+            version = self._entries[index][0]
+            if (version.implementation, version.variant) != group:
+                break
+            if not spec.contains(version):
+                continue
+            if version.is_prerelease and not spec.allows_prereleases:
+                prerelease = prerelease or self._entries[index]
+                continue
+            return self._entries[index]
+        return prerelease
@@ -0,0 +1,153 @@
+'''Shared wheelhouse: wheels prefetched per interpreter for offline installs.'''
+
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from pyxenv import config
+from pyxenv import requirements as reqs
+from pyxenv.exceptions import DownloadError
+from pyxenv.locks import FileLock
+from pyxenv.python_manager import PythonManager
+from pyxenv.registry import InterpreterRegistry
+from pyxenv.utils import run_command
+
+MANIFEST_FILE = '.pyxenv-wheelhouse.json'
+
+
+def wheel_tag(python_exe: str) -> Optional[str]:
+    '''
+    Get the ABI and platform tag wheels must match for an interpreter.
+
+    Args:
+        python_exe: Interpreter path
+
+    Returns:
+        Tag like "cp312-linux_x86_64", or None if it cannot be fingerprinted
+    '''
+    info = InterpreterRegistry.get(python_exe)
+    InterpreterRegistry.save()
+    if not info or info.get('partial'):
+        return None
+    return f"{info['abi_tag']}-{info['platform_tag']}"
+
+
+class WheelhouseManager:
+    '''Fills WHEELHOUSE_DIR and tells environment installs when it is complete.'''
+
+    @staticmethod
+    def _read_manifest() -> dict:
+        '''Map requirement digests to the wheel tags fetched for them.'''
+        try:
+            data = json.loads((config.WHEELHOUSE_DIR / MANIFEST_FILE).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    @staticmethod
+    def _record(digest: str, tags: list[str]) -> None:
+        '''Merge newly fetched tags into the manifest.'''
+        with FileLock(config.LOCK_DIR / 'wheelhouse.lock'):
+            manifest = WheelhouseManager._read_manifest()
+            manifest[digest] = sorted(set(manifest.get(digest, [])) | set(tags))
+            target = config.WHEELHOUSE_DIR / MANIFEST_FILE
+            tmp = target.with_name(f'{target.name}.{os.getpid()}.tmp')
+            tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding='utf-8')
+            os.replace(tmp, target)
+
+    @staticmethod
+    def _download(python_exe: str, requirements: Path, index_url: Optional[str]) -> int:
+        '''
+        Run "pip download" with the target interpreter, so pip selects wheels
+        for its own tags, then move the files into the wheelhouse.
+        '''
+        wheelhouse = config.WHEELHOUSE_DIR
+        # Each interpreter downloads into its own staging directory: pure
+        # wheels are shared, and concurrent pips must not write the same file
+        staging = Path(tempfile.mkdtemp(prefix='.fetch-', dir=wheelhouse))
+        cmd = [
+            python_exe, '-m', 'pip', 'download', '--disable-pip-version-check', '--prefer-binary',
+            '-r', str(requirements), '-d', str(staging), '--find-links', str(wheelhouse),
+        ]
+        if index_url:
+            cmd += ['--index-url', index_url]
+        try:
+            result = run_command(cmd, check=False, capture_output=True, text=True)
+            if result.returncode != 0:
+                details = '\n'.join((result.stderr or '').strip().splitlines()[-5:])
+                raise DownloadError(f'pip download falhou para {python_exe}:\n{details}')
+            files = list(staging.iterdir())
+            for path in files:
+                os.replace(path, wheelhouse / path.name)
+            return len(files)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    @staticmethod
+    def fetch(requirements: Path, versions: list[str], index_url: Optional[str] = None,
+              max_workers: Optional[int] = None) -> dict[str, int]:
+        '''
+        Download the distributions a requirements file needs for each interpreter.
+
+        Interpreters are handled concurrently, one "pip download" each.
+
+        Args:
+            requirements: Requirements file
+            versions: Python versions or specifiers (e.g. ["3.11", "3.12"])
+            index_url: Package index (default: pip's configuration)
+            max_workers: Thread pool size (default: the "workers" setting, or one per version)
+
+        Returns:
+            Mapping of version to the number of files fetched
+
+        Raises:
+            DownloadError: If pip fails for any interpreter (the others are kept)
+        '''
+        requirements = Path(requirements)
+        digest = reqs.fingerprint(requirements, None)
+        executables = {version: PythonManager.get_executable(version) for version in versions}
+        config.WHEELHOUSE_DIR.mkdir(parents=True, exist_ok=True)
+
+        workers = max_workers or config.get_config().workers or len(executables) or 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                version: pool.submit(WheelhouseManager._download, exe, requirements, index_url)
+                for version, exe in executables.items()
+            }
+        counts, errors, tags = {}, [], []
+        for version, future in futures.items():
+            try:
+                counts[version] = future.result()
+            except DownloadError as e:
+                errors.append(str(e))
+                continue
+            tag = wheel_tag(executables[version])
+            if tag:
+                tags.append(tag)
+        if tags:
+            WheelhouseManager._record(digest, tags)
+        if errors:
+            raise DownloadError('\n'.join(errors))
+        return counts
+
+    @staticmethod
+    def install_options(requirements: Path, python_exe: str) -> list[str]:
+        '''
+        Get pip options that install from the wheelhouse, if it was filled for
+        this requirements file and interpreter.
+
+        Args:
+            requirements: Requirements file
+            python_exe: Interpreter pip runs with
+
+        Returns:
+            ["--no-index", "--find-links", WHEELHOUSE_DIR], or [] to use the index
+        '''
+        tags = WheelhouseManager._read_manifest().get(reqs.fingerprint(Path(requirements), None))
+        if not tags or wheel_tag(python_exe) not in tags:
+            return []
+        return ['--no-index', '--find-links', str(config.WHEELHOUSE_DIR)]
@@ -31,7 +31,7 @@ setup(
         "venv",
         "development-tools",
     ],
-    packages=find_packages(exclude=["tests", "tests.*", "docs", "examples"]),
+    packages=find_packages(exclude=["tests", "tests.*", "benchmarks", "benchmarks.*", "docs", "examples"]),
     include_package_data=True,
     entry_points={
         "console_scripts": [
@@ -39,7 +39,12 @@ setup(
         ],
     },
     python_requires=">=3.8",
-    install_requires=[],
+    install_requires=[
+        'tomli; python_version < "3.11"',
+    ],
+    extras_require={
+        "zstd": ["zstandard"],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         'Intended Audience :: Developers',
@@ -7,19 +7,51 @@ from unittest.mock import Mock, patch
 import pytest
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path):
+    '''Keep the interpreter registry, project cache, download log and metrics out of the real home directory.'''
+    from pyxenv import metrics, project
+    from pyxenv.registry import InterpreterRegistry
+
+    InterpreterRegistry.clear()
+    project.clear_cache()
+    metrics.reset()
+    with patch('pyxenv.config.pyxenv_HOME', tmp_path / '.pyxenv'), \
+         patch('pyxenv.config.LOCK_DIR', tmp_path / '.pyxenv' / 'locks'), \
+         patch('pyxenv.config.CACHE_DIR', tmp_path / '.pyxenv' / 'cache'), \
+         patch('pyxenv.config.LOG_DIR', tmp_path / '.pyxenv' / 'logs'), \
+         patch('pyxenv.config.SHARED_STORE', None):
+        yield
+    InterpreterRegistry.clear()
+    project.clear_cache()
+    metrics.reset()
+
+
 @pytest.fixture
 def temp_pyxenv_home(tmp_path):
     '''Create a temporary pyxenv home directory.'''
     pyxenv_home = tmp_path / '.pyxenv'
     pythons_dir = pyxenv_home / 'pythons'
     envs_dir = pyxenv_home / 'envs'
+    shims_dir = pyxenv_home / 'shims'
+    locks_dir = pyxenv_home / 'locks'
+    mirror_dir = pyxenv_home / 'mirror'
+    run_dir = pyxenv_home / 'run'
+    wheelhouse_dir = pyxenv_home / 'wheelhouse'
+    store_dir = pyxenv_home / 'store'
     
     pythons_dir.mkdir(parents=True)
     envs_dir.mkdir(parents=True)
     
     with patch('pyxenv.config.pyxenv_HOME', pyxenv_home), \
          patch('pyxenv.config.PYTHON_DIR', pythons_dir), \
-         patch('pyxenv.config.ENV_DIR', envs_dir):
+         patch('pyxenv.config.ENV_DIR', envs_dir), \
+         patch('pyxenv.config.SHIM_DIR', shims_dir), \
+         patch('pyxenv.config.LOCK_DIR', locks_dir), \
+         patch('pyxenv.config.MIRROR_DIR', mirror_dir), \
+         patch('pyxenv.config.RUN_DIR', run_dir), \
+         patch('pyxenv.config.WHEELHOUSE_DIR', wheelhouse_dir), \
+         patch('pyxenv.config.STORE_DIR', store_dir):
         yield pyxenv_home
 
 
@@ -39,6 +71,6 @@ def mock_subprocess_run():
 def mock_urllib():
     '''Mock urllib for download tests.'''
     with patch('urllib.request.urlopen') as mock_open, \
-         patch('urllib.request.urlretrieve') as mock_retrieve:
+         patch('pyxenv.installer.retrieve') as mock_retrieve:
         yield mock_open, mock_retrieve
 
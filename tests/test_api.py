@@ -0,0 +1,87 @@
+'''Tests for pyxenv.api module.'''
+
+import asyncio
+import sys
+import venv
+from unittest.mock import patch
+
+import pytest
+
+from pyxenv import api, config
+from pyxenv.api import Environment, InstallResult, Interpreter
+from pyxenv.exceptions import PythonNotFoundError
+
+
+def _make_venv(cmd, check=True, **kwargs):
+    '''Stand in for "python -m venv" without installing pip.'''
+    venv.create(cmd[-1], with_pip=False)
+
+
+class TestAPI:
+    '''Tests for the programmatic API.'''
+
+    def test_dataclasses_are_slotted(self):
+        '''Test results carry no per-instance dict.'''
+        interpreter = Interpreter('3.12.1', '/usr/bin/python3.12', 'global')
+
+        assert not hasattr(interpreter, '__dict__')
+        assert interpreter == Interpreter('3.12.1', '/usr/bin/python3.12', 'global')
+
+    def test_list_interpreters(self):
+        '''Test listings are returned as Interpreter objects.'''
+        found = [('3.12.1', '/p/3.12/bin/python', 'pyxenv'), ('3.11.9', '/usr/bin/python3.11', 'global')]
+        with patch('pyxenv.api.PythonManager.find_versions', return_value=found):
+            interpreters = api.list_interpreters(list_all=True)
+
+        assert interpreters[0] == Interpreter('3.12.1', '/p/3.12/bin/python', 'pyxenv')
+        assert [i.source for i in interpreters] == ['pyxenv', 'global']
+
+    def test_resolve(self, temp_pyxenv_home):
+        '''Test resolution reports the exact version of the interpreter.'''
+        with patch('pyxenv.api.PythonManager.get_executable', return_value=sys.executable):
+            interpreter = api.resolve('3')
+
+        assert interpreter.version.startswith('%d.%d.%d' % sys.version_info[:3])
+        assert interpreter.path == sys.executable
+        assert interpreter.source == 'global'
+
+    def test_resolve_shared_store(self, temp_pyxenv_home):
+        '''Test interpreters copied from the shared store are reported as such.'''
+        path = str(config.STORE_DIR / 'abc123' / 'bin' / 'python')
+        with patch('pyxenv.api.PythonManager.get_executable', return_value=path), \
+             patch('pyxenv.api.PythonManager.fingerprint', return_value=None):
+            interpreter = api.resolve('3.12')
+
+        assert interpreter.source == 'shared'
+
+    def test_resolve_not_found(self, temp_pyxenv_home):
+        '''Test resolution errors are raised, not printed.'''
+        with patch('pyxenv.python_manager.PythonManager._which', return_value=None):
+            with pytest.raises(PythonNotFoundError):
+                api.resolve('2.1')
+
+    def test_install_reports_through_callback(self, temp_pyxenv_home, capsys):
+        '''Test an already installed version is reported to the callback.'''
+        (config.PYTHON_DIR / '3.12').mkdir(parents=True)
+        messages = []
+
+        result = api.install('3.12', progress=messages.append)
+
+        assert result == InstallResult('3.12', config.PYTHON_DIR / '3.12', False)
+        assert any('já instalado' in message for message in messages)
+        assert capsys.readouterr().out == ''
+
+    def test_create_environment_async(self, temp_pyxenv_home, capsys):
+        '''Test the async variant creates the environment and keeps the callback.'''
+        messages = []
+        with patch('pyxenv.venv_manager.PythonManager.get_executable', return_value=sys.executable), \
+             patch('pyxenv.venv_manager.run_command', side_effect=_make_venv):
+            env = asyncio.run(api.acreate_environment('svc', '3', progress=messages.append))
+
+        assert isinstance(env, Environment)
+        assert env.path == config.ENV_DIR / 'svc'
+        assert env.python.exists()
+        assert env.python_version and env.python_version.startswith('%d.%d' % sys.version_info[:2])
+        assert any('Criando ambiente virtual "svc"' in message for message in messages)
+        assert capsys.readouterr().out == ''
+        assert api.list_environments() == [env]
@@ -0,0 +1,95 @@
+'''Tests for pyxenv.archive module.'''
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from pyxenv import archive
+from pyxenv.archive import EnvArchiver
+from pyxenv.exceptions import VenvError
+
+pytestmark = pytest.mark.skipif(os.name == 'nt', reason='Fake environments use POSIX layout')
+
+
+def make_env(home, name):
+    '''Create a fake environment with absolute paths baked in.'''
+    env = home / 'envs' / name
+    python_home = home / 'pythons' / '3.11.5' / 'bin'
+    python_home.mkdir(parents=True)
+    (python_home / 'python').touch()
+    (env / 'bin').mkdir(parents=True)
+    (env / 'lib').mkdir()
+    (env / 'pyvenv.cfg').write_text(
+        f'home = {python_home}\ncommand = {python_home}/python -m venv {env}\n')
+    (env / 'bin' / 'activate').write_text(f"VIRTUAL_ENV='{env}'\nexport VIRTUAL_ENV\n")
+    (env / 'bin' / 'pip').write_text(f'#!{env}/bin/python\nimport pip\n')
+    (env / 'bin' / 'pip').chmod(0o755)
+    (env / 'bin' / 'python').symlink_to(python_home / 'python')
+    (env / 'lib' / 'a.txt').write_text('shared')
+    os.link(env / 'lib' / 'a.txt', env / 'lib' / 'b.txt')
+    return env
+
+
+class TestEnvArchiver:
+    '''Tests for EnvArchiver class.'''
+
+    @pytest.mark.parametrize('filename', [
+        'env.tar.gz',
+        'env.tar',
+        pytest.param('env.tar.zst', marks=pytest.mark.skipif(
+            archive.zstandard is None, reason='zstandard not installed')),
+    ])
+    def test_roundtrip_relocates(self, temp_pyxenv_home, tmp_path, filename):
+        '''Test export on one home and import on another.'''
+        old_env = make_env(temp_pyxenv_home, 'myenv')
+        output = EnvArchiver.export('myenv', tmp_path / filename)
+        assert output.exists()
+
+        new_home = tmp_path / 'other' / '.pyxenv'
+        with patch('pyxenv.config.ENV_DIR', new_home / 'envs'), \
+             patch('pyxenv.config.PYTHON_DIR', new_home / 'pythons'), \
+             patch('pyxenv.config.LOCK_DIR', new_home / 'locks'):
+            env = EnvArchiver.import_archive(output, 'copy')
+
+        assert env == new_home / 'envs' / 'copy'
+        cfg = (env / 'pyvenv.cfg').read_text()
+        assert str(old_env) not in cfg
+        assert f'home = {new_home / "pythons" / "3.11.5" / "bin"}' in cfg
+        assert f"VIRTUAL_ENV='{env}'" in (env / 'bin' / 'activate').read_text()
+        assert (env / 'bin' / 'pip').read_text().startswith(f'#!{env}/bin/python')
+        assert os.access(env / 'bin' / 'pip', os.X_OK)
+        assert os.readlink(env / 'bin' / 'python') == str(new_home / 'pythons' / '3.11.5' / 'bin' / 'python')
+        assert (env / 'lib' / 'a.txt').stat().st_ino == (env / 'lib' / 'b.txt').stat().st_ino
+        assert not [p for p in (new_home / 'envs').iterdir() if p.name.startswith('.')]
+
+    def test_zstd_falls_back_to_gzip(self, temp_pyxenv_home, tmp_path):
+        '''Test gzip is used when zstandard is unavailable.'''
+        make_env(temp_pyxenv_home, 'myenv')
+        with patch.object(archive, 'zstandard', None):
+            output = EnvArchiver.export('myenv', tmp_path / 'env.tar.zst')
+
+        assert output.name == 'env.tar.gz'
+        assert output.read_bytes()[:2] == b'\x1f\x8b'
+
+    def test_export_missing_env(self, temp_pyxenv_home, tmp_path):
+        '''Test exporting an unknown environment.'''
+        with pytest.raises(VenvError, match='não encontrado'):
+            EnvArchiver.export('nope', tmp_path / 'env.tar')
+
+    def test_import_existing_env(self, temp_pyxenv_home, tmp_path):
+        '''Test importing over an existing environment fails cleanly.'''
+        make_env(temp_pyxenv_home, 'myenv')
+        output = EnvArchiver.export('myenv', tmp_path / 'env.tar')
+
+        with pytest.raises(VenvError, match='já existe'):
+            EnvArchiver.import_archive(output)
+        assert sorted(p.name for p in (temp_pyxenv_home / 'envs').iterdir()) == ['myenv']
+
+    def test_import_invalid_archive(self, temp_pyxenv_home, tmp_path):
+        '''Test rejecting files that are not environment archives.'''
+        bogus = tmp_path / 'bogus.tar'
+        bogus.write_bytes(b'not a tar file' * 100)
+
+        with pytest.raises(VenvError, match='inválido'):
+            EnvArchiver.import_archive(bogus)
@@ -0,0 +1,43 @@
+'''Tests for the benchmark runner in benchmarks/.'''
+
+import os
+
+import pytest
+
+from benchmarks.bench_pyxenv import build_home, compare, fake_versions, measure
+
+
+class TestBenchmarks:
+    '''Tests for benchmark helpers.'''
+
+    def test_fake_versions_unique(self):
+        '''Test that generated versions are distinct.'''
+        versions = fake_versions(30)
+        assert len(set(versions)) == 30
+
+    @pytest.mark.skipif(os.name == 'nt', reason='Fake interpreters are POSIX shell stubs')
+    def test_build_home(self, tmp_path):
+        '''Test building a synthetic home.'''
+        home = build_home(tmp_path, interpreters=3, envs=5, path_length=2)
+
+        assert len(list(home['python_dir'].iterdir())) == 3
+        assert len(list(home['env_dir'].iterdir())) == 5
+        assert home['path'].count(os.pathsep) >= 2
+        for version in home['versions']:
+            assert os.access(home['python_dir'] / version / 'bin' / 'python', os.X_OK)
+
+    def test_measure(self):
+        '''Test timing statistics.'''
+        stats = measure(lambda: None, repeat=3)
+        assert stats['runs'] == 3
+        assert stats['min'] <= stats['median'] <= stats['max']
+
+    def test_compare_flags_regressions(self):
+        '''Test regression detection against a baseline.'''
+        baseline = {'fast': {'median': 1.0}, 'slow': {'median': 1.0}}
+        results = {'fast': {'median': 1.1}, 'slow': {'median': 1.5}, 'new': {'median': 9.0}}
+
+        regressions = compare(results, baseline, threshold=0.2)
+
+        assert len(regressions) == 1
+        assert regressions[0].startswith('slow')
@@ -1,11 +1,14 @@
 '''Tests for pyxenv.cli module.'''
 
+import json
 import sys
+from pathlib import Path
 from io import StringIO
 from unittest.mock import patch, Mock
 
 import pytest
 
+from pyxenv import config, metrics
 from pyxenv.cli import main
 
 
@@ -113,3 +116,253 @@ class TestCLI:
             assert exc.value.code == 130
             captured = capsys.readouterr()
             assert 'cancelada' in captured.out
+
+    def test_run_uses_project_version(self):
+        '''Test "run" resolves the version pinned by the project.'''
+        with patch('sys.argv', ['pyxenv', 'run', 'script.py']), \
+             patch('pyxenv.cli.find_project_version', return_value='3.12'), \
+             patch('pyxenv.python_manager.PythonManager.get_executable',
+                   return_value='/usr/bin/python3.12') as mock_get, \
+             patch('pyxenv.cli.run_command') as mock_run:
+
+            main()
+
+            mock_get.assert_called_once_with('3.12')
+            assert mock_run.call_args[0][0] == ['/usr/bin/python3.12', 'script.py']
+
+    def test_gc_dry_run(self, capsys):
+        '''Test --gc with --dry-run only reports.'''
+        with patch('sys.argv', ['pyxenv', '--gc', '--older-than', '7d', '--keep-latest', '2', '--dry-run']), \
+             patch('pyxenv.storage.StorageManager.collect',
+                   return_value=(['/envs/old'], [])) as mock_collect:
+
+            main()
+
+            mock_collect.assert_called_once_with(7 * 86400, 2, dry_run=True)
+        assert 'Seria removido: /envs/old' in capsys.readouterr().out
+
+    def test_create_env_precompile(self):
+        '''Test --precompile and --invalidation-mode are passed to create.'''
+        with patch('sys.argv', ['pyxenv', '3.11', '--create-env', 'myenv',
+                                '--invalidation-mode', 'unchecked-hash']), \
+             patch('pyxenv.venv_manager.VenvManager.create') as mock_create:
+
+            main()
+
+            mock_create.assert_called_once_with(
+                '3.11', 'myenv', precompile_bytecode=True, invalidation_mode='unchecked-hash')
+
+    def test_exec_in_env(self):
+        '''Test "exec" runs a command inside an environment.'''
+        with patch('sys.argv', ['pyxenv', '--env', 'myenv', 'exec', '--', 'pytest', '-q']), \
+             patch('pyxenv.venv_manager.VenvManager.exec', return_value=3) as mock_exec:
+
+            with pytest.raises(SystemExit) as exc:
+                main()
+
+            mock_exec.assert_called_once_with('myenv', ['pytest', '-q'])
+            assert exc.value.code == 3
+
+    def test_print_env(self, capsys):
+        '''Test --print-env prints evaluable exports.'''
+        delta = {'set': {'VIRTUAL_ENV': '/envs/myenv'}, 'unset': ['PYTHONHOME'], 'path': '/envs/myenv/bin'}
+        with patch('sys.argv', ['pyxenv', '--env', 'myenv', '--print-env']), \
+             patch('pyxenv.venv_manager.VenvManager.activation_delta', return_value=delta):
+
+            main()
+
+            out = capsys.readouterr().out
+            assert 'export VIRTUAL_ENV=/envs/myenv' in out
+            assert 'export PYXENV_ACTIVE_ENV=myenv' in out
+
+    def test_shell_hook(self, capsys):
+        '''Test "shell-hook" prints the hook for the requested shell.'''
+        with patch('sys.argv', ['pyxenv', 'shell-hook', 'zsh']):
+            main()
+
+        assert 'add-zsh-hook chpwd _pyxenv_hook' in capsys.readouterr().out
+
+    def test_list_json(self, capsys):
+        '''Test --list --json prints a sorted JSON array.'''
+        with patch('sys.argv', ['pyxenv', '--list', '--json']), \
+             patch('pyxenv.python_manager.PythonManager.find_versions',
+                   return_value=[('3.12.1', '/p/3.12/bin/python', 'pyxenv')]):
+
+            main()
+
+        records = json.loads(capsys.readouterr().out)
+        assert records == [{'version': '3.12.1', 'path': '/p/3.12/bin/python', 'source': 'pyxenv'}]
+
+    def test_list_all_jsonl_streams(self, capsys):
+        '''Test --jsonl prints one record per line as probes finish.'''
+        probes = [('3.11.5', '/usr/bin/python3.11', 'global'), ('3.13.0', '/p/3.13/bin/python', 'pyxenv')]
+        with patch('sys.argv', ['pyxenv', '--list-all', '--jsonl']), \
+             patch('pyxenv.python_manager.PythonManager.iter_versions', return_value=iter(probes)) as mock_iter:
+
+            main()
+
+        mock_iter.assert_called_once_with(list_all=True)
+        lines = capsys.readouterr().out.splitlines()
+        assert [json.loads(line)['version'] for line in lines] == ['3.11.5', '3.13.0']
+
+    def test_list_envs_json(self, capsys, temp_pyxenv_home):
+        '''Test --list-envs --json includes the environment's Python version.'''
+        env_path = temp_pyxenv_home / 'envs' / 'env1'
+        env_path.mkdir(parents=True)
+        (env_path / 'pyvenv.cfg').write_text('home = /usr/bin\nversion = 3.12.1\n')
+
+        with patch('sys.argv', ['pyxenv', '--list-envs', '--json']):
+            main()
+
+        records = json.loads(capsys.readouterr().out)
+        assert records == [{'name': 'env1', 'path': str(env_path), 'python': '3.12.1'}]
+
+    def test_create_env_requirements(self):
+        '''Test --requirements is passed on to environment creation.'''
+        with patch('sys.argv', ['pyxenv', '3.12', '--create-env', 'myenv', '-r', 'req.txt']), \
+             patch('pyxenv.venv_manager.VenvManager.create') as mock_create:
+
+            main()
+
+            mock_create.assert_called_once_with('3.12', 'myenv', requirements=Path('req.txt'))
+
+    def test_verify_damaged_exits_nonzero(self, capsys):
+        '''Test --verify reports damage and fails.'''
+        with patch('sys.argv', ['pyxenv', '--verify', 'myenv', '--deep']), \
+             patch('pyxenv.integrity.IntegrityManager.targets', return_value=[Path('/envs/myenv')]), \
+             patch('pyxenv.integrity.IntegrityManager.verify',
+                   return_value={'missing': ['bin/python'], 'modified': []}) as mock_verify:
+
+            with pytest.raises(SystemExit) as exc:
+                main()
+
+        mock_verify.assert_called_once_with(Path('/envs/myenv'), deep=True)
+        assert exc.value.code == 1
+        assert 'faltando: bin/python' in capsys.readouterr().out
+
+    def test_run_served_by_fork_server(self, temp_pyxenv_home):
+        '''Test scripts go through a running fork server and keep its exit code.'''
+        run_dir = temp_pyxenv_home / 'run'
+        run_dir.mkdir(exist_ok=True)
+        (run_dir / 'forkserver-0123456789ab.sock').touch()
+        with patch('sys.argv', ['pyxenv', '3.12', 'script.py', '--flag']), \
+             patch('pyxenv.python_manager.PythonManager.get_executable', return_value='/usr/bin/python3.12'), \
+             patch('pyxenv.forkserver.ForkServer.run', return_value=5) as mock_serve, \
+             patch('pyxenv.cli.run_command') as mock_run:
+
+            with pytest.raises(SystemExit) as exc:
+                main()
+
+        mock_serve.assert_called_once_with('/usr/bin/python3.12', ['script.py', '--flag'])
+        mock_run.assert_not_called()
+        assert exc.value.code == 5
+
+    def test_run_without_fork_server(self, temp_pyxenv_home):
+        '''Test the fork server client is skipped when no server socket exists.'''
+        with patch('sys.argv', ['pyxenv', '3.12', 'script.py']), \
+             patch('pyxenv.python_manager.PythonManager.get_executable', return_value='/usr/bin/python3.12'), \
+             patch('pyxenv.forkserver.ForkServer.run') as mock_serve, \
+             patch('pyxenv.cli.run_command') as mock_run:
+
+            main()
+
+        mock_serve.assert_not_called()
+        mock_run.assert_called_once_with(['/usr/bin/python3.12', 'script.py'])
+
+    def test_serve_starts_server(self, capsys):
+        '''Test --serve starts a server with the preload modules.'''
+        with patch('sys.argv', ['pyxenv', '--serve', '3.12', '--preload', 'json, decimal']), \
+             patch('pyxenv.python_manager.PythonManager.get_executable', return_value='/usr/bin/python3.12'), \
+             patch('pyxenv.forkserver.ForkServer.start', return_value=1234) as mock_start:
+
+            main()
+
+        mock_start.assert_called_once_with('/usr/bin/python3.12', ('json', 'decimal'))
+        assert 'pid 1234' in capsys.readouterr().out
+
+    def test_serve_stop(self, capsys):
+        '''Test --serve --stop stops the server.'''
+        with patch('sys.argv', ['pyxenv', '--serve', '3.12', '--stop']), \
+             patch('pyxenv.python_manager.PythonManager.get_executable', return_value='/usr/bin/python3.12'), \
+             patch('pyxenv.forkserver.ForkServer.stop', return_value=True) as mock_stop:
+
+            main()
+
+        mock_stop.assert_called_once_with('/usr/bin/python3.12')
+        assert 'encerrado' in capsys.readouterr().out
+
+    def test_limit_rate(self):
+        '''Test --limit-rate sets the process-wide download limit.'''
+        with patch('sys.argv', ['pyxenv', '--mirror', 'sync', '3.12', '--limit-rate', '2M']), \
+             patch('pyxenv.transfer.set_limit') as mock_limit, \
+             patch('pyxenv.mirror.MirrorManager.sync'):
+
+            main()
+
+        mock_limit.assert_called_once_with('2M')
+
+    def test_wheelhouse_fetch(self, capsys):
+        '''Test --wheelhouse fetch prefetches for each requested version.'''
+        with patch('sys.argv', ['pyxenv', '--wheelhouse', 'fetch', '-r', 'req.txt', '--python', '3.11, 3.12']), \
+             patch('pyxenv.wheelhouse.WheelhouseManager.fetch', return_value={'3.11': 4, '3.12': 3}) as mock_fetch:
+
+            main()
+
+        mock_fetch.assert_called_once_with(Path('req.txt'), ['3.11', '3.12'])
+        assert 'Python 3.12: 3 arquivos' in capsys.readouterr().out
+
+    def test_metrics_export(self, capsys):
+        '''Test --metrics prints the counters accumulated by earlier runs.'''
+        with patch('sys.argv', ['pyxenv', '--metrics']):
+            main()
+        capsys.readouterr()
+
+        with patch('sys.argv', ['pyxenv', '--metrics']):
+            main()
+
+        out = capsys.readouterr().out
+        assert '# TYPE pyxenv_invocations_total counter' in out
+        assert 'pyxenv_invocations_total 2' in out
+
+    def test_version_skips_metrics_store(self, capsys):
+        '''Test an invocation that recorded no work does not write the metrics store.'''
+        with patch('sys.argv', ['pyxenv', '--version']):
+            main()
+
+        assert not (config.pyxenv_HOME / metrics.METRICS_FILE).exists()
+
+    def test_optimize_env(self, capsys):
+        '''Test --optimize-env reports startup before and after.'''
+        report = {'before': {'wall_ms': 30.0, 'import_ms': 9.0}, 'after': {'wall_ms': 20.0, 'import_ms': 6.5},
+                  'consolidated': ['lib/a.pth'], 'sys_path': ['/x']}
+        with patch('sys.argv', ['pyxenv', '--optimize-env', 'myenv', '--invalidation-mode', 'unchecked-hash']), \
+             patch('pyxenv.optimize.EnvOptimizer.optimize', return_value=report) as mock_optimize:
+
+            main()
+
+        mock_optimize.assert_called_once_with('myenv', 'unchecked-hash')
+        assert '30.0 ms → 20.0 ms (importações: 9.0 ms → 6.5 ms)' in capsys.readouterr().out
+
+    def test_publish(self):
+        '''Test --publish copies a version into the shared store.'''
+        with patch('sys.argv', ['pyxenv', '--publish', '3.12.4']), \
+             patch('pyxenv.store.SharedStore.publish') as mock_publish:
+
+            main()
+
+        mock_publish.assert_called_once_with('3.12.4')
+
+    @pytest.mark.parametrize('script_args', [
+        ['-r', 'x', '--json', '--stop'],
+        ['--py', '1', '--deep', '--older-than', '2d'],
+        ['--list', '-h'],
+    ])
+    def test_script_arguments_pass_through(self, script_args):
+        '''Test arguments after the script reach it unchanged, even if they look like pyxenv options.'''
+        with patch('sys.argv', ['pyxenv', '3.11', 'script.py'] + script_args), \
+             patch('pyxenv.python_manager.PythonManager.get_executable', return_value='/usr/bin/python3.11'), \
+             patch('pyxenv.cli._run_script') as mock_run:
+
+            main()
+
+        mock_run.assert_called_once_with('/usr/bin/python3.11', ['script.py'] + script_args)
@@ -0,0 +1,77 @@
+'''Tests for pyxenv.clone module.'''
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from pyxenv.clone import EnvCloner, reflink
+from pyxenv.exceptions import VenvError
+
+pytestmark = pytest.mark.skipif(os.name == 'nt', reason='uses POSIX symlinks and layout')
+
+
+@pytest.fixture
+def source_env(temp_pyxenv_home):
+    '''Create a minimal environment layout.'''
+    env_path = temp_pyxenv_home / 'envs' / 'src'
+    (env_path / 'bin').mkdir(parents=True)
+    site = env_path / 'lib' / 'python3.12' / 'site-packages'
+    site.mkdir(parents=True)
+    (env_path / 'pyvenv.cfg').write_text('home = /usr/bin\nversion = 3.12.1\n')
+    (env_path / 'bin' / 'activate').write_text(f'VIRTUAL_ENV="{env_path}"\n')
+    (env_path / 'bin' / 'python').symlink_to('/usr/bin/python3')
+    (site / 'module.py').write_text('VALUE = 1\n')
+    return env_path
+
+
+class TestEnvCloner:
+    '''Tests for EnvCloner class.'''
+
+    def test_clone_relocates(self, temp_pyxenv_home, source_env):
+        '''Test the clone has its own paths and the source is untouched.'''
+        target = EnvCloner.clone('src', 'dst')
+
+        assert target == temp_pyxenv_home / 'envs' / 'dst'
+        assert (target / 'bin' / 'activate').read_text() == f'VIRTUAL_ENV="{target}"\n'
+        assert (source_env / 'bin' / 'activate').read_text() == f'VIRTUAL_ENV="{source_env}"\n'
+        assert os.readlink(target / 'bin' / 'python') == '/usr/bin/python3'
+        assert (target / 'lib' / 'python3.12' / 'site-packages' / 'module.py').read_text() == 'VALUE = 1\n'
+        assert not [p for p in (temp_pyxenv_home / 'envs').iterdir() if p.name.startswith('.clone-')]
+
+    def test_clone_hardlink_fallback(self, temp_pyxenv_home, source_env):
+        '''Test library files are hardlinked but rewritten scripts are not.'''
+        with patch('pyxenv.clone.reflink', return_value=False):
+            target = EnvCloner.clone('src', 'dst', hardlink=True)
+
+        module = 'lib/python3.12/site-packages/module.py'
+        assert os.path.samefile(source_env / module, target / module)
+        assert not os.path.samefile(source_env / 'bin' / 'activate', target / 'bin' / 'activate')
+        assert not os.path.samefile(source_env / 'pyvenv.cfg', target / 'pyvenv.cfg')
+
+    def test_clone_errors(self, temp_pyxenv_home, source_env):
+        '''Test missing sources and existing targets are rejected.'''
+        with pytest.raises(VenvError, match='não encontrado'):
+            EnvCloner.clone('missing', 'dst')
+        with pytest.raises(VenvError, match='já existe'):
+            EnvCloner.clone('src', 'src')
+
+    def test_snapshot_names(self, temp_pyxenv_home, source_env):
+        '''Test snapshots get unique timestamped names.'''
+        with patch('time.strftime', return_value='20260101-120000'):
+            first = EnvCloner.snapshot('src')
+            second = EnvCloner.snapshot('src')
+
+        assert first.name == 'src@20260101-120000'
+        assert second.name == 'src@20260101-120000-1'
+
+
+class TestReflink:
+    '''Tests for reflink function.'''
+
+    def test_unsupported_filesystem(self, tmp_path):
+        '''Test reflink reports failure instead of raising.'''
+        src = tmp_path / 'a'
+        src.write_bytes(b'data')
+        with patch('fcntl.ioctl', side_effect=OSError(95, 'Operation not supported')):
+            assert reflink(str(src), str(tmp_path / 'b')) is False
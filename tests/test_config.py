@@ -0,0 +1,104 @@
+'''Tests for pyxenv.config module.'''
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from pyxenv import config
+
+
+class TestLoad:
+    '''Tests for the layered settings loader.'''
+
+    def test_defaults(self, tmp_path):
+        '''Test directories derive from the home directory.'''
+        settings = config.load({'PYXENV_HOME': str(tmp_path)}, start=str(tmp_path))
+
+        assert settings.home == tmp_path
+        assert settings.python_dir == tmp_path / 'pythons'
+        assert settings.env_dir == tmp_path / 'envs'
+        assert settings.workers is None
+        assert settings.probe_timeout == 5.0
+
+    def test_layers_override_in_order(self, tmp_path):
+        '''Test user file < project file < environment variables.'''
+        (tmp_path / 'config.toml').write_text(
+            'workers = 2\nprobe_timeout = 1.5\nnetwork_timeout = 10\nenv_dir = "/srv/envs"\n')
+        project = tmp_path / 'project'
+        project.mkdir()
+        (project / 'pyproject.toml').write_text('[tool.pyxenv]\npython = "3.12"\nworkers = 4\nprobe_timeout = 2\n')
+
+        environ = {'PYXENV_HOME': str(tmp_path), 'PYXENV_PROBE_TIMEOUT': '3'}
+        settings = config.load(environ, start=str(project))
+
+        assert settings.env_dir == Path('/srv/envs')
+        assert settings.network_timeout == 10.0
+        assert settings.workers == 4
+        assert settings.probe_timeout == 3.0
+
+    def test_project_cannot_redirect_downloads(self, tmp_path):
+        '''Test a project file cannot change locations or URLs.'''
+        (tmp_path / 'pyproject.toml').write_text(
+            '[tool.pyxenv]\npython_ftp_base = "http://evil.example/"\npython_dir = "/tmp/x"\n')
+
+        settings = config.load({'PYXENV_HOME': str(tmp_path)}, start=str(tmp_path))
+
+        assert settings.python_ftp_base == 'https://www.python.org/ftp/python/'
+        assert settings.python_dir == tmp_path / 'pythons'
+
+    def test_environment_lists_and_invalid_values(self, tmp_path):
+        '''Test comma-separated lists are split and invalid numbers ignored.'''
+        environ = {
+            'PYXENV_HOME': str(tmp_path),
+            'PYXENV_SUPPORTED_VERSIONS': '3.12, 3.13',
+            'PYXENV_WORKERS': 'many',
+        }
+        settings = config.load(environ, start=str(tmp_path))
+
+        assert settings.supported_versions == ('3.12', '3.13')
+        assert settings.workers is None
+
+    def test_shared_store(self, tmp_path):
+        '''Test the shared store is opt-in and its local cache lives under home.'''
+        assert config.load({'PYXENV_HOME': str(tmp_path)}, start=str(tmp_path)).shared_store is None
+
+        environ = {'PYXENV_HOME': str(tmp_path), 'PYXENV_SHARED_STORE': '/mnt/pyxenv',
+                   'PYXENV_STORE_CACHE_SIZE': '3'}
+        settings = config.load(environ, start=str(tmp_path))
+
+        assert settings.shared_store == Path('/mnt/pyxenv')
+        assert settings.store_dir == tmp_path / 'store'
+        assert settings.store_cache_size == 3
+
+
+class TestModuleAttributes:
+    '''Tests for the legacy module constants.'''
+
+    def test_legacy_names_follow_settings(self):
+        '''Test config.PYTHON_DIR and friends come from the cached settings.'''
+        settings = config.get_config()
+        assert config.PYTHON_DIR == settings.python_dir
+        assert config.SUPPORTED_VERSIONS == settings.supported_versions
+
+    def test_legacy_names_can_be_patched(self, tmp_path):
+        '''Test patching a constant overrides it only inside the patch.'''
+        original = config.ENV_DIR
+        with patch('pyxenv.config.ENV_DIR', tmp_path):
+            assert config.ENV_DIR == tmp_path
+        assert config.ENV_DIR == original
+
+    def test_unknown_attribute(self):
+        '''Test unknown attributes still raise AttributeError.'''
+        with pytest.raises(AttributeError):
+            config.NOT_A_SETTING
+
+    def test_no_filesystem_work_at_import(self, tmp_path):
+        '''Test importing the CLI creates no directories.'''
+        env = dict(os.environ, PYXENV_HOME=str(tmp_path / 'home'))
+        subprocess.run([sys.executable, '-c', 'import pyxenv.cli'], env=env, check=True)
+
+        assert not (tmp_path / 'home').exists()
@@ -0,0 +1,134 @@
+'''Tests for pyxenv.forkserver module.'''
+
+import json
+import os
+import shutil
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from pyxenv.exceptions import pyxenvError
+from pyxenv.forkserver import ForkServer, supported
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCRIPT = '''
+import json, os, sys
+print(json.dumps({"argv": sys.argv, "cwd": os.getcwd(), "var": os.environ.get("FS_VAR"),
+                  "preloaded": "decimal" in sys.modules, "stdin": sys.stdin.read()}))
+sys.exit(int(sys.argv[1]))
+'''
+
+CLIENT = 'import sys; from pyxenv.forkserver import ForkServer; sys.exit(ForkServer.run(sys.executable, sys.argv[1:]))'
+
+
+@pytest.fixture
+def run_dir(temp_pyxenv_home):
+    '''Use a short run directory: Unix socket paths are length-limited.'''
+    path = Path(tempfile.mkdtemp(prefix='pyxenv-'))
+    with patch('pyxenv.config.RUN_DIR', path):
+        yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.fixture
+def server(run_dir):
+    '''Start a fork server for the running interpreter.'''
+    ForkServer.start(sys.executable, ('decimal',))
+    yield run_dir
+    ForkServer.stop(sys.executable)
+
+
+class TestForkServer:
+    '''Tests for ForkServer class.'''
+
+    def test_run_without_server(self, temp_pyxenv_home, tmp_path):
+        '''Test run leaves the script to the caller when no server is up.'''
+        script = tmp_path / 'script.py'
+        script.write_text('pass\n')
+
+        assert ForkServer.run(sys.executable, [str(script)]) is None
+
+    def test_run_missing_script(self, temp_pyxenv_home):
+        '''Test run does not serve paths that are not files.'''
+        assert ForkServer.run(sys.executable, ['-m', 'json.tool']) is None
+
+    def test_start_unsupported(self, temp_pyxenv_home):
+        '''Test start fails on platforms without fork or Unix sockets.'''
+        with patch('pyxenv.forkserver.supported', return_value=False):
+            with pytest.raises(pyxenvError):
+                ForkServer.start(sys.executable)
+
+    @pytest.mark.skipif(not supported(), reason='requires fork and Unix sockets')
+    def test_start_socket_path_too_long(self, temp_pyxenv_home, tmp_path):
+        '''Test start refuses socket paths the kernel would reject.'''
+        with patch('pyxenv.config.RUN_DIR', tmp_path / ('x' * 100)):
+            with pytest.raises(pyxenvError, match='PYXENV_RUN_DIR'):
+                ForkServer.start(sys.executable)
+
+    @pytest.mark.skipif(not supported(), reason='requires fork and Unix sockets')
+    def test_start_failing_preload(self, run_dir):
+        '''Test a server that cannot import its preload modules reports why.'''
+        with pytest.raises(pyxenvError, match='no_such_module'):
+            ForkServer.start(sys.executable, ('no_such_module',))
+
+        assert not ForkServer.socket_path(sys.executable).exists()
+
+    @pytest.mark.skipif(not supported(), reason='requires fork and Unix sockets')
+    def test_serves_argv_env_cwd_stdio_and_exit_code(self, server, tmp_path):
+        '''Test a served script sees the client's context and returns its exit code.'''
+        work = tmp_path / 'work'
+        work.mkdir()
+        (work / 'script.py').write_text(SCRIPT)
+        env = dict(os.environ, PYXENV_RUN_DIR=str(server), PYTHONPATH=str(ROOT), FS_VAR='42')
+
+        result = subprocess.run([sys.executable, '-c', CLIENT, 'script.py', '3'],
+                                input='hello\n', capture_output=True, text=True, cwd=work, env=env)
+
+        assert result.returncode == 3, result.stderr
+        output = json.loads(result.stdout)
+        assert output == {'argv': ['script.py', '3'], 'cwd': str(work), 'var': '42',
+                          'preloaded': True, 'stdin': 'hello\n'}
+
+    @pytest.mark.skipif(not supported(), reason='requires fork and Unix sockets')
+    def test_socket_and_run_dir_are_private(self, run_dir):
+        '''Test only the owner can reach the server, whatever the umask.'''
+        private = run_dir / 'run'
+        umask = os.umask(0o002)
+        try:
+            with patch('pyxenv.config.RUN_DIR', private):
+                ForkServer.start(sys.executable)
+                try:
+                    sock_mode = ForkServer.socket_path(sys.executable).stat().st_mode
+                finally:
+                    ForkServer.stop(sys.executable)
+        finally:
+            os.umask(umask)
+
+        assert stat.S_IMODE(private.stat().st_mode) == 0o700
+        assert stat.S_IMODE(sock_mode) == 0o600
+
+    @pytest.mark.skipif(not supported(), reason='requires fork and Unix sockets')
+    def test_peer_uid(self):
+        '''Test the server identifies the user of a connecting process.'''
+        from pyxenv.forkserver_main import _peer_uid
+
+        left, right = socket.socketpair(socket.AF_UNIX)
+        with left, right:
+            assert _peer_uid(left) == os.getuid()
+
+    @pytest.mark.skipif(not supported(), reason='requires fork and Unix sockets')
+    def test_start_twice_and_stop(self, server):
+        '''Test a second start is refused and stop removes the socket.'''
+        with pytest.raises(pyxenvError):
+            ForkServer.start(sys.executable)
+
+        assert ForkServer.stop(sys.executable) is True
+        assert not ForkServer.socket_path(sys.executable).exists()
+        assert ForkServer.stop(sys.executable) is False
@@ -87,7 +87,7 @@ class TestPythonInstaller:
 
     def test_download_http_error(self):
         '''Test handling HTTP errors during download.'''
-        with patch('urllib.request.urlretrieve', 
+        with patch('urllib.request.urlopen',
                   side_effect=urllib.error.HTTPError('url', 404, 'Not Found', {}, None)):
             
             with pytest.raises(DownloadError, match='Erro HTTP 404'):
@@ -95,7 +95,7 @@ class TestPythonInstaller:
 
     def test_download_generic_error(self):
         '''Test handling generic download errors.'''
-        with patch('urllib.request.urlretrieve', side_effect=Exception('Network error')):
+        with patch('urllib.request.urlopen', side_effect=Exception('Network error')):
             with pytest.raises(DownloadError, match='Erro ao baixar'):
                 PythonInstaller.download('3.11.5')
 
@@ -131,6 +131,50 @@ class TestPythonInstaller:
             assert result == install_dir
             assert python_exe.exists()
 
+    def test_install_free_threaded_variant(self, temp_pyxenv_home, mock_subprocess_run):
+        '''Test variants install next to the regular build with their binaries.'''
+        installer_path = Path(tempfile.gettempdir()) / 'python-3.13.1-amd64.exe'
+        install_dir = temp_pyxenv_home / 'pythons' / '3.13t'
+
+        def create_exe(*args, **kwargs):
+            install_dir.mkdir(parents=True, exist_ok=True)
+            (install_dir / 'python3.13t.exe').touch()
+            return Mock(returncode=0)
+
+        mock_subprocess_run.side_effect = create_exe
+        with patch.object(PythonInstaller, 'download', return_value=installer_path) as mock_download:
+            result = PythonInstaller.install('3.13t')
+
+        assert result == install_dir
+        mock_download.assert_called_once_with('3.13')
+        assert 'Include_freethreaded=1' in mock_subprocess_run.call_args[0][0]
+
+    def test_install_precompiles_library_paths(self, temp_pyxenv_home, mock_subprocess_run):
+        '''Test precompiling targets the interpreter's library directories only.'''
+        installer_path = Path(tempfile.gettempdir()) / 'python-3.11.5-amd64.exe'
+        install_dir = temp_pyxenv_home / 'pythons' / '3.11.5'
+        lib, site = install_dir / 'Lib', install_dir / 'Lib' / 'site-packages'
+
+        def create_exe(*args, **kwargs):
+            site.mkdir(parents=True, exist_ok=True)
+            (install_dir / 'python.exe').touch()
+            return Mock(returncode=0)
+
+        mock_subprocess_run.side_effect = create_exe
+        info = {'paths': {'stdlib': str(lib), 'platstdlib': str(lib), 'purelib': str(site)}}
+        with patch.object(PythonInstaller, 'download', return_value=installer_path), \
+             patch('pyxenv.python_manager.PythonManager.fingerprint', return_value=info), \
+             patch('pyxenv.installer.precompile') as mock_precompile:
+            PythonInstaller.install('3.11.5', precompile_bytecode=True, invalidation_mode='unchecked-hash')
+
+        mock_precompile.assert_called_once_with(
+            str(install_dir / 'python.exe'), [lib, site], 'unchecked-hash')
+
+    def test_install_free_threaded_requires_313(self, temp_pyxenv_home):
+        '''Test free-threaded builds are refused before 3.13.'''
+        with pytest.raises(InstallationError, match='3.13'):
+            PythonInstaller.install('3.12t')
+
     def test_install_command_failure(self, temp_pyxenv_home):
         '''Test handling installation command failure.'''
         version = '3.11.5'
@@ -0,0 +1,94 @@
+'''Tests for pyxenv.integrity module.'''
+
+import os
+
+import pytest
+
+from pyxenv.integrity import MANIFEST_FILE, IntegrityManager, file_digest
+
+
+@pytest.fixture
+def tree(tmp_path):
+    '''Create a small install tree.'''
+    root = tmp_path / 'install'
+    (root / 'lib' / '__pycache__').mkdir(parents=True)
+    (root / 'lib' / 'os.py').write_text('import sys\n')
+    (root / 'lib' / 'empty.py').write_text('')
+    (root / 'lib' / '__pycache__' / 'os.cpython-312.pyc').write_bytes(b'\0')
+    (root / '.pyxenv-last-used').touch()
+    return root
+
+
+class TestIntegrityManager:
+    '''Tests for IntegrityManager class.'''
+
+    def test_record_skips_volatile_files(self, tree):
+        '''Test bytecode and pyxenv state files are not recorded.'''
+        assert IntegrityManager.record(tree) == 2
+
+        manifest = IntegrityManager.load(tree)
+        assert sorted(manifest['files']) == ['lib/empty.py', 'lib/os.py']
+        assert manifest['files']['lib/os.py'][2] == file_digest(str(tree / 'lib' / 'os.py'))
+
+    def test_scan_writes_nothing(self, tree):
+        '''Test scanning returns the manifest record() would write, without writing it.'''
+        manifest = IntegrityManager.scan(tree)
+
+        assert not (tree / MANIFEST_FILE).exists()
+        IntegrityManager.record(tree)
+        assert IntegrityManager.load(tree) == manifest
+
+    def test_verify_clean(self, tree):
+        '''Test an untouched tree verifies in both modes.'''
+        IntegrityManager.record(tree)
+        (tree / 'lib' / '__pycache__' / 'os.cpython-312.pyc').write_bytes(b'changed')
+
+        assert IntegrityManager.verify(tree) == {'missing': [], 'modified': []}
+        assert IntegrityManager.verify(tree, deep=True) == {'missing': [], 'modified': []}
+
+    def test_verify_detects_damage(self, tree):
+        '''Test missing and clobbered files are reported.'''
+        IntegrityManager.record(tree)
+        (tree / 'lib' / 'empty.py').unlink()
+        target = tree / 'lib' / 'os.py'
+        st = target.stat()
+        target.write_text('import xyz\n')  # same size, same mtime
+        os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        fast = IntegrityManager.verify(tree)
+        deep = IntegrityManager.verify(tree, deep=True)
+
+        assert fast == {'missing': ['lib/empty.py'], 'modified': []}
+        assert deep == {'missing': ['lib/empty.py'], 'modified': ['lib/os.py']}
+
+    def test_verify_process_pool(self, tree):
+        '''Test hashing many files goes through the process pool.'''
+        for i in range(80):
+            (tree / 'lib' / f'm{i}.py').write_text(f'X = {i}\n')
+        IntegrityManager.record(tree, max_workers=2)
+        (tree / 'lib' / 'm7.py').write_text('X = 70\n')
+
+        assert IntegrityManager.verify(tree, deep=True, max_workers=2)['modified'] == ['lib/m7.py']
+
+    def test_update_after_rewrite(self, tree):
+        '''Test rewritten files are re-recorded.'''
+        IntegrityManager.record(tree)
+        (tree / 'lib' / 'os.py').write_text('import sys, os\n')
+
+        IntegrityManager.update(tree, [tree / 'lib' / 'os.py'])
+
+        assert IntegrityManager.verify(tree, deep=True) == {'missing': [], 'modified': []}
+
+    def test_no_manifest(self, tree):
+        '''Test trees without a manifest are reported as such.'''
+        assert not (tree / MANIFEST_FILE).exists()
+        assert IntegrityManager.verify(tree) is None
+
+    def test_targets(self, temp_pyxenv_home):
+        '''Test names resolve to interpreters and environments.'''
+        (temp_pyxenv_home / 'pythons' / '3.12.1').mkdir()
+        (temp_pyxenv_home / 'envs' / 'myenv').mkdir()
+
+        assert IntegrityManager.targets('myenv') == [temp_pyxenv_home / 'envs' / 'myenv']
+        assert len(IntegrityManager.targets()) == 2
+        assert IntegrityManager.targets('nope') == []
@@ -0,0 +1,39 @@
+'''Tests for pyxenv.locks module.'''
+
+import os
+
+import pytest
+
+from pyxenv.exceptions import LockError
+from pyxenv.locks import FileLock
+
+pytestmark = pytest.mark.skipif(os.name == 'nt', reason='Uses POSIX flock semantics')
+
+
+class TestFileLock:
+    '''Tests for FileLock class.'''
+
+    def test_for_target(self, temp_pyxenv_home):
+        '''Test lock files are named after the guarded directory.'''
+        lock = FileLock.for_target(temp_pyxenv_home / 'envs' / 'myenv')
+        assert lock.path == temp_pyxenv_home / 'locks' / 'envs-myenv.lock'
+
+    def test_exclusive_blocks_others(self, temp_pyxenv_home):
+        '''Test a held exclusive lock rejects non-blocking acquirers.'''
+        target = temp_pyxenv_home / 'envs' / 'myenv'
+        with FileLock.for_target(target):
+            assert not FileLock.for_target(target, blocking=False).acquire()
+            assert not FileLock.for_target(target, shared=True, blocking=False).acquire()
+
+        other = FileLock.for_target(target, blocking=False)
+        assert other.acquire()
+        other.release()
+
+    def test_shared_locks_coexist(self, temp_pyxenv_home):
+        '''Test shared locks allow each other but not exclusive ones.'''
+        target = temp_pyxenv_home / 'pythons' / '3.11.5'
+        with FileLock.for_target(target, shared=True), \
+             FileLock.for_target(target, shared=True):
+            with pytest.raises(LockError):
+                with FileLock.for_target(target, blocking=False):
+                    pass
@@ -0,0 +1,98 @@
+'''Tests for pyxenv.metrics module.'''
+
+import json
+import sys
+from unittest.mock import patch
+
+from pyxenv import config, metrics
+from pyxenv.locks import FileLock
+from pyxenv.python_manager import PythonManager
+from pyxenv.registry import InterpreterRegistry
+
+
+class TestMetrics:
+    '''Tests for the metrics store.'''
+
+    def test_flush_accumulates(self):
+        '''Test flushes add to the totals already on disk.'''
+        metrics.inc('download_bytes_total', 100)
+        metrics.observe('install_seconds', 0.2)
+        metrics.flush()
+        metrics.inc('download_bytes_total', 50)
+        metrics.observe('install_seconds', 700)
+        metrics.flush()
+
+        data = metrics.load()
+        assert data['counters']['download_bytes_total'] == 150
+        histogram = data['histograms']['install_seconds']
+        assert histogram['count'] == 2
+        assert histogram['sum'] == 700.2
+        assert histogram['buckets'][metrics.BUCKETS.index(0.5)] == 1
+        assert histogram['buckets'][-1] == 1
+
+    def test_flush_without_observations(self):
+        '''Test nothing is written when nothing happened.'''
+        metrics.flush()
+
+        assert not (config.pyxenv_HOME / metrics.METRICS_FILE).exists()
+
+    def test_flush_keeps_its_lock_wait(self):
+        '''Test the wait for the metrics lock is stored by the same flush.'''
+        metrics.inc('commands_total')
+        metrics.flush()
+
+        assert not metrics.pending()
+        assert metrics.load()['histograms']['lock_wait_seconds']['count'] == 1
+
+    def test_render_prometheus(self):
+        '''Test the text exposition format uses cumulative buckets.'''
+        metrics.inc('probes_total', 3)
+        metrics.observe('resolve_seconds', 0.003)
+        metrics.observe('resolve_seconds', 2)
+        metrics.flush()
+
+        lines = metrics.render_prometheus().splitlines()
+
+        assert '# TYPE pyxenv_probes_total counter' in lines
+        assert 'pyxenv_probes_total 3' in lines
+        assert '# TYPE pyxenv_resolve_seconds histogram' in lines
+        assert 'pyxenv_resolve_seconds_bucket{le="0.001"} 0' in lines
+        assert 'pyxenv_resolve_seconds_bucket{le="0.005"} 1' in lines
+        assert 'pyxenv_resolve_seconds_bucket{le="5"} 2' in lines
+        assert 'pyxenv_resolve_seconds_bucket{le="+Inf"} 2' in lines
+        assert 'pyxenv_resolve_seconds_count 2' in lines
+
+    def test_render_json(self):
+        '''Test the JSON export labels buckets with their bounds.'''
+        metrics.observe('install_seconds', 0.0)
+        metrics.flush()
+
+        data = json.loads(metrics.render_json())
+
+        assert data['histograms']['install_seconds']['buckets']['0.001'] == 1
+        assert data['histograms']['install_seconds']['buckets']['+Inf'] == 0
+
+    def test_unwritable_store_is_ignored(self):
+        '''Test a failing flush does not break the command.'''
+        metrics.inc('commands_total')
+        with patch('pyxenv.metrics.os.replace', side_effect=OSError('read-only')):
+            metrics.flush()
+
+        assert metrics.load()['counters'] == {}
+
+    def test_instrumentation(self, temp_pyxenv_home):
+        '''Test resolution, probes, registry lookups and lock waits are counted.'''
+        with patch.object(PythonManager, '_which', return_value=sys.executable):
+            PythonManager.get_executable('3')
+        InterpreterRegistry.get(sys.executable)
+        InterpreterRegistry.get(sys.executable)
+        with FileLock(config.LOCK_DIR / 'test.lock'):
+            pass
+        metrics.flush()
+
+        data = metrics.load()
+        assert data['histograms']['resolve_seconds']['count'] == 1
+        assert data['counters']['probes_total'] == 1
+        assert data['counters']['registry_misses_total'] == 1
+        assert data['counters']['registry_hits_total'] == 1
+        assert data['histograms']['lock_wait_seconds']['count'] >= 1
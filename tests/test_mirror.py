@@ -0,0 +1,76 @@
+'''Tests for pyxenv.mirror module.'''
+
+from unittest.mock import patch
+
+import pytest
+
+from pyxenv.exceptions import DownloadError
+from pyxenv.installer import PythonInstaller
+from pyxenv.mirror import MirrorManager
+
+
+@pytest.fixture
+def upstream(tmp_path):
+    '''Create a local directory laid out like python.org/ftp/python.'''
+    root = tmp_path / 'upstream'
+    for version, payload in [('3.11.9', b'311'), ('3.12.0', b'3120'), ('3.12.1', b'3121')]:
+        (root / version).mkdir(parents=True)
+        (root / version / f'python-{version}-amd64.exe').write_bytes(payload)
+    (root / '3.12.2').mkdir()  # release without a Windows installer
+    return root
+
+
+class TestMirrorManager:
+    '''Tests for MirrorManager class.'''
+
+    def test_sync_series(self, temp_pyxenv_home, upstream):
+        '''Test the latest installer of each series is mirrored with its checksum.'''
+        mirrored = MirrorManager.sync(['3.11', '3.12'], upstream=str(upstream))
+
+        mirror = temp_pyxenv_home / 'mirror'
+        assert mirrored == [
+            mirror / '3.11.9' / 'python-3.11.9-amd64.exe',
+            mirror / '3.12.1' / 'python-3.12.1-amd64.exe',
+        ]
+        assert mirrored[1].read_bytes() == b'3121'
+        checksum = (mirror / '3.12.1' / 'python-3.12.1-amd64.exe.sha256').read_text()
+        assert checksum.endswith('  python-3.12.1-amd64.exe\n')
+
+    def test_sync_skips_current_files(self, temp_pyxenv_home, upstream):
+        '''Test a second sync does not download again.'''
+        MirrorManager.sync(['3.12'], upstream=str(upstream))
+
+        with patch('pyxenv.mirror.retrieve') as mock_retrieve:
+            MirrorManager.sync(['3.12'], upstream=str(upstream))
+
+        mock_retrieve.assert_not_called()
+
+    def test_install_from_mirror(self, temp_pyxenv_home, upstream):
+        '''Test downloads resolve against the mirror without network access.'''
+        MirrorManager.sync(['3.12'], upstream=str(upstream))
+        mirror = temp_pyxenv_home / 'mirror'
+
+        with patch('pyxenv.config.PYTHON_FTP_BASE', str(mirror)):
+            installer = PythonInstaller.download('3.12')
+
+        assert installer == mirror / '3.12.1' / 'python-3.12.1-amd64.exe'
+
+    def test_mirror_checksum_mismatch(self, temp_pyxenv_home, upstream):
+        '''Test a corrupted mirrored installer is rejected.'''
+        MirrorManager.sync(['3.12'], upstream=str(upstream))
+        mirror = temp_pyxenv_home / 'mirror'
+        (mirror / '3.12.1' / 'python-3.12.1-amd64.exe').write_bytes(b'corrupted')
+
+        with patch('pyxenv.config.PYTHON_FTP_BASE', str(mirror)):
+            with pytest.raises(DownloadError, match='Checksum inválido'):
+                PythonInstaller.download('3.12.1')
+
+    def test_mirror_without_checksum(self, temp_pyxenv_home, upstream):
+        '''Test an installer the mirror publishes no checksum for is rejected.'''
+        MirrorManager.sync(['3.12'], upstream=str(upstream))
+        mirror = temp_pyxenv_home / 'mirror'
+        (mirror / '3.12.1' / 'python-3.12.1-amd64.exe.sha256').unlink()
+
+        with patch('pyxenv.config.PYTHON_FTP_BASE', str(mirror)):
+            with pytest.raises(DownloadError, match='indisponível no espelho'):
+                PythonInstaller.download('3.12.1')
@@ -0,0 +1,85 @@
+'''Tests for pyxenv.optimize module.'''
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from pyxenv import config
+from pyxenv.exceptions import VenvError
+from pyxenv.optimize import (BACKUP_DIR, CONSOLIDATED_PTH, STATE_FILE, EnvOptimizer, parse_importtime,
+                             read_entries)
+from pyxenv.venv_manager import VenvManager
+
+
+@pytest.fixture
+def real_env(temp_pyxenv_home, tmp_path):
+    '''Create an environment with path-only and import .pth files.'''
+    env_path = config.ENV_DIR / 'fast'
+    subprocess.run([sys.executable, '-m', 'venv', '--without-pip', str(env_path)], check=True)
+    site_dirs = EnvOptimizer._inspect(VenvManager.python_path(env_path))['site']
+    site_dir = next(Path(d) for d in site_dirs if Path(d).name == 'site-packages')
+    (tmp_path / 'outside').mkdir()
+    (site_dir / 'pkg_src').mkdir()
+    (site_dir / 'a.pth').write_text('pkg_src\n# comment\nmissing_dir\n')
+    (site_dir / 'b.pth').write_text(f'{tmp_path / "outside"}\n./pkg_src\n')
+    (site_dir / 'hook.pth').write_text('import sys\n')
+    return env_path, site_dir
+
+
+def test_parse_importtime():
+    '''Test only top-level imports are summed (they include their children).'''
+    output = '\n'.join([
+        'import time: self [us] | cumulative | imported package',
+        'import time:       100 |        100 |   _io',
+        'import time:       300 |        400 | io',
+        'import time:      1000 |       1600 | site',
+        'Traceback (ignored)',
+    ])
+
+    assert parse_importtime(output) == 2.0
+
+
+class TestEnvOptimizer:
+    '''Tests for EnvOptimizer class.'''
+
+    def test_optimize_and_restore(self, real_env, tmp_path):
+        '''Test path-only .pth files are merged and restored, keeping sys.path.'''
+        env_path, site_dir = real_env
+        python_exe = VenvManager.python_path(env_path)
+        path_before = EnvOptimizer._inspect(python_exe)['path']
+
+        report = EnvOptimizer.optimize('fast', runs=1)
+
+        assert sorted(p.name for p in site_dir.glob('*.pth')) == ['hook.pth', CONSOLIDATED_PTH]
+        entries = read_entries(site_dir / CONSOLIDATED_PTH)
+        assert entries == [(site_dir / 'pkg_src').relative_to(env_path).as_posix(), str(tmp_path / 'outside')]
+        code = [l for l in (site_dir / CONSOLIDATED_PTH).read_text().splitlines() if not l.startswith('#')]
+        assert len(code) == 1 and code[0].startswith('import ')
+        assert report['sys_path'] == path_before
+        assert set(report['before']) == {'wall_ms', 'import_ms'}
+        assert len(report['consolidated']) == 2
+        assert (env_path / BACKUP_DIR).is_dir() and (env_path / STATE_FILE).is_file()
+
+        assert EnvOptimizer.restore('fast') == 2
+        assert sorted(p.name for p in site_dir.glob('*.pth')) == ['a.pth', 'b.pth', 'hook.pth']
+        assert not (env_path / BACKUP_DIR).exists()
+        assert EnvOptimizer._inspect(python_exe)['path'] == path_before
+
+    def test_optimize_twice(self, real_env):
+        '''Test a second run keeps the consolidated entries and sys.path.'''
+        env_path, site_dir = real_env
+        first = EnvOptimizer.optimize('fast', runs=1)
+        entries = read_entries(site_dir / CONSOLIDATED_PTH)
+
+        second = EnvOptimizer.optimize('fast', runs=1)
+
+        assert read_entries(site_dir / CONSOLIDATED_PTH) == entries
+        assert second['sys_path'] == first['sys_path']
+        assert second['consolidated'] == first['consolidated']
+
+    def test_missing_environment(self, temp_pyxenv_home):
+        '''Test an unknown environment is reported.'''
+        with pytest.raises(VenvError, match='não encontrado'):
+            EnvOptimizer.optimize('nope')
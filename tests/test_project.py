@@ -0,0 +1,110 @@
+'''Tests for pyxenv.project module.'''
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from pyxenv import config, project
+from pyxenv.project import clear_cache, find_project_env, find_project_version
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    '''Start every test with an empty lookup cache.'''
+    clear_cache()
+    yield
+    clear_cache()
+
+
+class TestFindProjectVersion:
+    '''Tests for find_project_version function.'''
+
+    def test_no_pin(self, tmp_path):
+        '''Test directory tree without any pin.'''
+        assert find_project_version(tmp_path) is None
+
+    def test_python_version_file(self, tmp_path):
+        '''Test reading .python-version.'''
+        (tmp_path / '.python-version').write_text('# pinned\n3.11.5\n')
+        assert find_project_version(tmp_path) == '3.11.5'
+
+    def test_pyproject(self, tmp_path):
+        '''Test reading [tool.pyxenv] from pyproject.toml.'''
+        (tmp_path / 'pyproject.toml').write_text('[tool.pyxenv]\npython = "3.12"\n')
+        assert find_project_version(tmp_path) == '3.12'
+
+    def test_pin_file_takes_precedence(self, tmp_path):
+        '''Test .python-version wins over pyproject.toml in the same directory.'''
+        (tmp_path / '.python-version').write_text('3.10\n')
+        (tmp_path / 'pyproject.toml').write_text('[tool.pyxenv]\npython = "3.12"\n')
+        assert find_project_version(tmp_path) == '3.10'
+
+    def test_searches_upward(self, tmp_path):
+        '''Test the nearest pinned parent directory is used.'''
+        (tmp_path / '.python-version').write_text('3.9\n')
+        nested = tmp_path / 'a' / 'b'
+        nested.mkdir(parents=True)
+        (tmp_path / 'a' / 'pyproject.toml').write_text('[project]\nname = "x"\n')
+
+        assert find_project_version(nested) == '3.9'
+
+    def test_system_pin(self, tmp_path):
+        '''Test "system" means the default interpreter.'''
+        (tmp_path / '.python-version').write_text('system\n')
+        assert find_project_version(tmp_path) is None
+
+    def test_cached_until_mtime_changes(self, tmp_path):
+        '''Test files are only re-read when their mtime changes.'''
+        pin = tmp_path / '.python-version'
+        pin.write_text('3.11\n')
+
+        with patch.object(project, '_read_pin_file', wraps=project._read_pin_file) as reader:
+            assert find_project_version(tmp_path) == '3.11'
+            assert find_project_version(tmp_path) == '3.11'
+            assert reader.call_count == 1
+
+            pin.write_text('3.12\n')
+            stat = pin.stat()
+            os.utime(pin, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+            assert find_project_version(tmp_path) == '3.12'
+            assert reader.call_count == 2
+
+
+    def test_cache_persists_across_processes(self, tmp_path):
+        '''Test a new process reuses lookups instead of parsing pyproject.toml again.'''
+        (tmp_path / 'pyproject.toml').write_text('[tool.pyxenv]\npython = "3.12"\n')
+        assert find_project_version(tmp_path) == '3.12'
+        assert (config.CACHE_DIR / project.CACHE_FILE).exists()
+
+        clear_cache()  # as in a new process
+        with patch.object(project, '_read_pyproject') as reader:
+            assert find_project_version(tmp_path) == '3.12'
+        reader.assert_not_called()
+
+    def test_corrupt_cache_file(self, tmp_path):
+        '''Test an unreadable cache file is ignored and rewritten.'''
+        (tmp_path / '.python-version').write_text('3.11\n')
+        config.CACHE_DIR.mkdir(parents=True)
+        (config.CACHE_DIR / project.CACHE_FILE).write_text('not json')
+
+        assert find_project_version(tmp_path) == '3.11'
+
+
+class TestFindProjectEnv:
+    '''Tests for find_project_env function.'''
+
+    def test_no_pin(self, tmp_path):
+        '''Test directory tree without an environment pin.'''
+        assert find_project_env(tmp_path) is None
+
+    def test_nearest_pin_wins(self, tmp_path):
+        '''Test the nearest .pyxenv-env file is used.'''
+        nested = tmp_path / 'a' / 'b'
+        nested.mkdir(parents=True)
+        (tmp_path / '.pyxenv-env').write_text('outer\n')
+        (tmp_path / 'a' / '.pyxenv-env').write_text('inner\n')
+
+        assert find_project_env(nested) == 'inner'
+        assert find_project_env(tmp_path) == 'outer'
@@ -1,6 +1,8 @@
 '''Tests for pyxenv.python_manager module.'''
 
+import os
 import shutil
+import threading
 from pathlib import Path
 from unittest.mock import patch, Mock
 
@@ -63,6 +65,42 @@ class TestPythonManager:
             version_numbers = [v[0] for v in versions]
             assert version_numbers == ['3.11.5', '3.10.2', '3.9.0']
 
+    def test_iter_versions_yields_in_completion_order(self, temp_pyxenv_home):
+        '''Test a fast probe is yielded before a slow one finishes.'''
+        for version in ['3.10.2', '3.12.1']:
+            exe = PythonManager._get_python_executable_path(temp_pyxenv_home / 'pythons' / version)
+            exe.parent.mkdir(parents=True)
+            exe.touch()
+        slow_done = threading.Event()
+
+        def probe(path):
+            if '3.10.2' in path:
+                slow_done.wait(5)
+                return '3.10.2'
+            return '3.12.1'
+
+        with patch.object(PythonManager, '_get_version_from_executable', side_effect=probe):
+            versions = PythonManager.iter_versions()
+            first = next(versions)
+            slow_done.set()
+            rest = list(versions)
+
+        assert first[0] == '3.12.1'
+        assert [v[0] for v in rest] == ['3.10.2']
+
+    def test_index_uses_cached_fingerprints(self, temp_pyxenv_home):
+        '''Test already fingerprinted global interpreters match exact versions.'''
+        def which(name):
+            return '/usr/bin/python3.12' if name == 'python3.12' else None
+
+        PythonManager._index = None
+        with patch.object(PythonManager, '_which', side_effect=which), \
+             patch('pyxenv.python_manager.InterpreterRegistry.cached', return_value={'version': '3.12.4'}):
+            index = PythonManager.index()
+        PythonManager._index = None
+
+        assert [str(version) for version, _, _ in index] == ['3.12.4']
+
     def test_get_executable_default(self):
         '''Test getting default Python executable.'''
         with patch('shutil.which', return_value='/usr/bin/python3'):
@@ -108,3 +146,58 @@ class TestPythonManager:
         with patch('subprocess.run', side_effect=Exception('Command failed')):
             version = PythonManager._get_version_from_executable('/invalid/path')
             assert version is None
+
+    def test_get_executable_specifier(self, temp_pyxenv_home):
+        '''Test resolving a version specifier through the index.'''
+        for version in ['3.10.14', '3.12.4', '3.13.1']:
+            bin_dir = temp_pyxenv_home / 'pythons' / version / 'bin'
+            bin_dir.mkdir(parents=True)
+            (bin_dir / 'python').touch()
+            (temp_pyxenv_home / 'pythons' / version / 'python.exe').touch()
+
+        with patch('shutil.which', return_value=None):
+            exe = PythonManager.get_executable('>=3.10,<3.13')
+            assert '3.12.4' in exe
+
+            with pytest.raises(PythonNotFoundError):
+                PythonManager.get_executable('>=3.14')
+
+    def test_which_skips_shim_dir(self, temp_pyxenv_home, monkeypatch):
+        '''Test PATH lookups never resolve to pyxenv's own shims.'''
+        shim_dir = temp_pyxenv_home / 'shims'
+        monkeypatch.setenv('PATH', os.pathsep.join([str(shim_dir), '/usr/bin']))
+
+        with patch('shutil.which', return_value=None) as mock_which:
+            PythonManager._which('python3.11')
+
+        assert str(shim_dir) not in mock_which.call_args[1]['path']
+
+    @pytest.mark.skipif(os.name == 'nt', reason='POSIX layout')
+    def test_variants_coexist(self, temp_pyxenv_home):
+        '''Test regular and free-threaded builds are selected separately.'''
+        for name, binary in [('3.13.1', 'python'), ('3.13.1t', 'python3.13t')]:
+            bin_dir = temp_pyxenv_home / 'pythons' / name / 'bin'
+            bin_dir.mkdir(parents=True)
+            (bin_dir / binary).touch()
+        PythonManager._index = None
+
+        with patch('shutil.which', return_value=None):
+            regular = PythonManager.get_executable('3.13')
+            free_threaded = PythonManager.get_executable('3.13t')
+        PythonManager._index = None
+
+        assert regular == str(temp_pyxenv_home / 'pythons' / '3.13.1' / 'bin' / 'python')
+        assert free_threaded == str(temp_pyxenv_home / 'pythons' / '3.13.1t' / 'bin' / 'python3.13t')
+
+    def test_version_includes_variant(self):
+        '''Test probed versions carry the build variant.'''
+        info = {'version': '3.13.1', 'free_threaded': True, 'debug': False}
+        with patch('pyxenv.python_manager.InterpreterRegistry.get', return_value=info):
+            assert PythonManager._get_version_from_executable('/usr/bin/python3.13t') == '3.13.1t'
+
+    def test_global_names_include_free_threaded(self):
+        '''Test free-threaded launchers are looked up on PATH from 3.13 on.'''
+        with patch('pyxenv.config.SUPPORTED_VERSIONS', ('3.12', '3.13')):
+            names = PythonManager._global_names()
+
+        assert names == ['python3.13', 'python3.13t', 'python3.12', 'python3', 'python']
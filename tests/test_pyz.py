@@ -0,0 +1,94 @@
+'''Tests for the zipapp build (build_pyz.py).'''
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+import zipfile
+
+import pytest
+
+from build_pyz import build
+from pyxenv import __version__
+
+# Milliseconds "pyxenv.pyz --version" may add to a bare interpreter start
+# (override with PYXENV_STARTUP_BUDGET_MS on slow machines)
+STARTUP_BUDGET_MS = float(os.environ.get('PYXENV_STARTUP_BUDGET_MS', '50'))
+
+# Modules only some commands need; importing them at startup is a regression
+LAZY_MODULES = ('pyxenv.archive', 'pyxenv.clone', 'pyxenv.forkserver', 'pyxenv.integrity',
+                'pyxenv.store', 'pyxenv.wheelhouse', 'pyxenv.installer', 'pyxenv.optimize',
+                'pyxenv.python_manager', 'pyxenv.venv_manager', 'pyxenv.requirements',
+                'concurrent.futures', 'subprocess', 'hashlib')
+
+
+def median_ms(cmd, env, runs=10):
+    '''Median wall time of a command, in milliseconds.'''
+    subprocess.run(cmd, capture_output=True, env=env)  # warm the page cache
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, capture_output=True, check=True, env=env)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+@pytest.fixture(scope='module')
+def pyz(tmp_path_factory):
+    '''Build pyxenv.pyz once for the module.'''
+    return build(tmp_path_factory.mktemp('pyz') / 'pyxenv.pyz')
+
+
+@pytest.fixture
+def env(tmp_path):
+    '''Environment keeping the archive's runs away from the user's pyxenv home.'''
+    return dict(os.environ, HOME=str(tmp_path), PYXENV_HOME=str(tmp_path / '.pyxenv'))
+
+
+class TestZipapp:
+    '''Tests for the single-file distribution.'''
+
+    def test_contains_bytecode(self, pyz):
+        '''Test every module ships with precompiled bytecode.'''
+        with zipfile.ZipFile(pyz) as archive:
+            names = set(archive.namelist())
+
+        assert '__main__.py' in names
+        sources = [n for n in names if n.endswith('.py') and n != '__main__.py']
+        assert sources
+        assert all(f'{name}c' in names for name in sources)
+
+    def test_runs_with_interpreter(self, pyz, env):
+        '''Test running the archive with python -S.'''
+        result = subprocess.run([sys.executable, '-S', str(pyz), '--version'],
+                                capture_output=True, text=True, env=env)
+        assert result.returncode == 0
+        assert __version__ in result.stdout
+
+    @pytest.mark.skipif(os.name == 'nt', reason='Shell prelude is POSIX only')
+    def test_runs_directly(self, pyz, env):
+        '''Test running the archive as an executable.'''
+        env['PYXENV_PYTHON'] = sys.executable
+        result = subprocess.run([str(pyz), '--version'], capture_output=True, text=True, env=env)
+        assert result.returncode == 0
+        assert __version__ in result.stdout
+
+    def test_startup_skips_command_modules(self, pyz, env, tmp_path):
+        '''Test "--version" imports none of the modules specific to other commands.'''
+        result = subprocess.run([sys.executable, '-S', '-X', 'importtime', str(pyz), '--version'],
+                                capture_output=True, text=True, check=True, env=env)
+        imported = {line.rsplit('|', 1)[-1].strip() for line in result.stderr.splitlines()}
+
+        assert imported.isdisjoint(LAZY_MODULES)
+        # Nothing was recorded, so the metrics store is not written either
+        assert not (tmp_path / '.pyxenv' / 'metrics.json').exists()
+
+    def test_startup_time(self, pyz, env, record_property):
+        '''Measure the startup time "pyxenv.pyz --version" adds to the interpreter's.'''
+        bare = median_ms([sys.executable, '-S', '-c', 'pass'], env)
+        median = median_ms([sys.executable, '-S', str(pyz), '--version'], env)
+
+        record_property('startup_ms', round(median, 2))
+        print(f'pyxenv.pyz startup: {median:.1f} ms, {median - bare:.1f} ms over the interpreter')
+        assert median - bare < STARTUP_BUDGET_MS
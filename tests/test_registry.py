@@ -0,0 +1,83 @@
+'''Tests for pyxenv.registry module.'''
+
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from pyxenv import config
+from pyxenv.registry import InterpreterRegistry, build_features, build_variant
+
+
+def _fake_interpreter(path, output):
+    '''Create an executable that prints a fixed output.'''
+    path.write_text(f"#!/bin/sh\necho '{output}'\n")
+    path.chmod(0o755)
+    return str(path)
+
+
+class TestInterpreterRegistry:
+    '''Tests for InterpreterRegistry class.'''
+
+    def test_probe_real_interpreter(self):
+        '''Test a single launch gathers version, tags, flags and paths.'''
+        info = InterpreterRegistry.probe(sys.executable)
+
+        assert info['version'].startswith('%d.%d.%d' % sys.version_info[:3])
+        assert info['implementation'] == sys.implementation.name
+        assert info['interpreter_tag'].endswith('%d%d' % sys.version_info[:2])
+        assert info['abi_tag'].startswith(info['interpreter_tag'])
+        assert info['debug'] == hasattr(sys, 'gettotalrefcount')
+        assert info['prefix'] == sys.prefix
+        assert set(info['paths']) >= {'stdlib', 'purelib', 'scripts'}
+
+    @pytest.mark.skipif(os.name == 'nt', reason='fake interpreter is a shell script')
+    def test_cached_until_binary_changes(self, tmp_path, temp_pyxenv_home):
+        '''Test fingerprints persist across processes and expire with the binary.'''
+        exe = _fake_interpreter(tmp_path / 'python', '{"version": "3.12.1", "free_threaded": false}')
+
+        assert InterpreterRegistry.get(exe)['version'] == '3.12.1'
+        InterpreterRegistry.save()
+        assert (config.CACHE_DIR / 'interpreters.json').exists()
+
+        InterpreterRegistry.clear()
+        with patch('subprocess.run') as mock_run:
+            assert InterpreterRegistry.get(exe)['version'] == '3.12.1'
+            mock_run.assert_not_called()
+
+        st = os.stat(exe)
+        os.utime(exe, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        assert InterpreterRegistry.cached(exe) is None
+
+    @pytest.mark.skipif(os.name == 'nt', reason='fake interpreter is a shell script')
+    def test_partial_results_not_cached(self, tmp_path):
+        '''Test interpreters that cannot run the probe are identified but not cached.'''
+        exe = _fake_interpreter(tmp_path / 'python', 'Python 3.9.1')
+
+        assert InterpreterRegistry.get(exe) == {'version': '3.9.1', 'partial': True}
+        assert InterpreterRegistry.cached(exe) is None
+
+    def test_missing_interpreter(self, tmp_path):
+        '''Test missing executables yield None.'''
+        assert InterpreterRegistry.get(str(tmp_path / 'nope')) is None
+
+    @pytest.mark.parametrize('info,expected', [
+        ({'free_threaded': True, 'debug': False}, 't'),
+        ({'free_threaded': True, 'debug': True}, 'td'),
+        ({'free_threaded': False, 'debug': True}, 'd'),
+        ({'version': '3.9.1', 'partial': True}, ''),
+        (None, ''),
+    ])
+    def test_build_variant(self, info, expected):
+        '''Test deriving the variant suffix from a fingerprint.'''
+        assert build_variant(info) == expected
+
+    def test_build_features(self):
+        '''Test reading PGO, LTO and JIT from configure arguments.'''
+        info = {'config_args': "'--prefix=/opt/py' '--enable-optimizations' '--with-lto=thin' "
+                               "'--enable-experimental-jit=no'"}
+
+        assert build_features(info) == ('pgo', 'lto')
+        assert build_features({'config_args': '--enable-experimental-jit=yes-off'}) == ('jit',)
+        assert build_features({'config_args': ''}) == ()
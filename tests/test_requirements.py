@@ -0,0 +1,50 @@
+'''Tests for pyxenv.requirements module.'''
+
+from pyxenv.requirements import fingerprint, normalize_name, parse, read_lines
+
+
+class TestParse:
+    '''Tests for requirement parsing.'''
+
+    def test_read_lines(self, tmp_path):
+        '''Test comments, blanks and continuations are handled.'''
+        req = tmp_path / 'req.txt'
+        req.write_text('# deps\nrequests==2.31.0  # http\n\nDjango>=4 \\\n  ,<5\n')
+
+        assert read_lines(req) == ['requests==2.31.0', 'Django>=4   ,<5']
+
+    def test_parse_names(self, tmp_path):
+        '''Test lines are keyed by normalized project name.'''
+        req = tmp_path / 'req.txt'
+        req.write_text('Foo_Bar==1.0\nbaz.qux[extra]>=2\n')
+
+        assert parse(req) == {'foo-bar': 'Foo_Bar==1.0', 'baz-qux': 'baz.qux[extra]>=2'}
+
+    def test_parse_options_need_full_install(self, tmp_path):
+        '''Test files with pip options cannot be diffed.'''
+        req = tmp_path / 'req.txt'
+        req.write_text('-r base.txt\nrequests\n')
+
+        assert parse(req) is None
+
+    def test_normalize_name(self):
+        '''Test PEP 503 normalization.'''
+        assert normalize_name('Zope.Interface') == 'zope-interface'
+
+
+class TestFingerprint:
+    '''Tests for requirement fingerprints.'''
+
+    def test_includes_and_python_version(self, tmp_path):
+        '''Test included files and the interpreter version change the hash.'''
+        (tmp_path / 'base.txt').write_text('six==1.16.0\n')
+        req = tmp_path / 'req.txt'
+        req.write_text('-r base.txt\n# comment\nrequests\n')
+        first = fingerprint(req, '3.12.1')
+
+        req.write_text('-r base.txt\nrequests\n')
+        assert fingerprint(req, '3.12.1') == first
+        assert fingerprint(req, '3.12.2') != first
+
+        (tmp_path / 'base.txt').write_text('six==1.17.0\n')
+        assert fingerprint(req, '3.12.1') != first
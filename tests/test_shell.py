@@ -0,0 +1,78 @@
+'''Tests for pyxenv.shell module.'''
+
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from pyxenv.shell import render_exports, render_hook
+
+# Stands in for pyxenv: logs each call and prints the exports of "$2"
+_FAKE_PYXENV = '''#!/bin/sh
+echo "$@" >> "$PYXENV_CALLS"
+echo "export PYXENV_ACTIVE_ENV=$2 _PYXENV_ENV_BIN=/envs/$2/bin VIRTUAL_ENV=/envs/$2"
+echo 'export PATH="$_PYXENV_ENV_BIN:$PATH"'
+'''
+
+
+class TestRenderExports:
+    '''Tests for render_exports function.'''
+
+    def test_quotes_values(self):
+        '''Test values are shell-quoted.'''
+        delta = {'set': {'VIRTUAL_ENV': '/my envs/a'}, 'unset': ['PYTHONHOME'], 'path': '/my envs/a/bin'}
+
+        code = render_exports('a', delta)
+
+        assert "export VIRTUAL_ENV='/my envs/a'" in code
+        assert 'unset PYTHONHOME' in code
+        assert code.rstrip().endswith('''export PATH='/my envs/a/bin'"${PATH:+:$PATH}"''')
+
+    @pytest.mark.skipif(shutil.which('bash') is None, reason='bash not available')
+    def test_switching_does_not_grow_path(self):
+        '''Test evaluating exports twice replaces the previous environment.'''
+        first = render_exports('a', {'set': {}, 'unset': [], 'path': '/envs/a/bin'})
+        second = render_exports('b', {'set': {}, 'unset': [], 'path': '/envs/b/bin'})
+        script = f'PATH=/usr/bin\n{first}{second}echo "$PATH"'
+
+        result = subprocess.run(['bash', '-c', script], capture_output=True, text=True)
+
+        assert result.stdout.strip() == '/envs/b/bin:/usr/bin'
+
+
+class TestRenderHook:
+    '''Tests for render_hook function.'''
+
+    def test_unknown_shell(self):
+        '''Test unsupported shells are rejected.'''
+        with pytest.raises(ValueError):
+            render_hook('fish')
+
+    @pytest.mark.skipif(os.name == 'nt' or shutil.which('bash') is None, reason='bash not available')
+    def test_switches_only_on_pin_change(self, tmp_path):
+        '''Test pyxenv runs only when the pinned environment changes.'''
+        bin_dir = tmp_path / 'bin'
+        bin_dir.mkdir()
+        fake = bin_dir / 'pyxenv'
+        fake.write_text(_FAKE_PYXENV)
+        fake.chmod(0o755)
+        project = tmp_path / 'project'
+        (project / 'sub').mkdir(parents=True)
+        (project / '.pyxenv-env').write_text('myenv\n')
+        calls = tmp_path / 'calls.log'
+
+        script = '\n'.join([
+            render_hook('bash'),
+            f'cd {project} && _pyxenv_hook && _pyxenv_hook',
+            'cd sub && _pyxenv_hook',
+            'echo "inside=$PYXENV_ACTIVE_ENV"',
+            f'cd {tmp_path} && _pyxenv_hook',
+            'echo "outside=${PYXENV_ACTIVE_ENV:-} path=$PATH"',
+        ])
+        env = {'PATH': f'{bin_dir}:/usr/bin:/bin', 'PYXENV_CALLS': str(calls)}
+        result = subprocess.run(['bash', '-c', script], capture_output=True, text=True, env=env)
+
+        assert 'inside=myenv' in result.stdout
+        assert f'outside= path={bin_dir}:/usr/bin:/bin' in result.stdout
+        assert calls.read_text().splitlines() == ['--env myenv --print-env']
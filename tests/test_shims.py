@@ -0,0 +1,102 @@
+'''Tests for pyxenv.shims module.'''
+
+import os
+import shutil
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from pyxenv.shims import ShimManager
+
+pytestmark = pytest.mark.skipif(os.name == 'nt', reason='Fake interpreters are POSIX shell stubs')
+
+
+def make_python(home, version):
+    '''Create a fake pyxenv interpreter that prints its version and arguments.'''
+    bin_dir = home / 'pythons' / version / 'bin'
+    bin_dir.mkdir(parents=True)
+    exe = bin_dir / 'python'
+    exe.write_text(f'#!/bin/sh\necho "{version} $*"\n')
+    exe.chmod(0o755)
+    return exe
+
+
+class TestShimManager:
+    '''Tests for ShimManager class.'''
+
+    def test_generate_scripts(self, temp_pyxenv_home):
+        '''Test generating one launcher per minor version.'''
+        make_python(temp_pyxenv_home, '3.11.4')
+        newest = make_python(temp_pyxenv_home, '3.11.9')
+        make_python(temp_pyxenv_home, '3.12.1')
+
+        with patch('pyxenv.python_manager.PythonManager._which', return_value=None):
+            shims = ShimManager.generate()
+
+        assert shims['python3.11'] == str(newest)
+        shim_dir = temp_pyxenv_home / 'shims'
+        assert sorted(p.name for p in shim_dir.iterdir() if not p.name.startswith('.')) == \
+            ['python3.11', 'python3.12']
+
+        result = subprocess.run([str(shim_dir / 'python3.11'), '-c', 'pass'],
+                                capture_output=True, text=True)
+        assert result.stdout.strip() == '3.11.9 -c pass'
+
+    def test_generate_links(self, temp_pyxenv_home):
+        '''Test generating symlinks instead of scripts.'''
+        exe = make_python(temp_pyxenv_home, '3.12.1')
+
+        with patch('pyxenv.python_manager.PythonManager._which', return_value=None):
+            ShimManager.generate('link')
+
+        shim = temp_pyxenv_home / 'shims' / 'python3.12'
+        assert shim.is_symlink()
+        assert os.readlink(shim) == str(exe)
+
+    def test_generate_removes_stale(self, temp_pyxenv_home):
+        '''Test launchers for removed interpreters are deleted.'''
+        make_python(temp_pyxenv_home, '3.12.1')
+        stale = temp_pyxenv_home / 'shims' / 'python3.9'
+        stale.parent.mkdir(parents=True)
+        stale.write_text('#!/bin/sh\n# Generated by pyxenv - do not edit.\nexec "/old/python3.9" "$@"\n')
+
+        with patch('pyxenv.python_manager.PythonManager._which', return_value=None):
+            ShimManager.generate()
+
+        assert not stale.exists()
+
+    def test_generate_keeps_user_files(self, temp_pyxenv_home):
+        '''Test only launchers pyxenv wrote are swept, including stale symlinks.'''
+        make_python(temp_pyxenv_home, '3.12.1')
+        make_python(temp_pyxenv_home, '3.13.0')
+        shim_dir = temp_pyxenv_home / 'shims'
+        with patch('pyxenv.python_manager.PythonManager._which', return_value=None):
+            ShimManager.generate('link')
+        (shim_dir / 'mytool').write_text('#!/bin/sh\necho mine\n')
+        (shim_dir / 'subdir').mkdir()
+        shutil.rmtree(temp_pyxenv_home / 'pythons' / '3.13.0')
+
+        with patch('pyxenv.python_manager.PythonManager._which', return_value=None):
+            ShimManager.generate('link')
+
+        assert not (shim_dir / 'python3.13').is_symlink()
+        assert (shim_dir / 'python3.12').is_symlink()
+        assert (shim_dir / 'mytool').read_text() == '#!/bin/sh\necho mine\n'
+        assert (shim_dir / 'subdir').is_dir()
+
+    def test_refresh_without_shims(self, temp_pyxenv_home):
+        '''Test refresh is a no-op until shims are generated.'''
+        assert ShimManager.refresh() is None
+        assert not (temp_pyxenv_home / 'shims').exists()
+
+    def test_refresh_keeps_mode(self, temp_pyxenv_home):
+        '''Test refresh regenerates shims with the previous mode.'''
+        make_python(temp_pyxenv_home, '3.12.1')
+        with patch('pyxenv.python_manager.PythonManager._which', return_value=None):
+            ShimManager.generate('link')
+            make_python(temp_pyxenv_home, '3.13.0')
+            shims = ShimManager.refresh()
+
+        assert 'python3.13' in shims
+        assert (temp_pyxenv_home / 'shims' / 'python3.13').is_symlink()
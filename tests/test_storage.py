@@ -0,0 +1,156 @@
+'''Tests for pyxenv.storage module.'''
+
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from pyxenv.exceptions import pyxenvError
+from pyxenv.locks import FileLock
+from pyxenv.storage import LAST_USED_MARKER, StorageManager, parse_duration
+
+DAY = 86400
+
+
+def make_dir(path, age_days=0, size=0, home=None):
+    '''Create an interpreter/environment directory last used age_days ago.'''
+    path.mkdir(parents=True)
+    (path / 'data.bin').write_bytes(b'x' * size)
+    if home is not None:
+        (path / 'pyvenv.cfg').write_text(f'home = {home}\n')
+    marker = path / LAST_USED_MARKER
+    marker.touch()
+    stamp = time.time() - age_days * DAY
+    os.utime(marker, (stamp, stamp))
+    return path
+
+
+class TestParseDuration:
+    '''Tests for parse_duration function.'''
+
+    @pytest.mark.parametrize('text,expected', [
+        ('30d', 30 * DAY),
+        ('12h', 12 * 3600),
+        ('2w', 14 * DAY),
+        ('90m', 5400),
+        ('7', 7 * DAY),
+    ])
+    def test_parse(self, text, expected):
+        '''Test parsing valid durations.'''
+        assert parse_duration(text) == expected
+
+    def test_invalid(self):
+        '''Test rejecting invalid durations.'''
+        with pytest.raises(pyxenvError):
+            parse_duration('soon')
+
+
+class TestStorageManager:
+    '''Tests for StorageManager class.'''
+
+    def test_mark_used(self, tmp_path):
+        '''Test recording the last-used timestamp.'''
+        before = time.time() - 1
+        StorageManager.mark_used(tmp_path)
+        assert StorageManager.last_used(tmp_path) >= before
+
+    def test_owner(self, temp_pyxenv_home):
+        '''Test mapping paths to managed directories.'''
+        exe = temp_pyxenv_home / 'pythons' / '3.11.5' / 'bin' / 'python'
+        assert StorageManager.owner(str(exe)) == temp_pyxenv_home / 'pythons' / '3.11.5'
+        assert StorageManager.owner('/usr/bin/python3') is None
+
+    @pytest.mark.skipif(os.name == 'nt', reason='Hardlink accounting uses POSIX inodes')
+    def test_usage_counts_hardlinks_once(self, temp_pyxenv_home):
+        '''Test files hardlinked across environments are counted once.'''
+        env1 = make_dir(temp_pyxenv_home / 'envs' / 'env1', size=64 * 1024)
+        env2 = make_dir(temp_pyxenv_home / 'envs' / 'env2', size=0)
+        os.link(env1 / 'data.bin', env2 / 'shared.bin')
+        make_dir(temp_pyxenv_home / 'pythons' / '3.11.5', size=4096)
+
+        usage = StorageManager.usage()
+
+        env_sizes = dict((name, size) for name, size, _ in usage['envs'])
+        assert env_sizes['env1'] + env_sizes['env2'] < 2 * 64 * 1024
+        assert [name for name, _, _ in usage['pythons']] == ['3.11.5']
+
+    def test_plan(self, temp_pyxenv_home):
+        '''Test choosing old environments and unreferenced interpreters.'''
+        pythons = temp_pyxenv_home / 'pythons'
+        envs = temp_pyxenv_home / 'envs'
+        used_py = make_dir(pythons / '3.11.5', age_days=90)
+        unused_py = make_dir(pythons / '3.9.0', age_days=90)
+        fresh_py = make_dir(pythons / '3.12.0', age_days=1)
+        make_dir(envs / 'recent', age_days=2, home=used_py / 'bin')
+        old_env = make_dir(envs / 'old', age_days=60, home=unused_py / 'bin')
+
+        plan = StorageManager.plan(older_than=30 * DAY)
+
+        assert old_env in plan
+        assert unused_py in plan
+        assert used_py not in plan
+        assert fresh_py not in plan
+        assert envs / 'recent' not in plan
+
+    def test_plan_keep_latest(self, temp_pyxenv_home):
+        '''Test the most recently used entries are kept.'''
+        envs = temp_pyxenv_home / 'envs'
+        for i, age in enumerate([40, 50, 60]):
+            make_dir(envs / f'env{i}', age_days=age)
+
+        plan = StorageManager.plan(older_than=30 * DAY, keep_latest=2)
+
+        assert plan == [envs / 'env2']
+
+    def test_collect_dry_run(self, temp_pyxenv_home):
+        '''Test dry-run removes nothing.'''
+        old_env = make_dir(temp_pyxenv_home / 'envs' / 'old', age_days=60)
+
+        removed, skipped = StorageManager.collect(30 * DAY, dry_run=True)
+
+        assert removed == [old_env]
+        assert skipped == []
+        assert old_env.exists()
+
+    @pytest.mark.skipif(os.name == 'nt', reason='--gc only removes with --dry-run on Windows')
+    def test_collect_removes_and_respects_locks(self, temp_pyxenv_home):
+        '''Test locked entries are skipped and the rest removed.'''
+        envs = temp_pyxenv_home / 'envs'
+        busy = make_dir(envs / 'busy', age_days=60)
+        idle = make_dir(envs / 'idle', age_days=60)
+
+        with FileLock.for_target(busy), \
+             patch('pyxenv.storage.ShimManager.refresh') as mock_refresh:
+            removed, skipped = StorageManager.collect(30 * DAY)
+
+        assert removed == [idle]
+        assert skipped == [busy]
+        assert busy.exists()
+        assert not idle.exists()
+        mock_refresh.assert_not_called()
+
+    @pytest.mark.skipif(os.name == 'nt', reason='--gc only removes with --dry-run on Windows')
+    def test_collect_keeps_interpreter_of_skipped_env(self, temp_pyxenv_home):
+        '''Test an interpreter survives while an environment built on it could not be removed.'''
+        python = make_dir(temp_pyxenv_home / 'pythons' / '3.11', age_days=90)
+        orphan = make_dir(temp_pyxenv_home / 'pythons' / '3.9', age_days=90)
+        env = make_dir(temp_pyxenv_home / 'envs' / 'e', age_days=60, home=python / 'bin')
+
+        with FileLock.for_target(env, shared=True), \
+             patch('pyxenv.storage.ShimManager.refresh'):
+            removed, skipped = StorageManager.collect(30 * DAY)
+
+        assert skipped == [env]
+        assert removed == [orphan]
+        assert python.exists()
+
+    def test_collect_refuses_on_windows(self, temp_pyxenv_home):
+        '''Test removal is refused where shared locks cannot protect running interpreters.'''
+        old_env = make_dir(temp_pyxenv_home / 'envs' / 'old', age_days=60)
+
+        with patch('pyxenv.storage.os.name', 'nt'):
+            with pytest.raises(pyxenvError, match='--dry-run'):
+                StorageManager.collect(30 * DAY)
+
+        assert old_env.exists()
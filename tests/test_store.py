@@ -0,0 +1,155 @@
+'''Tests for pyxenv.store module.'''
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from pyxenv import config, metrics
+from pyxenv.exceptions import pyxenvError
+from pyxenv.integrity import MANIFEST_FILE, IntegrityManager
+from pyxenv.python_manager import PythonManager
+from pyxenv.storage import LAST_USED_MARKER
+from pyxenv.store import OBJECTS_DIR, SharedStore
+
+
+@pytest.fixture
+def shared_store(temp_pyxenv_home, tmp_path):
+    '''Point SHARED_STORE at an empty directory and hide global interpreters.'''
+    shared = tmp_path / 'nfs'
+    shared.mkdir()
+    with patch('pyxenv.config.SHARED_STORE', shared), \
+         patch.object(PythonManager, '_which', return_value=None):
+        PythonManager._index = None
+        yield shared
+    PythonManager._index = None
+
+
+def _install(version: str, marker: str = '') -> None:
+    '''Lay out a fake interpreter under PYTHON_DIR.'''
+    root = config.PYTHON_DIR / version
+    (root / 'bin').mkdir(parents=True)
+    (root / 'bin' / 'python').write_text(f'#!/bin/sh\necho python{marker}\n')
+    os.chmod(root / 'bin' / 'python', 0o755)
+    (root / 'lib').mkdir()
+    (root / 'lib' / 'os.py').write_text('# stdlib\n')
+
+
+def _publish_elsewhere(version: str, marker: str = '') -> str:
+    '''Publish a version, then drop the local install as if on another host.'''
+    _install(version, marker)
+    digest = SharedStore.publish(version)
+    for root, dirs, files in os.walk(config.PYTHON_DIR / version, topdown=False):
+        for name in files:
+            os.unlink(os.path.join(root, name))
+        for name in dirs:
+            os.rmdir(os.path.join(root, name))
+    os.rmdir(config.PYTHON_DIR / version)
+    return digest
+
+
+class TestSharedStore:
+    '''Tests for SharedStore class.'''
+
+    def test_publish_is_content_addressed(self, shared_store):
+        '''Test identical trees share an object and refs name it.'''
+        _install('3.12.4')
+        _install('3.12')
+        digest = SharedStore.publish('3.12.4')
+
+        assert SharedStore.publish('3.12') == digest
+        assert (shared_store / OBJECTS_DIR / digest / 'bin' / 'python').is_file()
+        assert SharedStore.refs() == {'3.12.4': digest, '3.12': digest}
+        assert [p.name for p in (shared_store / OBJECTS_DIR).iterdir()] == [digest]
+
+    def test_publish_rehashes_the_tree(self, shared_store):
+        '''Test the digest follows added files and changed files are refused.'''
+        _install('3.12.4')
+        root = config.PYTHON_DIR / '3.12.4'
+        IntegrityManager.record(root)
+        manifest = (root / MANIFEST_FILE).read_bytes()
+        digest = SharedStore.publish('3.12.4')
+        (root / 'lib' / 'extra.py').write_text('# added\n')
+
+        assert SharedStore.publish('3.12.4') != digest
+        # Publishing runs under a shared lock, so it leaves the install's manifest alone
+        assert (root / MANIFEST_FILE).read_bytes() == manifest
+
+        (config.PYTHON_DIR / '3.12.4' / 'lib' / 'os.py').write_text('# patched\n')
+        with pytest.raises(pyxenvError, match='alterado'):
+            SharedStore.publish('3.12.4')
+
+    def test_resolution_fetches_lazily(self, shared_store):
+        '''Test a published version is copied on first use, then served locally.'''
+        digest = _publish_elsewhere('3.12.4')
+        assert not config.STORE_DIR.exists()
+
+        exe = PythonManager.get_executable('3.12.4')
+        assert exe == str(config.STORE_DIR / digest / 'bin' / 'python')
+        assert PythonManager.get_executable('>=3.12,<3.13') == exe
+        metrics.flush()
+
+        counters = metrics.load()['counters']
+        assert counters['store_fetches_total'] == 1
+        assert counters['store_hits_total'] == 1
+
+    def test_listing_does_not_fetch(self, shared_store):
+        '''Test listed store versions point into the shared store until used.'''
+        digest = _publish_elsewhere('3.12.4')
+
+        candidates = PythonManager._candidates()
+
+        assert candidates == [(str(shared_store / OBJECTS_DIR / digest / 'bin' / 'python'), 'shared')]
+        assert not config.STORE_DIR.exists()
+
+    def test_lru_eviction(self, shared_store):
+        '''Test the least recently used interpreter leaves the local cache.'''
+        first = _publish_elsewhere('3.11.9', 'a')
+        second = _publish_elsewhere('3.12.4', 'b')
+        settings = config.get_config()._replace(store_cache_size=1)
+
+        with patch('pyxenv.config.get_config', return_value=settings):
+            SharedStore.get('3.11.9')
+            os.utime(config.STORE_DIR / first / LAST_USED_MARKER, (0, 0))
+            SharedStore.get('3.12.4')
+
+        assert sorted(p.name for p in config.STORE_DIR.iterdir() if not p.name.startswith('.')) == [second]
+
+    def test_eviction_spares_environment_interpreters(self, shared_store):
+        '''Test an interpreter an environment was created from is never evicted.'''
+        first = _publish_elsewhere('3.11.9', 'a')
+        _publish_elsewhere('3.12.4', 'b')
+        settings = config.get_config()._replace(store_cache_size=1)
+
+        with patch('pyxenv.config.get_config', return_value=settings):
+            used = SharedStore.get('3.11.9')
+            env = config.ENV_DIR / 'app'
+            env.mkdir()
+            (env / 'pyvenv.cfg').write_text(f'home = {used / "bin"}\n')
+            os.utime(used / LAST_USED_MARKER, (0, 0))
+            SharedStore.get('3.12.4')
+
+        assert (config.STORE_DIR / first / 'bin' / 'python').exists()
+
+    def test_corrupt_object_is_rejected(self, shared_store):
+        '''Test a copy that does not match the manifest is discarded.'''
+        digest = _publish_elsewhere('3.12.4')
+        (shared_store / OBJECTS_DIR / digest / 'lib' / 'os.py').write_text('# tampered, longer\n')
+
+        with pytest.raises(pyxenvError, match='não confere'):
+            SharedStore.fetch(digest)
+        assert not (config.STORE_DIR / digest).exists()
+
+    def test_without_shared_store(self, temp_pyxenv_home):
+        '''Test the store is inert unless configured.'''
+        _install('3.12.4')
+
+        assert SharedStore.refs() == {}
+        with pytest.raises(pyxenvError, match='PYXENV_SHARED_STORE'):
+            SharedStore.publish('3.12.4')
+
+    def test_unreachable_store(self, temp_pyxenv_home, tmp_path):
+        '''Test an unmounted store resolves nothing instead of failing.'''
+        with patch('pyxenv.config.SHARED_STORE', tmp_path / 'unmounted'):
+            assert SharedStore.refs() == {}
+            assert SharedStore.signature() is None
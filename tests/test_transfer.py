@@ -0,0 +1,175 @@
+'''Tests for pyxenv.transfer module.'''
+
+import io
+import json
+import socket
+import threading
+import time
+import urllib.request
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from pyxenv import config, transfer
+from pyxenv.exceptions import pyxenvError
+from pyxenv.installer import PythonInstaller
+from pyxenv.transfer import DownloadMonitor, TokenBucket, parse_rate, retrieve
+
+
+class _Terminal(io.StringIO):
+    '''StringIO that claims to be a terminal.'''
+
+    def isatty(self):
+        return True
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    '''Static file handler that does not log requests.'''
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def reset_limit(monkeypatch):
+    '''Start every test without a process-wide rate limit.'''
+    monkeypatch.setattr(transfer, '_bucket', None)
+    monkeypatch.setattr(transfer, '_bucket_rate', None)
+
+
+@pytest.fixture
+def http_mirror(tmp_path):
+    '''Serve a fake installer from a local HTTP server.'''
+    root = tmp_path / 'www'
+    (root / '3.11.5').mkdir(parents=True)
+    (root / '3.11.5' / 'python-3.11.5-amd64.exe').write_bytes(b'x' * 64 * 1024)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(_QuietHandler, directory=str(root)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}/'
+    server.shutdown()
+    server.server_close()
+
+
+class TestParseRate:
+    '''Tests for parse_rate.'''
+
+    @pytest.mark.parametrize('text,expected', [
+        ('500', 500),
+        ('500K', 500 * 1024),
+        ('2M', 2 * 1024 ** 2),
+        ('1.5MB/s', 1.5 * 1024 ** 2),
+        ('1g', 1024 ** 3),
+    ])
+    def test_valid(self, text, expected):
+        '''Test parsing bandwidths.'''
+        assert parse_rate(text) == expected
+
+    @pytest.mark.parametrize('text', ['', 'fast', '0', '-1M', '2X'])
+    def test_invalid(self, text):
+        '''Test invalid bandwidths.'''
+        with pytest.raises(pyxenvError):
+            parse_rate(text)
+
+
+class TestTokenBucket:
+    '''Tests for TokenBucket class.'''
+
+    def test_throttles_after_burst(self):
+        '''Test consumers sleep once the burst is spent.'''
+        now = [0.0]
+        slept = []
+        bucket = TokenBucket(100, burst=25, clock=lambda: now[0], sleep=slept.append)
+
+        assert bucket.consume(25) == 0
+        assert bucket.consume(50) == pytest.approx(0.5)
+        now[0] += 1.0  # the debt is repaid after half a second, then refills up to the burst
+        assert bucket.consume(25) == 0
+        assert slept == [pytest.approx(0.5)]
+
+    def test_shared_bucket_from_settings(self):
+        '''Test the "limit_rate" setting and its per-process override.'''
+        with patch('pyxenv.config.get_config', return_value=config.get_config()._replace(limit_rate='1M')):
+            assert transfer.shared_bucket().rate == 1024 ** 2
+
+        transfer.set_limit('2M')
+        assert transfer.shared_bucket().rate == 2 * 1024 ** 2
+        transfer.set_limit(None)
+        assert transfer.shared_bucket() is None
+
+
+class TestDownloadMonitor:
+    '''Tests for DownloadMonitor class.'''
+
+    def test_progress_and_record(self):
+        '''Test the progress line and the throughput log.'''
+        stream = _Terminal()
+        monitor = DownloadMonitor('http://example/file', stream=stream)
+        monitor.started -= 2.0
+
+        with patch('pyxenv.transfer.PROGRESS_INTERVAL', 0):
+            monitor(0, 8192, 4 * 8192)
+            monitor(2, 8192, 4 * 8192)
+        record = monitor.finish()
+
+        assert '16.0 KB/32.0 KB (50%)' in stream.getvalue()
+        assert 'ETA' in stream.getvalue()
+        assert record['bytes'] == 16384 and record['ok'] is True
+        logged = (config.LOG_DIR / 'downloads.jsonl').read_text().splitlines()
+        assert json.loads(logged[-1])['url'] == 'http://example/file'
+
+    def test_no_progress_without_terminal(self):
+        '''Test nothing is drawn when stderr is redirected.'''
+        stream = io.StringIO()
+        monitor = DownloadMonitor('http://example/file', stream=stream)
+
+        monitor(1, 8192, 8192)
+        monitor.finish()
+
+        assert stream.getvalue() == ''
+
+    def test_download_from_local_server_with_limit(self, http_mirror, tmp_path):
+        '''Test a throttled download from a local HTTP server is logged.'''
+        transfer.set_limit('64K')
+        with patch('pyxenv.config.PYTHON_FTP_BASE', http_mirror), \
+             patch('pyxenv.config.PYTHON_FTP_UPSTREAM', http_mirror), \
+             patch('pyxenv.installer.tempfile.gettempdir', return_value=str(tmp_path)):
+            started = time.monotonic()
+            path = PythonInstaller.download('3.11.5')
+            elapsed = time.monotonic() - started
+
+        assert path.read_bytes() == b'x' * 64 * 1024
+        # The burst covers a quarter second; the rest is paced at 64 KB/s
+        assert elapsed >= 0.6
+        record = json.loads((config.LOG_DIR / 'downloads.jsonl').read_text().splitlines()[-1])
+        assert record['bytes'] == 64 * 1024
+        assert record['limit'] == 64 * 1024
+        assert record['bytes_per_second'] <= 96 * 1024
+
+
+class TestRetrieve:
+    '''Tests for retrieve function.'''
+
+    def test_blocks_reach_the_hook(self, http_mirror, tmp_path):
+        '''Test the file is copied in blocks with the configured timeout.'''
+        calls = []
+        target = tmp_path / 'installer.exe'
+        with patch('pyxenv.transfer.urllib.request.urlopen', wraps=urllib.request.urlopen) as mock_open:
+            size = retrieve(http_mirror + '3.11.5/python-3.11.5-amd64.exe', target,
+                            reporthook=lambda *args: calls.append(args))
+
+        assert size == 64 * 1024 and target.read_bytes() == b'x' * 64 * 1024
+        assert mock_open.call_args.kwargs['timeout'] == config.get_config().network_timeout
+        assert calls == [(0, transfer.BLOCK_SIZE, 64 * 1024), (1, transfer.BLOCK_SIZE, 64 * 1024)]
+
+    def test_stalled_server_times_out(self, tmp_path):
+        '''Test a server that never answers does not hang the download.'''
+        with socket.socket() as server:
+            server.bind(('127.0.0.1', 0))
+            server.listen(1)
+            url = f'http://127.0.0.1:{server.getsockname()[1]}/python.exe'
+
+            with pytest.raises(OSError):
+                retrieve(url, tmp_path / 'python.exe', timeout=0.2)
@@ -5,7 +5,10 @@ from unittest.mock import patch, Mock
 
 import pytest
 
-from pyxenv.utils import run_command, extract_version, is_version_prefix
+import sys
+
+from pyxenv.utils import (run_command, extract_version, is_version_prefix, load_toml, precompile, report,
+                          reporting_to)
 
 
 class TestRunCommand:
@@ -71,3 +74,71 @@ class TestIsVersionPrefix:
     def test_is_version_prefix(self, version, expected):
         '''Test version prefix detection.'''
         assert is_version_prefix(version) == expected
+
+
+class TestPrecompile:
+    '''Tests for precompile function.'''
+
+    def test_precompile_command(self, mock_subprocess_run):
+        '''Test the compileall command line.'''
+        assert precompile('/usr/bin/python3', ['/envs/a'], 'unchecked-hash')
+
+        cmd = mock_subprocess_run.call_args[0][0]
+        assert cmd[:7] == ['/usr/bin/python3', '-I', '-m', 'compileall', '-q', '-j', '0']
+        assert cmd[7:] == ['--invalidation-mode', 'unchecked-hash', '/envs/a']
+
+    def test_precompile_invalid_mode(self):
+        '''Test rejecting unknown invalidation modes.'''
+        with pytest.raises(ValueError):
+            precompile('/usr/bin/python3', invalidation_mode='never')
+
+    def test_precompile_unchecked_hash(self, tmp_path):
+        '''Test real compilation writes unchecked hash-based pycs.'''
+        (tmp_path / 'mod.py').write_text('VALUE = 1\n')
+
+        assert precompile(sys.executable, [tmp_path], 'unchecked-hash')
+
+        pycs = list((tmp_path / '__pycache__').glob('mod.*.pyc'))
+        assert len(pycs) == 1
+        flags = int.from_bytes(pycs[0].read_bytes()[4:8], 'little')
+        assert flags == 0b01
+
+
+class TestReport:
+    '''Tests for report and reporting_to.'''
+
+    def test_callback_replaces_print(self, capsys):
+        '''Test messages go to the callback only inside reporting_to.'''
+        messages = []
+        with reporting_to(messages.append):
+            report('- um')
+        report('- dois')
+
+        assert messages == ['- um']
+        assert capsys.readouterr().out == '- dois\n'
+
+
+class TestLoadToml:
+    '''Tests for load_toml function.'''
+
+    def test_load(self, tmp_path):
+        '''Test parsing a TOML file.'''
+        path = tmp_path / 'pyproject.toml'
+        path.write_text('[tool.pyxenv]\npython = "3.12"\n')
+        pytest.importorskip('tomllib' if sys.version_info >= (3, 11) else 'tomli')
+
+        assert load_toml(path) == {'tool': {'pyxenv': {'python': '3.12'}}}
+
+    def test_warns_without_parser(self, tmp_path):
+        '''Test an existing file that cannot be parsed is reported once, not silently ignored.'''
+        path = tmp_path / 'config.toml'
+        path.write_text('workers = 2\n')
+        messages = []
+
+        with patch.dict(sys.modules, {'tomllib': None, 'tomli': None}), reporting_to(messages.append):
+            assert load_toml(path) == {}
+            assert load_toml(path) == {}
+            assert load_toml(tmp_path / 'missing.toml') == {}
+
+        assert len(messages) == 1
+        assert 'tomli' in messages[0] and str(path) in messages[0]
@@ -1,6 +1,9 @@
 '''Tests for pyxenv.venv_manager module.'''
 
+import json
 import os
+import subprocess
+import sys
 from pathlib import Path
 from unittest.mock import patch, Mock
 
@@ -37,6 +40,67 @@ class TestVenvManager:
             
             assert env_path.name == f'pyxenv-{version}'
 
+    def test_create_venv_precompile(self, temp_pyxenv_home, mock_subprocess_run):
+        '''Test bytecode precompilation after creation.'''
+        with patch('pyxenv.python_manager.PythonManager.get_executable',
+                  return_value='/usr/bin/python3.11'), \
+             patch('pyxenv.venv_manager.precompile') as mock_precompile:
+
+            env_path = VenvManager.create('3.11', 'fast-env', precompile_bytecode=True,
+                                          invalidation_mode='unchecked-hash')
+
+            mock_precompile.assert_called_once_with(
+                str(VenvManager.python_path(env_path)), [env_path], 'unchecked-hash')
+
+    def test_sync_requirements_incremental(self, temp_pyxenv_home, tmp_path):
+        '''Test pip is skipped when unchanged and only the diff is installed.'''
+        env_path = temp_pyxenv_home / 'envs' / 'myenv'
+        env_path.mkdir(parents=True)
+        (env_path / 'pyvenv.cfg').write_text('home = /usr/bin\nversion = 3.12.1\n')
+        req = tmp_path / 'requirements.txt'
+        req.write_text('requests==2.31.0\nsix==1.16.0\n')
+        pip = [str(VenvManager.python_path(env_path)), '-m', 'pip']
+
+        with patch('pyxenv.venv_manager.run_command') as mock_run:
+            assert VenvManager.sync_requirements(env_path, req) is True
+            assert mock_run.call_args_list[-1][0][0] == pip + ['install', '-r', str(req)]
+
+            assert VenvManager.sync_requirements(env_path, req) is False
+            assert mock_run.call_count == 1
+
+            req.write_text('requests==2.32.0\nattrs\n')
+            assert VenvManager.sync_requirements(env_path, req) is True
+
+        calls = [c[0][0] for c in mock_run.call_args_list[1:]]
+        assert calls == [pip + ['uninstall', '-y', 'six'], pip + ['install', 'requests==2.32.0', 'attrs']]
+
+    def test_sync_requirements_from_wheelhouse(self, temp_pyxenv_home, tmp_path):
+        '''Test installs go offline when the wheelhouse covers the requirements.'''
+        env_path = temp_pyxenv_home / 'envs' / 'myenv'
+        env_path.mkdir(parents=True)
+        req = tmp_path / 'requirements.txt'
+        req.write_text('requests\n')
+        offline = ['--no-index', '--find-links', '/wheelhouse']
+
+        with patch('pyxenv.wheelhouse.WheelhouseManager.install_options', return_value=offline), \
+             patch('pyxenv.venv_manager.run_command') as mock_run:
+            VenvManager.sync_requirements(env_path, req)
+
+        assert mock_run.call_args[0][0][3:] == ['install'] + offline + ['-r', str(req)]
+
+    def test_sync_requirements_failure_keeps_stamp(self, temp_pyxenv_home, tmp_path):
+        '''Test a failed pip run is retried next time.'''
+        env_path = temp_pyxenv_home / 'envs' / 'myenv'
+        env_path.mkdir(parents=True)
+        req = tmp_path / 'requirements.txt'
+        req.write_text('requests\n')
+
+        with patch('pyxenv.venv_manager.run_command', side_effect=Exception('pip failed')):
+            with pytest.raises(VenvError, match='dependências'):
+                VenvManager.sync_requirements(env_path, req)
+
+        assert not (env_path / '.pyxenv-requirements.json').exists()
+
     def test_create_venv_already_exists(self, temp_pyxenv_home):
         '''Test handling existing venv.'''
         version = '3.11'
@@ -138,3 +202,75 @@ class TestVenvManager:
         with patch('pyxenv.config.ENV_DIR', Path('/nonexistent/path')):
             envs = VenvManager.list_all()
             assert envs == []
+
+    def test_activation_env(self, temp_pyxenv_home):
+        '''Test computing activated variables without sourcing a script.'''
+        env_path = temp_pyxenv_home / 'envs' / 'myenv'
+        env_path.mkdir(parents=True)
+
+        env = VenvManager.activation_env('myenv', {'PATH': '/usr/bin', 'PYTHONHOME': '/x'})
+
+        assert env['VIRTUAL_ENV'] == str(env_path)
+        assert env['VIRTUAL_ENV_PROMPT'] == 'myenv'
+        assert env['PATH'].split(os.pathsep) == [str(VenvManager.python_path(env_path).parent), '/usr/bin']
+        assert 'PYTHONHOME' not in env
+
+    def test_activation_delta_cached(self, temp_pyxenv_home):
+        '''Test the activation delta is stored next to the environment.'''
+        env_path = temp_pyxenv_home / 'envs' / 'myenv'
+        env_path.mkdir(parents=True)
+
+        delta = VenvManager.activation_delta('myenv')
+
+        snapshot = env_path / '.pyxenv-activate.json'
+        assert json.loads(snapshot.read_text()) == delta
+        with patch.object(VenvManager, 'python_path') as mock_path:
+            assert VenvManager.activation_delta('myenv') == delta
+            mock_path.assert_not_called()
+
+    def test_activation_delta_moved_env(self, temp_pyxenv_home):
+        '''Test a snapshot copied from another environment is recomputed.'''
+        old_path = temp_pyxenv_home / 'envs' / 'old'
+        old_path.mkdir(parents=True)
+        VenvManager.activation_delta('old')
+        old_path.rename(temp_pyxenv_home / 'envs' / 'new')
+
+        delta = VenvManager.activation_delta('new')
+
+        assert delta['set']['VIRTUAL_ENV'] == str(temp_pyxenv_home / 'envs' / 'new')
+        assert delta['set']['VIRTUAL_ENV_PROMPT'] == 'new'
+
+    def test_activation_env_not_found(self, temp_pyxenv_home):
+        '''Test error when environment not found.'''
+        with pytest.raises(VenvError, match='não encontrado'):
+            VenvManager.activation_env('nonexistent-env')
+
+    @pytest.mark.skipif(os.name == 'nt', reason='execvpe replaces the process on POSIX only')
+    def test_exec_replaces_process(self, temp_pyxenv_home):
+        '''Test exec hands the activated environment to execvpe.'''
+        env_path = temp_pyxenv_home / 'envs' / 'myenv'
+        env_path.mkdir(parents=True)
+
+        with patch('os.execvpe') as mock_exec:
+            VenvManager.exec('myenv', ['pytest', '-q'])
+
+        file, argv, env = mock_exec.call_args[0]
+        assert (file, argv) == ('pytest', ['pytest', '-q'])
+        assert env['VIRTUAL_ENV'] == str(env_path)
+
+    @pytest.mark.skipif(os.name == 'nt', reason='execvpe replaces the process on POSIX only')
+    def test_exec_real_command(self, temp_pyxenv_home, tmp_path):
+        '''Test the command really sees the activated environment.'''
+        env_path = temp_pyxenv_home / 'envs' / 'myenv'
+        env_path.mkdir(parents=True)
+        code = (
+            'import sys; from unittest.mock import patch; '
+            'from pyxenv.venv_manager import VenvManager; '
+            f'patch("pyxenv.config.ENV_DIR", __import__("pathlib").Path({str(env_path.parent)!r})).start(); '
+            f'patch("pyxenv.config.LOCK_DIR", __import__("pathlib").Path({str(tmp_path / "locks")!r})).start(); '
+            'VenvManager.exec("myenv", ["sh", "-c", "echo $VIRTUAL_ENV; exit 7"])'
+        )
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+
+        assert result.returncode == 7
+        assert result.stdout.strip() == str(env_path)
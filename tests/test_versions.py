@@ -0,0 +1,126 @@
+'''Tests for pyxenv.versions module.'''
+
+import pytest
+
+from pyxenv.exceptions import VersionError
+from pyxenv.versions import (SpecifierSet, Version, VersionIndex, executable_name, split_variant,
+                             version_key)
+
+
+class TestVersion:
+    '''Tests for Version class.'''
+
+    @pytest.mark.parametrize('text,release,pre,impl,variant', [
+        ('3.11', (3, 11), None, 'cpython', ''),
+        ('3.13.0rc1', (3, 13, 0), ('rc', 1), 'cpython', ''),
+        ('3.14t', (3, 14), None, 'cpython', 't'),
+        ('pypy3.10', (3, 10), None, 'pypy', ''),
+        ('python3.12', (3, 12), None, 'cpython', ''),
+    ])
+    def test_parse(self, text, release, pre, impl, variant):
+        '''Test parsing version strings.'''
+        version = Version.parse(text)
+        assert version.release == release
+        assert version.pre == pre
+        assert version.implementation == impl
+        assert version.variant == variant
+
+    @pytest.mark.parametrize('text', ['', 'abc', '3.x', 'jython3.10', '3.11-dev'])
+    def test_parse_invalid(self, text):
+        '''Test invalid version strings.'''
+        with pytest.raises(VersionError):
+            Version.parse(text)
+
+    def test_prerelease_ordering(self):
+        '''Test pre-releases sort before the final release.'''
+        assert Version.parse('3.13.0rc1') < Version.parse('3.13.0')
+        assert Version.parse('3.13.0b2') < Version.parse('3.13.0rc1')
+        assert Version.parse('3.13') == Version.parse('3.13.0')
+
+    def test_version_key_never_raises(self):
+        '''Test sorting mixed valid and invalid strings.'''
+        values = sorted(['3.9.0', '3.13.0rc1', 'garbage', '3.13.0', '3.14t'], key=version_key)
+        assert values == ['garbage', '3.9.0', '3.13.0rc1', '3.13.0', '3.14t']
+
+    @pytest.mark.parametrize('text,expected', [
+        ('3.13t', ('3.13', 't')),
+        ('3.13.1td', ('3.13.1', 'td')),
+        ('3.12d', ('3.12', 'd')),
+        ('3.12', ('3.12', '')),
+        ('>=3.13t', ('>=3.13', 't')),
+    ])
+    def test_split_variant(self, text, expected):
+        '''Test separating build variants from versions.'''
+        assert split_variant(text) == expected
+
+    @pytest.mark.parametrize('text,windows,expected', [
+        ('3.13', False, 'python'),
+        ('3.13.1t', False, 'python3.13t'),
+        ('3.13', True, 'python.exe'),
+        ('3.13t', True, 'python3.13t.exe'),
+        ('3.12d', True, 'python_d.exe'),
+        ('3.13td', True, 'python3.13t_d.exe'),
+    ])
+    def test_executable_name(self, text, windows, expected):
+        '''Test interpreter file names of build variants.'''
+        assert executable_name(Version.parse(text), windows=windows) == expected
+
+
+class TestSpecifierSet:
+    '''Tests for SpecifierSet class.'''
+
+    @pytest.mark.parametrize('spec,version,expected', [
+        ('3.12', '3.12.4', True),
+        ('3.12', '3.13.0', False),
+        ('>=3.10,<3.13', '3.12.9', True),
+        ('>=3.10,<3.13', '3.13.0', False),
+        ('>=3.10,!=3.11.2', '3.11.2', False),
+        ('~=3.10.2', '3.10.9', True),
+        ('~=3.10.2', '3.11.0', False),
+        ('pypy3.10', '3.10.14', False),
+        ('3.14t', '3.14.0', False),
+        ('3.14t', '3.14.0t', True),
+    ])
+    def test_contains(self, spec, version, expected):
+        '''Test specifier matching.'''
+        assert SpecifierSet.parse(spec).contains(Version.parse(version)) is expected
+
+    def test_parse_mixed_identities(self):
+        '''Test rejecting specifiers that mix implementations.'''
+        with pytest.raises(VersionError):
+            SpecifierSet.parse('>=3.10,<pypy3.12')
+
+
+class TestVersionIndex:
+    '''Tests for VersionIndex class.'''
+
+    @pytest.fixture
+    def index(self):
+        '''Index with a mix of interpreters.'''
+        entries = [
+            (Version.parse(v), f'/py/{v}', 'pyxenv')
+            for v in ['3.9.18', '3.10.14', '3.11.9', '3.12.4', '3.13.0rc1', '3.13.0t', 'pypy3.10']
+        ]
+        return VersionIndex(entries)
+
+    @pytest.mark.parametrize('spec,expected', [
+        ('3', '/py/3.12.4'),
+        ('>=3.10,<3.12', '/py/3.11.9'),
+        ('3.10', '/py/3.10.14'),
+        ('3.13', '/py/3.13.0rc1'),
+        ('3.13t', '/py/3.13.0t'),
+        ('pypy3', '/py/pypy3.10'),
+        ('>=3.14', None),
+    ])
+    def test_best(self, index, spec, expected):
+        '''Test choosing the best interpreter for a specifier.'''
+        match = index.best(SpecifierSet.parse(spec))
+        assert (match[1] if match else None) == expected
+
+    def test_first_entry_wins_ties(self):
+        '''Test earlier entries take precedence for the same version.'''
+        index = VersionIndex([
+            (Version.parse('3.11'), '/first', 'global'),
+            (Version.parse('3.11'), '/second', 'global'),
+        ])
+        assert index.best(SpecifierSet.parse('3.11'))[1] == '/first'
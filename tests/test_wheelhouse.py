@@ -0,0 +1,85 @@
+'''Tests for pyxenv.wheelhouse module.'''
+
+import json
+import subprocess
+import sys
+import zipfile
+from unittest.mock import patch
+
+import pytest
+
+from pyxenv import config
+from pyxenv.exceptions import DownloadError
+from pyxenv.wheelhouse import MANIFEST_FILE, WheelhouseManager, wheel_tag
+
+
+def _has_pip() -> bool:
+    '''Check whether the running interpreter can run pip.'''
+    return subprocess.run([sys.executable, '-m', 'pip', '--version'], capture_output=True).returncode == 0
+
+
+requires_pip = pytest.mark.skipif(not _has_pip(), reason='requires pip')
+
+
+@pytest.fixture
+def simple_index(tmp_path):
+    '''Build a PEP 503 index directory holding a single pure wheel.'''
+    files = tmp_path / 'files'
+    files.mkdir()
+    wheel = files / 'demo-1.0-py3-none-any.whl'
+    with zipfile.ZipFile(wheel, 'w') as archive:
+        archive.writestr('demo/__init__.py', 'VALUE = 1\n')
+        archive.writestr('demo-1.0.dist-info/METADATA', 'Metadata-Version: 2.1\nName: demo\nVersion: 1.0\n')
+        archive.writestr('demo-1.0.dist-info/WHEEL',
+                         'Wheel-Version: 1.0\nGenerator: test\nRoot-Is-Purelib: true\nTag: py3-none-any\n')
+        archive.writestr('demo-1.0.dist-info/RECORD', '')
+    project = tmp_path / 'simple' / 'demo'
+    project.mkdir(parents=True)
+    (project / 'index.html').write_text(f'<a href="{wheel.as_uri()}">{wheel.name}</a>\n')
+    (tmp_path / 'simple' / 'index.html').write_text('<a href="demo/">demo</a>\n')
+    return (tmp_path / 'simple').as_uri() + '/'
+
+
+class TestWheelhouseManager:
+    '''Tests for WheelhouseManager class.'''
+
+    @requires_pip
+    def test_fetch_and_install_options(self, temp_pyxenv_home, simple_index, tmp_path):
+        '''Test wheels are fetched per interpreter and then used offline.'''
+        req = tmp_path / 'requirements.txt'
+        req.write_text('demo==1.0\n')
+
+        with patch('pyxenv.wheelhouse.PythonManager.get_executable', return_value=sys.executable):
+            counts = WheelhouseManager.fetch(req, ['3'], index_url=simple_index)
+
+        assert counts == {'3': 1}
+        assert (config.WHEELHOUSE_DIR / 'demo-1.0-py3-none-any.whl').is_file()
+        manifest = json.loads((config.WHEELHOUSE_DIR / MANIFEST_FILE).read_text())
+        assert list(manifest.values()) == [[wheel_tag(sys.executable)]]
+        assert WheelhouseManager.install_options(req, sys.executable) == [
+            '--no-index', '--find-links', str(config.WHEELHOUSE_DIR)]
+
+        req.write_text('demo==1.0\nother\n')
+        assert WheelhouseManager.install_options(req, sys.executable) == []
+
+    @requires_pip
+    def test_fetch_failure_not_recorded(self, temp_pyxenv_home, simple_index, tmp_path):
+        '''Test a failed prefetch is reported and leaves no manifest entry.'''
+        req = tmp_path / 'requirements.txt'
+        req.write_text('missing-project\n')
+
+        with patch('pyxenv.wheelhouse.PythonManager.get_executable', return_value=sys.executable):
+            with pytest.raises(DownloadError, match='pip download falhou'):
+                WheelhouseManager.fetch(req, ['3'], index_url=simple_index)
+
+        assert not (config.WHEELHOUSE_DIR / MANIFEST_FILE).exists()
+        assert [p.name for p in config.WHEELHOUSE_DIR.iterdir()] == []
+
+    def test_install_options_without_wheelhouse(self, temp_pyxenv_home, tmp_path):
+        '''Test installs use the index until the wheelhouse is filled.'''
+        req = tmp_path / 'requirements.txt'
+        req.write_text('demo\n')
+
+        with patch('pyxenv.wheelhouse.InterpreterRegistry.get') as mock_get:
+            assert WheelhouseManager.install_options(req, sys.executable) == []
+        mock_get.assert_not_called()